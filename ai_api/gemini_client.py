@@ -1,70 +1,110 @@
+from typing import Any, Dict, List, Optional
+
 from loguru import logger
-import requests
 import json
-from openai import OpenAI
+import time
+from ai_api.llm_client import get_transport
 from core.config import settings
+from ai_api.sentiment_schema import (
+    SENTIMENT_BATCH_SCHEMA,
+    SchemaError,
+    split_batches,
+    validate,
+)
 
 
-class GeminiClient:
-    def __init__(self):
-        # ambil API key yang benar
-        self.gemini_key = settings.GEMINI_API_KEY
-        self.openai_key = settings.OPENAI_API_KEY
+BATCH_PROMPT = (
+    "You are a financial news sentiment scorer. For every item below, judge the likely "
+    "impact of the headline on the price of the given symbol. Return JSON only: "
+    '{"results": [{"id": <item id>, "label": "bullish"|"bearish"|"neutral", '
+    '"score": <number from -1 (very bearish) to 1 (very bullish)>}]}, one result per item.\n'
+    "Items:\n"
+)
 
-        # REST endpoint Gemini
-        self.model_name = "gemini-1.5-flash"
-        self.endpoint = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.model_name}:generateContent?key={self.gemini_key}"
-        )
 
-        # OpenAI Fallback client
-        self.client = OpenAI(api_key=self.openai_key)
+class GeminiClient:
+    def __init__(self):
+        # transport bersama: Gemini REST dulu, OpenAI fallback (pool koneksi + circuit breaker)
+        self.transport = get_transport()
+        logger.info("GeminiClient loaded ({} -> {})", settings.GEMINI_MODEL, settings.OPENAI_MODEL)
 
-        logger.info("GeminiClient loaded (REST + OpenAI fallback). Model fallback: gpt-4.1-mini")
+    def analyze_text(self, text: str):
+        result = self.transport.complete(text, max_tokens=80)
+        if result is None:
+            logger.error("Gemini + OpenAI gagal, pakai neutral")
+            return "neutral"
+        return result.text
 
-    def _call_gemini_rest(self, text: str):
+    # ------------------------------------------------------------------
+    # BATCH (structured output)
+    # ------------------------------------------------------------------
+    def _parse_batch(self, raw: Optional[str], ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Parse + validasi jawaban JSON. Lempar SchemaError kalau formatnya ngaco.
+        """
+        if not raw:
+            raise SchemaError("jawaban kosong")
+        text = raw.strip()
+        if text.startswith("```"):
+            text = text.strip("`").split("\n", 1)[-1]
         try:
-            payload = {
-                "contents": [
-                    {"parts": [{"text": text}]}
-                ]
-            }
-            r = requests.post(
-                self.endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(payload),
-                timeout=10
-            )
-
-            if r.status_code != 200:
-                logger.warning(f"[Gemini REST] Error {r.status_code}: {r.text}")
-                return None
+            data = json.loads(text)
+        except ValueError as e:
+            raise SchemaError(f"bukan JSON: {e}")
 
-            data = r.json()
-            return data["candidates"][0]["content"]["parts"][0]["text"]
+        validate(data, SENTIMENT_BATCH_SCHEMA)
+        wanted = set(ids)
+        return {
+            r["id"]: {"label": r["label"], "score": float(r["score"])}
+            for r in data["results"]
+            if r["id"] in wanted
+        }
 
-        except Exception as e:
-            logger.warning(f"[Gemini REST] Exception: {e}")
+    @staticmethod
+    def _remaining(end: Optional[float]) -> Optional[float]:
+        # sisa budget (detik); None = tanpa budget
+        if end is None:
             return None
+        left = end - time.monotonic()
+        return left if left > 0.1 else 0.0
 
-    def analyze_text(self, text: str):
-        # 1️⃣ Coba pakai Gemini REST dulu
-        gemini_result = self._call_gemini_rest(text)
-        if gemini_result:
-            return gemini_result.strip()
+    def analyze_batch(self, items: List[Dict[str, Any]], budget: Optional[float] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Skor banyak headline (bisa campur symbol) dalam sesedikit mungkin request.
+        items = [{"id": int, "symbol": str, "headline": str}, ...]
+        Return {id: {"label": ..., "score": ...}}. Item yang gagal di-skor nggak ada di hasil.
 
-        logger.warning("Fallback to OpenAI GPT...")
+        Dipecah per budget token (LLM_BATCH_MAX_TOKENS); tiap batch lewat LLMTransport:
+        Gemini (responseSchema JSON) dulu, kalau gagal / nggak valid → OpenAI JSON mode.
+        `budget` (detik) = batas total; timeout tiap request dipotong ke sisa budget,
+        batch yang nggak kebagian waktu dilewati (caller pakai scorer lokal).
+        """
+        end = time.monotonic() + budget if budget is not None else None
+        results: Dict[int, Dict[str, Any]] = {}
 
-        # 2️⃣ Kalau gagal → fallback ke OpenAI GPT
-        try:
-            resp = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[{"role": "user", "content": text}],
-                max_tokens=80,
+        for batch in split_batches(items, settings.LLM_BATCH_MAX_TOKENS):
+            ids = [it["id"] for it in batch]
+            lines = "\n".join(
+                json.dumps({"id": it["id"], "symbol": it["symbol"], "headline": it["headline"]})
+                for it in batch
             )
-            return resp.choices[0].message.content.strip()
+            prompt = BATCH_PROMPT + lines
 
-        except Exception as e:
-            logger.error(f"OpenAI fallback error: {e}")
-            return "neutral"
+            timeout = self._remaining(end)
+            if timeout is not None and timeout <= 0:
+                logger.warning("[LLM batch] budget {}s habis, {} item dilewati", budget, len(batch))
+                continue
+            # jawaban yang nggak lolos schema dihitung gagal -> transport lanjut ke provider berikutnya
+            result = self.transport.complete(
+                prompt,
+                timeout=timeout,
+                accept=lambda raw, ids=ids: self._parse_batch(raw, ids),
+                json_schema=SENTIMENT_BATCH_SCHEMA,
+                temperature=0,
+            )
+            if result is None:
+                logger.error("[LLM batch] semua provider gagal ({} item)", len(batch))
+                continue
+            results.update(result.value)
+
+        return results
@@ -1,24 +1,23 @@
 from typing import Optional
 
 from loguru import logger
-from openai import OpenAI
 
+from ai_api.llm_client import get_transport
 from config.settings import settings
 
 
 class GPTClient:
     """
-    Wrapper sederhana untuk OpenAI GPT.
+    Wrapper sederhana untuk OpenAI GPT (lewat LLMTransport: pool koneksi, timeout, circuit breaker).
     Kalau API key tidak ada, dia fallback ke mode dummy (balikkan jawaban default).
     """
 
     def __init__(self) -> None:
         self.api_key: Optional[str] = settings.OPENAI_API_KEY
         self.model: str = settings.OPENAI_MODEL
-        self.client: Optional[OpenAI] = None
+        self.transport = get_transport() if self.api_key else None
 
-        if self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+        if self.transport:
             logger.info("GPTClient initialized with OpenAI model: {}", self.model)
         else:
             logger.warning("OPENAI_API_KEY tidak ditemukan. GPTClient akan jalan di mode dummy.")
@@ -27,24 +26,21 @@ class GPTClient:
         """
         Generic text analysis.
         """
-        if not self.client:
+        if not self.transport:
             logger.debug("GPTClient dummy mode - no API key. Returning fallback response.")
             return "neutral"
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.1,
-            )
-            content = response.choices[0].message.content
-            return content.strip() if content else ""
-        except Exception as e:
-            logger.error("Error calling GPT API: {}", e)
+        result = self.transport.complete(
+            user_prompt,
+            system=system_prompt,
+            providers=["openai"],
+            model=self.model,
+            temperature=0.1,
+        )
+        if result is None:
+            logger.error("Error calling GPT API (lihat log LLM di atas)")
             return "error"
+        return result.text
 
 
 gpt_client = GPTClient()
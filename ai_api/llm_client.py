@@ -0,0 +1,389 @@
+"""
+Transport LLM bersama (Gemini REST + OpenAI Chat Completions REST):
+- satu requests.Session (keep-alive, pool koneksi) per provider
+- circuit breaker per provider: gagal beruntun N kali -> provider dilewati selama
+  beberapa detik, lalu dicoba lagi satu request (half-open)
+- hedging opsional: kalau provider utama belum jawab dalam N ms, fallback ditembak
+  paralel, jawaban valid pertama yang dipakai
+- stats per provider (latency via metrics "llm_<provider>", error, skip, hedge)
+
+Endpoint bisa diarahkan ke server lokal (GEMINI_BASE_URL / OPENAI_BASE_URL) buat testing.
+"""
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from ai_api.sentiment_schema import to_gemini_schema
+from core.config import settings
+from core.utils.metrics import metrics
+
+
+class LLMError(Exception):
+    """
+    Provider gagal (HTTP error, timeout, jawaban kosong / nggak valid).
+    """
+
+
+@dataclass
+class LLMResult:
+    text: str
+    value: Any  # hasil `accept(text)` (mis. hasil parse JSON), default = text
+    provider: str
+    latency: float
+    hedged: bool = False
+
+
+# ==========================================================
+# CIRCUIT BREAKER
+# ==========================================================
+class CircuitBreaker:
+    """
+    closed -> (gagal beruntun >= threshold) -> open -> (lewat reset_after) -> half-open:
+    satu request percobaan; sukses -> closed, gagal -> open lagi.
+    """
+
+    def __init__(self, threshold: int = 3, reset_after: float = 60.0) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+# ==========================================================
+# PROVIDER
+# ==========================================================
+class Provider:
+    """
+    Satu endpoint LLM. Subclass cukup isi `_request` (payload) dan `_extract` (teks jawaban).
+    """
+
+    name = "base"
+
+    def __init__(self, base_url: str, api_key: str, model: str, pool_size: int = 4) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS)
+        self.stats = {"calls": 0, "errors": 0, "skipped": 0, "hedged": 0, "hedge_wins": 0}
+        self._stats_lock = threading.Lock()
+
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _request(self, prompt: str, system: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _extract(self, data: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def call(self, prompt: str, timeout: float, system: Optional[str] = None, **options: Any) -> str:
+        req = self._request(prompt, system, options)
+        try:
+            r = self.session.post(req["url"], headers=req.get("headers"), data=json.dumps(req["json"]), timeout=timeout)
+        except requests.RequestException as e:
+            raise LLMError(f"{self.name}: {e}") from e
+        if r.status_code != 200:
+            raise LLMError(f"{self.name}: HTTP {r.status_code}: {r.text[:200]}")
+        try:
+            text = self._extract(r.json())
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"{self.name}: format jawaban nggak dikenal: {e}") from e
+        if not text:
+            raise LLMError(f"{self.name}: jawaban kosong")
+        return text
+
+
+class GeminiProvider(Provider):
+    name = "gemini"
+
+    def _request(self, prompt: str, system: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"contents": [{"parts": [{"text": prompt}]}]}
+        if system:
+            payload["systemInstruction"] = {"parts": [{"text": system}]}
+        config: Dict[str, Any] = {}
+        if options.get("json_schema") is not None:
+            config["responseMimeType"] = "application/json"
+            config["responseSchema"] = to_gemini_schema(options["json_schema"])
+        if options.get("temperature") is not None:
+            config["temperature"] = options["temperature"]
+        if options.get("max_tokens"):
+            config["maxOutputTokens"] = options["max_tokens"]
+        if config:
+            payload["generationConfig"] = config
+        return {
+            "url": f"{self.base_url}/v1beta/models/{self.model}:generateContent",
+            "headers": {"x-goog-api-key": self.api_key},
+            "json": payload,
+        }
+
+    def _extract(self, data: Dict[str, Any]) -> str:
+        return data["candidates"][0]["content"]["parts"][0]["text"].strip()
+
+
+class OpenAIProvider(Provider):
+    name = "openai"
+
+    def _request(self, prompt: str, system: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        payload: Dict[str, Any] = {"model": options.get("model") or self.model, "messages": messages}
+        if options.get("json_schema") is not None:
+            payload["response_format"] = {"type": "json_object"}
+        if options.get("temperature") is not None:
+            payload["temperature"] = options["temperature"]
+        if options.get("max_tokens"):
+            payload["max_tokens"] = options["max_tokens"]
+        return {
+            "url": f"{self.base_url}/chat/completions",
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "json": payload,
+        }
+
+    def _extract(self, data: Dict[str, Any]) -> str:
+        return (data["choices"][0]["message"]["content"] or "").strip()
+
+
+# ==========================================================
+# TRANSPORT
+# ==========================================================
+class LLMTransport:
+    """
+    Panggil provider berurutan (yang breaker-nya mengizinkan), atau hedged kalau
+    `hedge_after` di-set. `accept(text)` buat validasi: kalau raise, jawaban dianggap
+    gagal (dihitung error provider itu) dan lanjut ke provider berikutnya.
+    """
+
+    def __init__(self, providers: Sequence[Provider], hedge_after: Optional[float] = None) -> None:
+        self.providers = {p.name: p for p in providers}
+        self.order = [p.name for p in providers]
+        self.hedge_after = hedge_after or None
+        self._executor = ThreadPoolExecutor(max_workers=max(2, 2 * len(providers)), thread_name_prefix="llm")
+
+    def _attempt(
+        self,
+        provider: Provider,
+        prompt: str,
+        timeout: float,
+        accept: Optional[Callable[[str], Any]],
+        system: Optional[str],
+        options: Dict[str, Any],
+    ) -> LLMResult:
+        if not provider.breaker.allow():
+            # half-open dan request percobaan lain masih jalan
+            provider.count("skipped")
+            raise LLMError(f"{provider.name}: circuit breaker {provider.breaker.state}")
+        t0 = time.perf_counter()
+        provider.count("calls")
+        try:
+            text = provider.call(prompt, timeout, system, **options)
+            value = accept(text) if accept else text
+        except Exception as e:
+            latency = time.perf_counter() - t0
+            provider.count("errors")
+            provider.breaker.record(False)
+            metrics.observe(f"llm_{provider.name}", latency, error=True)
+            if provider.breaker.state == "open":
+                logger.warning("LLM: breaker {} open ({} gagal beruntun)", provider.name, provider.breaker.failures)
+            raise LLMError(str(e)) from e
+        latency = time.perf_counter() - t0
+        provider.breaker.record(True)
+        metrics.observe(f"llm_{provider.name}", latency)
+        return LLMResult(text, value, provider.name, latency)
+
+    def _candidates(self, only: Optional[Sequence[str]]) -> List[Provider]:
+        out = []
+        for name in only or self.order:
+            provider = self.providers.get(name)
+            if provider is None or not provider.configured:
+                continue
+            if provider.breaker.state == "open":
+                provider.count("skipped")
+                continue
+            out.append(provider)
+        return out
+
+    def complete(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        timeout: Optional[float] = None,
+        accept: Optional[Callable[[str], Any]] = None,
+        providers: Optional[Sequence[str]] = None,
+        **options: Any,
+    ) -> Optional[LLMResult]:
+        """
+        Jawaban valid pertama, atau None kalau semua provider gagal / di-skip / lewat `timeout`.
+        `timeout` = batas total (detik) semua percobaan (None = tiap percobaan LLM_TIMEOUT_SECONDS);
+        options: json_schema, temperature, max_tokens, model (override model provider).
+        """
+        end = time.monotonic() + timeout if timeout else None
+        candidates = self._candidates(providers)
+        if not candidates:
+            logger.warning("LLM: nggak ada provider yang tersedia ({})", self.breaker_states())
+            return None
+        if self.hedge_after and len(candidates) > 1:
+            return self._hedged(candidates, prompt, end, accept, system, options)
+
+        for provider in candidates:
+            left = self._attempt_timeout(end)
+            if left <= 0.05:
+                break
+            try:
+                return self._attempt(provider, prompt, left, accept, system, options)
+            except LLMError as e:
+                logger.warning("LLM: {} gagal: {}", provider.name, e)
+        return None
+
+    @staticmethod
+    def _attempt_timeout(end: Optional[float]) -> float:
+        if end is None:
+            return settings.LLM_TIMEOUT_SECONDS
+        return min(settings.LLM_TIMEOUT_SECONDS, end - time.monotonic())
+
+    def _hedged(
+        self,
+        candidates: List[Provider],
+        prompt: str,
+        end: Optional[float],
+        accept: Optional[Callable[[str], Any]],
+        system: Optional[str],
+        options: Dict[str, Any],
+    ) -> Optional[LLMResult]:
+        """
+        Provider berikutnya ditembak kalau yang sebelumnya belum jawab dalam `hedge_after`
+        detik (atau langsung kalau sudah gagal). Request yang kalah dibiarkan selesai di
+        background (hasilnya cuma masuk stats).
+        """
+        pending: Dict[Future, Provider] = {}
+        queue = list(candidates)
+
+        def launch() -> None:
+            provider = queue.pop(0)
+            if pending:
+                provider.count("hedged")
+            left = max(0.05, self._attempt_timeout(end))
+            fut = self._executor.submit(self._attempt, provider, prompt, left, accept, system, options)
+            pending[fut] = provider
+
+        launch()
+        while pending:
+            left = None if end is None else end - time.monotonic()
+            if left is not None and left <= 0:
+                break
+            step = left
+            if queue:
+                step = self.hedge_after if left is None else min(left, self.hedge_after)
+            done, _ = wait(list(pending), timeout=step, return_when=FIRST_COMPLETED)
+            if not done:
+                if queue:
+                    logger.debug("LLM: belum ada jawaban {:.0f}ms, hedge ke {}", self.hedge_after * 1000, queue[0].name)
+                    launch()
+                continue
+            for fut in done:
+                provider = pending.pop(fut)
+                try:
+                    result = fut.result()
+                except LLMError as e:
+                    logger.warning("LLM: {} gagal: {}", provider.name, e)
+                    if queue:
+                        launch()
+                    continue
+                if provider is not candidates[0]:
+                    provider.count("hedge_wins")
+                    result.hedged = True
+                return result
+        return None
+
+    def breaker_states(self) -> Dict[str, str]:
+        return {name: p.breaker.state for name, p in self.providers.items()}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Counter + state breaker per provider. Latency ada di metrics stage "llm_<provider>".
+        """
+        return {
+            name: {**p.stats, "breaker": p.breaker.state, "configured": p.configured}
+            for name, p in self.providers.items()
+        }
+
+
+_TRANSPORT: Optional[LLMTransport] = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def build_transport() -> LLMTransport:
+    """
+    Transport baru dari settings. Urutan provider: Gemini dulu, OpenAI fallback.
+    """
+    return LLMTransport(
+        [
+            GeminiProvider(settings.GEMINI_BASE_URL, settings.GEMINI_API_KEY, settings.GEMINI_MODEL),
+            OpenAIProvider(settings.OPENAI_BASE_URL, settings.OPENAI_API_KEY, settings.OPENAI_MODEL),
+        ],
+        hedge_after=settings.LLM_HEDGE_AFTER_MS / 1000.0 if settings.LLM_HEDGE_AFTER_MS > 0 else None,
+    )
+
+
+def get_transport() -> LLMTransport:
+    """
+    Transport bersama (satu pool koneksi + breaker per provider buat semua client).
+    """
+    global _TRANSPORT
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is None:
+            _TRANSPORT = build_transport()
+            metrics.add_info("llm", _TRANSPORT.stats)
+            logger.info(
+                "LLMTransport siap: {} (hedge {}ms)",
+                [n for n, p in _TRANSPORT.providers.items() if p.configured],
+                settings.LLM_HEDGE_AFTER_MS or "off",
+            )
+        return _TRANSPORT
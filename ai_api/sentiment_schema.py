@@ -0,0 +1,109 @@
+from typing import Any, Dict, Iterable, List
+
+
+LABELS = ["bullish", "bearish", "neutral"]
+
+# Format jawaban batch sentiment (JSON schema subset)
+SENTIMENT_BATCH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "label": {"type": "string", "enum": LABELS},
+                    "score": {"type": "number", "minimum": -1, "maximum": 1},
+                },
+                "required": ["id", "label", "score"],
+            },
+        }
+    },
+    "required": ["results"],
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def validate(instance: Any, schema: Dict[str, Any], path: str = "$") -> None:
+    """
+    Validator JSON schema mini (type/enum/properties/required/items/minimum/maximum).
+    Cukup buat schema di file ini, biar nggak nambah dependency jsonschema.
+    """
+    expected = schema.get("type")
+    if expected:
+        py_type = _TYPES[expected]
+        if not isinstance(instance, py_type) or (expected in ("integer", "number") and isinstance(instance, bool)):
+            raise SchemaError(f"{path}: harus {expected}, dapat {type(instance).__name__}")
+
+    if "enum" in schema and instance not in schema["enum"]:
+        raise SchemaError(f"{path}: {instance!r} bukan salah satu {schema['enum']}")
+    if "minimum" in schema and instance < schema["minimum"]:
+        raise SchemaError(f"{path}: {instance} < {schema['minimum']}")
+    if "maximum" in schema and instance > schema["maximum"]:
+        raise SchemaError(f"{path}: {instance} > {schema['maximum']}")
+
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in instance:
+                raise SchemaError(f"{path}: field '{key}' wajib ada")
+        for key, sub in schema.get("properties", {}).items():
+            if key in instance:
+                validate(instance[key], sub, f"{path}.{key}")
+    elif expected == "array" and "items" in schema:
+        for i, item in enumerate(instance):
+            validate(item, schema["items"], f"{path}[{i}]")
+
+
+def to_gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gemini `responseSchema` pakai subset OpenAPI: type huruf besar,
+    tanpa minimum/maximum.
+    """
+    out: Dict[str, Any] = {"type": schema["type"].upper()}
+    if "enum" in schema:
+        out["enum"] = schema["enum"]
+    if "properties" in schema:
+        out["properties"] = {k: to_gemini_schema(v) for k, v in schema["properties"].items()}
+    if "required" in schema:
+        out["required"] = schema["required"]
+    if "items" in schema:
+        out["items"] = to_gemini_schema(schema["items"])
+    return out
+
+
+def estimate_tokens(text: str) -> int:
+    # kira-kira 4 karakter per token, cukup buat budgeting
+    return len(text) // 4 + 1
+
+
+def split_batches(items: Iterable[Dict[str, Any]], max_tokens: int, per_item_overhead: int = 12) -> List[List[Dict[str, Any]]]:
+    """
+    Pecah item {id, symbol, headline} jadi beberapa batch yang muat di budget token.
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for item in items:
+        cost = estimate_tokens(item["headline"]) + estimate_tokens(item.get("symbol", "")) + per_item_overhead
+        if current and used + cost > max_tokens:
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
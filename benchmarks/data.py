@@ -0,0 +1,161 @@
+"""
+Generator data synthetic buat benchmark (deterministik per seed).
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# field yang dipakai HistoryStore.add_deals (subset TradeDeal MetaTrader5)
+Deal = namedtuple("Deal", "ticket time symbol type entry volume price profit magic comment")
+
+_WORDS = (
+    "gold dollar fed rate inflation yields rally slump oil euro jobs data cpi "
+    "treasury hawkish dovish stocks record risk haven demand supply central bank"
+).split()
+
+
+def ohlc_frame(n: int, seed: int = 7, tf_minutes: int = 15) -> pd.DataFrame:
+    """
+    OHLC format MT5Feeder.get_history (index datetime, kolom open/high/low/close/tick_volume/spread).
+    Random walk harga ~2000 (XAUUSD).
+    """
+    rng = np.random.default_rng(seed)
+    close = 2000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0.0, 0.0008, (2, n))) * close
+    index = pd.date_range("2020-01-01", periods=n, freq=f"{tf_minutes}min", name="time")
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + wick[0],
+            "low": np.minimum(open_, close) - wick[1],
+            "close": close,
+            "tick_volume": rng.integers(50, 5000, n).astype("u8"),
+            "spread": np.full(n, 20, dtype="i4"),
+        },
+        index=index,
+    )
+
+
+# dtype copy_rates_* MetaTrader5
+RATES_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+
+
+def ohlc_rates(n: int, seed: int = 7, tf_minutes: int = 15) -> np.ndarray:
+    """
+    Data sama dengan ohlc_frame, format structured array MT5Feeder.get_rates.
+    """
+    df = ohlc_frame(n, seed, tf_minutes)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates["time"] = np.asarray(df.index).astype("datetime64[s]").astype(np.int64)
+    for col in ("open", "high", "low", "close", "tick_volume", "spread"):
+        rates[col] = df[col].to_numpy()
+    return rates
+
+
+def _headline(rng: np.random.Generator) -> str:
+    return " ".join(rng.choice(_WORDS, size=int(rng.integers(6, 14)))).capitalize()
+
+
+def rss_document(items: int, seed: int = 7) -> str:
+    """
+    Dokumen RSS 2.0 dengan `items` entry (title, link, pubDate, description).
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>', '<rss version="2.0"><channel>', "<title>Bench</title>"]
+    for i in range(items):
+        published = (now - timedelta(minutes=i)).strftime("%a, %d %b %Y %H:%M:%S +0000")
+        title = escape(_headline(rng))
+        parts.append(
+            f"<item><title>{title}</title><link>https://example.com/news/{i}</link>"
+            f"<pubDate>{published}</pubDate><description>{title}. {title}.</description></item>"
+        )
+    parts.append("</channel></rss>")
+    return "\n".join(parts)
+
+
+def status_payload(symbols: int = 4) -> Dict[str, Any]:
+    """
+    status.json seperti yang ditulis main_loop (top-level + map per symbol).
+    """
+    rng = np.random.default_rng(1)
+    per_symbol = {}
+    for i in range(symbols):
+        per_symbol[f"SYM{i}:15"] = {
+            "symbol": f"SYM{i}",
+            "timeframe_minutes": 15,
+            "technical": {"direction": "buy", "confidence": float(rng.random())},
+            "sentiment": {
+                "sentiment": "bullish",
+                "confidence": 0.7,
+                "headlines": [_headline(rng) for _ in range(5)],
+            },
+            "condition": {"tradable": True, "reason": "ok", "info": {"avg_range": 2.5}},
+            "decision": {"action": "HOLD", "reason": "low_technical_confidence", "lot": 0},
+        }
+    primary = next(iter(per_symbol.values()))
+    return {
+        "timestamp": "2025-01-01T00:00:00Z",
+        **primary,
+        "mode": "SAFE",
+        "dry_run": True,
+        "symbols": per_symbol,
+    }
+
+
+def history_payload(signals: int, seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    history.json dengan `signals` sinyal + PnL harian/mingguan.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2020, 1, 1)
+    actions = np.array(["BUY", "SELL", "HOLD"])
+    return {
+        "daily_pnl": [
+            {"date": (start + timedelta(days=d)).strftime("%Y-%m-%d"), "pnl": round(float(p), 2)}
+            for d, p in enumerate(rng.normal(0, 25, max(1, signals // 100)))
+        ],
+        "weekly_pnl": [
+            {"week": w, "pnl": round(float(p), 2)} for w, p in enumerate(rng.normal(0, 60, max(1, signals // 700)))
+        ],
+        "signals": [
+            {
+                "time": (start + timedelta(minutes=15 * i)).isoformat(),
+                "symbol": "XAUUSD",
+                "action": str(a),
+                "reason": "technical_signal",
+            }
+            for i, a in enumerate(rng.choice(actions, size=signals))
+        ],
+    }
+
+
+def deals(n: int, seed: int = 7) -> List[Deal]:
+    """
+    Deal closed (P/L) tiap 15 menit mulai 2020-01-01, buat agregasi PnL harian/mingguan.
+    """
+    rng = np.random.default_rng(seed)
+    start = int(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp())
+    profits = rng.normal(0, 5, n)
+    return [
+        Deal(i + 1, start + 900 * i, "XAUUSD", i % 2, 1, 0.01, 2000.0, round(float(p), 2), 123456, "")
+        for i, p in enumerate(profits)
+    ]
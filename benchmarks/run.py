@@ -0,0 +1,333 @@
+"""
+Benchmark hot path analisa & dashboard.
+
+    python -m benchmarks.run                          # ukuran 1k,100k
+    python -m benchmarks.run --sizes 1k,100k,1m --out benchmarks/results/latest.json
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --threshold 0.25
+    python -m benchmarks.run --filter technical
+
+Hasil disimpan JSON (median/min/mean per case). Kalau --baseline dikasih,
+case yang median-nya lebih lambat dari baseline * (1 + threshold) ditandai
+REGRESSION dan exit code 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from benchmarks import data
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_OUT = ROOT / "results" / "latest.json"
+
+# setup(n) -> (fungsi yang diukur, jumlah operasi per panggilan)
+Setup = Callable[[int], Tuple[Callable[[], Any], int]]
+CASES: Dict[str, Tuple[Setup, bool]] = {}
+
+
+def case(name: str, sized: bool = True) -> Callable[[Setup], Setup]:
+    """
+    Daftarkan benchmark. sized=False -> cuma jalan sekali (nggak tergantung --sizes).
+    """
+
+    def register(fn: Setup) -> Setup:
+        CASES[name] = (fn, sized)
+        return fn
+
+    return register
+
+
+# ==========================================================
+# CASES
+# ==========================================================
+@case("technical.analyze_cold")
+def _technical_cold(n: int):
+    from core.brains.technical_brain import TechnicalBrain
+
+    df = data.ohlc_frame(n)
+    return lambda: TechnicalBrain().analyze(df), 1
+
+
+@case("technical.analyze_warm")
+def _technical_warm(n: int):
+    from core.brains.technical_brain import TechnicalBrain
+
+    df = data.ohlc_frame(n)
+    brain = TechnicalBrain()
+    brain.analyze(df)  # engine sudah sync, yang diukur jalur per-cycle
+    return lambda: brain.analyze(df), 1
+
+
+@case("technical.analyze_rates_warm")
+def _technical_rates_warm(n: int):
+    from core.brains.technical_brain import TechnicalBrain
+
+    rates = data.ohlc_rates(n)
+    brain = TechnicalBrain()
+    brain.analyze(rates)  # jalur array (tanpa DataFrame), seperti AnalysisPool
+    return lambda: brain.analyze(rates), 1
+
+
+@case("technical.analyze_full")
+def _technical_full(n: int):
+    from core.brains.technical_brain import TechnicalBrain
+
+    df = data.ohlc_frame(n)
+    brain = TechnicalBrain()
+    return lambda: brain.analyze_full(df), 1
+
+
+@case("condition.analyze")
+def _condition(n: int):
+    from core.brains.condition_brain import ConditionBrain
+
+    df = data.ohlc_frame(n)
+    brain = ConditionBrain()
+    return lambda: brain.analyze(df), 1
+
+
+@case("condition.analyze_rates")
+def _condition_rates(n: int):
+    from core.brains.condition_brain import ConditionBrain
+
+    rates = data.ohlc_rates(n)
+    brain = ConditionBrain()
+    return lambda: brain.analyze(rates), 1
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.headers: Dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _LocalSession:
+    """
+    Ganti requests.Session NewsFeeder: balikin dokumen RSS lokal (tanpa network),
+    jadi yang diukur cuma parsing.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.response = _Response(text)
+
+    def get(self, url: str, **kwargs: Any) -> _Response:
+        return self.response
+
+
+@case("news.parse")
+def _news_parse(n: int):
+    from core.feeder.news_feeder import NewsFeeder
+
+    items = min(max(n // 100, 10), 10_000)
+    feeder = NewsFeeder(feeds=["bench://rss"], deadline=60)
+    feeder.session = _LocalSession(data.rss_document(items))
+    return lambda: feeder._fetch_feed("bench://rss"), 1
+
+
+@case("news.filter")
+def _news_filter(n: int):
+    from core.feeder.news_feeder import NewsFeeder
+
+    rng = np.random.default_rng(7)
+    now = time.gmtime()
+    items = [{"title": data._headline(rng), "published_parsed": now} for _ in range(min(max(n // 100, 10), 1_000))]
+    feeder = NewsFeeder(feeds=["bench://rss"], deadline=60)
+    # dedup near-duplicate + skor relevansi, tanpa fetch
+    return lambda: feeder.select(items, "XAUUSD", limit=6), 1
+
+
+@case("sentiment.local_score", sized=False)
+def _local_sentiment(n: int):
+    from core.brains.local_sentiment import LocalSentimentScorer
+
+    rng = np.random.default_rng(7)
+    headlines = [data._headline(rng) for _ in range(100)]
+    scorer = LocalSentimentScorer(model_path=os.path.join(tempfile.mkdtemp(), "model.npz"))
+    return lambda: [scorer.score(h, "XAUUSD") for h in headlines], len(headlines)
+
+
+@case("dashboard.load_status", sized=False)
+def _load_status(n: int):
+    from dashboard import status_loader
+
+    path = Path("data/status.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data.status_payload()), encoding="utf-8")
+    return status_loader.load_status, 1
+
+
+@case("dashboard.load_history")
+def _load_history(n: int):
+    from config.settings import settings
+    from dashboard import status_loader
+
+    # history.json lama -> diimport ke SQLite sekali, yang diukur query satu halaman
+    path = Path("data/history.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data.history_payload(max(n // 10, 10))), encoding="utf-8")
+    settings.HISTORY_DB = str(Path(f"data/history-{n}.db").resolve())
+    status_loader._history = None
+    status_loader.history_store().add_deals(data.deals(max(n // 10, 10)))
+    return status_loader.load_history, 1
+
+
+@case("orchestrator.decide")
+def _decide(n: int):
+    from core.orchestrator.orchestrator import Orchestrator
+
+    ops = min(n, 10_000)
+    rng = np.random.default_rng(3)
+    directions = rng.choice(["buy", "sell", "neutral"], size=ops)
+    confidences = rng.random(ops)
+    inputs = [{"direction": str(d), "confidence": float(c)} for d, c in zip(directions, confidences)]
+    sentiment = {"sentiment": "neutral", "confidence": 0.5, "stale": False}
+    condition = {"tradable": True, "reason": "ok", "info": {}}
+    control = {"trading_enabled": True, "mode": "BALANCED"}
+    orchestrator = Orchestrator()
+
+    def run() -> None:
+        for technical in inputs:
+            orchestrator.decide(technical, sentiment, condition, None, control)
+
+    return run, ops
+
+
+# ==========================================================
+# HARNESS
+# ==========================================================
+def measure(fn: Callable[[], Any], min_time: float = 0.5, min_runs: int = 3, max_runs: int = 50) -> List[float]:
+    """
+    Panggilan pertama = warm-up. Kalau warm-up sendiri sudah lama (> 1 detik),
+    hasilnya dipakai sebagai satu-satunya sampel.
+    """
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+    if first > max(min_time, 1.0):
+        return [first]
+
+    times: List[float] = []
+    while len(times) < min_runs or (sum(times) < min_time and len(times) < max_runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_cases(sizes: List[str], pattern: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (setup, sized) in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        for label in sizes if sized else ["default"]:
+            n = data.SIZES.get(label, 0)
+            fn, ops = setup(n)
+            times = measure(fn)
+            median = statistics.median(times)
+            key = f"{name}@{label}"
+            results[key] = {
+                "n": n,
+                "ops": ops,
+                "runs": len(times),
+                "median": median,
+                "min": min(times),
+                "mean": statistics.fmean(times),
+                "per_op": median / ops,
+            }
+            print(f"{key:40s} median={median * 1000:10.3f} ms  per_op={median / ops * 1e6:10.2f} us  runs={len(times)}")
+    return results
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    Bandingkan median per case. Return daftar case yang regresi.
+    """
+    regressions = []
+    print(f"\n{'case':40s} {'baseline':>12s} {'current':>12s} {'ratio':>8s}")
+    for key, cur in current.items():
+        base = baseline.get(key)
+        if not base:
+            print(f"{key:40s} {'-':>12s} {cur['median'] * 1000:10.3f}ms {'new':>8s}")
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] else float("inf")
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif ratio < 1.0 - threshold:
+            flag = "  faster"
+        print(f"{key:40s} {base['median'] * 1000:10.3f}ms {cur['median'] * 1000:10.3f}ms {ratio:8.2f}{flag}")
+    return regressions
+
+
+def _meta() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hot path bot & dashboard")
+    parser.add_argument("--sizes", default="1k,100k", help=f"ukuran data, pilihan: {','.join(data.SIZES)}")
+    parser.add_argument("--filter", help="cuma case yang namanya mengandung teks ini")
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="file JSON hasil")
+    parser.add_argument("--baseline", help="file JSON hasil sebelumnya buat dibandingkan")
+    parser.add_argument("--threshold", type=float, default=0.25, help="batas regresi (0.25 = 25%% lebih lambat)")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in data.SIZES]
+    if unknown:
+        parser.error(f"ukuran nggak dikenal: {unknown}")
+
+    # log brain/dashboard jangan ikut keukur
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    out = Path(args.out).resolve()
+    baseline_path = Path(args.baseline).resolve() if args.baseline else None
+
+    # file dashboard (data/status.json dst) ditulis di folder sementara
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            results = run_cases(sizes, args.filter)
+        finally:
+            os.chdir(cwd)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"meta": _meta(), "results": results}, indent=2), encoding="utf-8")
+    print(f"\nHasil disimpan: {out}")
+
+    if baseline_path:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresi (> {args.threshold:.0%} lebih lambat): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
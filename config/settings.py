@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -25,6 +25,15 @@ class Settings:
     # Kita fokus XAUUSD (Gold) dulu
     SYMBOL: str = os.getenv("SYMBOL", "XAUUSD")
     TIMEFRAME_MINUTES: int = int(os.getenv("TIMEFRAME_MINUTES", "15"))
+    # multi-symbol: "XAUUSD:15,EURUSD:5" (kosong = cuma SYMBOL/TIMEFRAME_MINUTES)
+    SYMBOLS: str = os.getenv("SYMBOLS", "")
+    # konfirmasi timeframe lebih tinggi, mis. "60,240" (kosong = nonaktif).
+    # Kalau diisi, semua timeframe dibangun dari satu stream M1
+    HIGHER_TIMEFRAMES: str = os.getenv("HIGHER_TIMEFRAMES", "")
+    # confidence teknikal dikali ini kalau arah timeframe tinggi berlawanan
+    MTF_CONFLICT_FACTOR: float = float(os.getenv("MTF_CONFLICT_FACTOR", "0.5"))
+    # jumlah proses analisa (0 = analisa di proses utama)
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "0"))
 
     # --- MT5 CONFIG ---
     MT5_LOGIN: Optional[int] = (
@@ -33,12 +42,30 @@ class Settings:
     MT5_PASSWORD: Optional[str] = os.getenv("MT5_PASSWORD")
     MT5_SERVER: Optional[str] = os.getenv("MT5_SERVER")
     MT5_PATH: Optional[str] = os.getenv("MT5_PATH")  # path terminal MT5 kalau perlu
+    # "terminal" = MetaTrader5 asli, "sim" = simulator in-process (Linux / CI / benchmark)
+    MT5_BACKEND: str = os.getenv("MT5_BACKEND", "terminal").lower()
+
+    # --- SIMULATOR (MT5_BACKEND=sim) ---
+    SIM_DATA_SOURCE: str = os.getenv("SIM_DATA_SOURCE", "synthetic")  # synthetic | store
+    SIM_SPEED: float = float(os.getenv("SIM_SPEED", "1"))  # detik sim per detik asli, 0 = manual
+    SIM_LATENCY_MS: float = float(os.getenv("SIM_LATENCY_MS", "0"))
+    SIM_SPREAD_POINTS: int = int(os.getenv("SIM_SPREAD_POINTS", "20"))
+    SIM_REQUOTE_PROB: float = float(os.getenv("SIM_REQUOTE_PROB", "0"))
+    SIM_SEED: int = int(os.getenv("SIM_SEED", "42"))
 
     # --- RISK CONFIG ---
     ACCOUNT_CURRENCY: str = os.getenv("ACCOUNT_CURRENCY", "USD")
     RISK_PER_TRADE_PCT: float = float(os.getenv("RISK_PER_TRADE_PCT", "1.0"))
     MAX_DAILY_DRAWDOWN_PCT: float = float(os.getenv("MAX_DAILY_DRAWDOWN_PCT", "3.0"))
     MAX_OPEN_TRADES: int = int(os.getenv("MAX_OPEN_TRADES", "3"))
+    # spec symbol (point, contract size, volume) di-cache selama ini (detik)
+    SYMBOL_SPEC_TTL_SECONDS: float = float(os.getenv("SYMBOL_SPEC_TTL_SECONDS", "3600"))
+
+    # --- EXECUTION ---
+    ORDER_MAGIC: int = int(os.getenv("ORDER_MAGIC", "123456"))
+    ORDER_DEVIATION_POINTS: int = int(os.getenv("ORDER_DEVIATION_POINTS", "50"))
+    # retry maksimal kalau requote / price changed / off quotes
+    ORDER_MAX_RETRIES: int = int(os.getenv("ORDER_MAX_RETRIES", "3"))
 
     # --- AI CONFIG ---
     USE_GEMINI_FOR_SENTIMENT: bool = (
@@ -52,9 +79,73 @@ class Settings:
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 
+    # --- NEWS ---
+    # batas waktu total fetch semua RSS feed per cycle (detik)
+    NEWS_FETCH_DEADLINE_SECONDS: float = float(os.getenv("NEWS_FETCH_DEADLINE_SECONDS", "5"))
+    # headline dengan skor relevansi symbol di bawah ini dibuang (keyword aset = 2, makro = 1)
+    NEWS_MIN_RELEVANCE: float = float(os.getenv("NEWS_MIN_RELEVANCE", "1"))
+    # keyword tambahan per symbol, mis. "XAUUSD:comex|gold futures,US30:dow|wall street"
+    NEWS_KEYWORDS: str = os.getenv("NEWS_KEYWORDS", "")
+    # headline beda feed dengan kemiripan kata (estimasi Jaccard) >= ini dan aset + arah
+    # yang sama dianggap berita yang sama
+    NEWS_DEDUP_THRESHOLD: float = float(os.getenv("NEWS_DEDUP_THRESHOLD", "0.75"))
+
+    # --- PIPELINE ---
+    # sentiment di-refresh di background tiap N detik; lebih tua dari MAX_AGE = basi (diabaikan)
+    SENTIMENT_REFRESH_SECONDS: float = float(os.getenv("SENTIMENT_REFRESH_SECONDS", "180"))
+    # batas total satu refresh: fetch berita + budget LLM dipotong ke sisa waktu ini
+    SENTIMENT_DEADLINE_SECONDS: float = float(os.getenv("SENTIMENT_DEADLINE_SECONDS", "30"))
+    SENTIMENT_MAX_AGE_SECONDS: float = float(os.getenv("SENTIMENT_MAX_AGE_SECONDS", "900"))
+    # deadline stage di jalur trading; lewat = Orchestrator HOLD
+    MARKET_STAGE_DEADLINE_SECONDS: float = float(os.getenv("MARKET_STAGE_DEADLINE_SECONDS", "5"))
+    ANALYSIS_STAGE_DEADLINE_SECONDS: float = float(os.getenv("ANALYSIS_STAGE_DEADLINE_SECONDS", "2"))
+
+    # --- DASHBOARD PUSH ---
+    # bot push status/decision/metrics ke dashboard (SSE); kosong = nonaktif
+    DASHBOARD_EVENTS_URL: str = os.getenv("DASHBOARD_EVENTS_URL", "http://127.0.0.1:5000/api/events/publish")
+    DASHBOARD_EVENTS_TOKEN: Optional[str] = os.getenv("DASHBOARD_EVENTS_TOKEN")
+
     # --- LOOP CONFIG ---
+    # loop jalan per bar close (poll tick tiap TICK_POLL_SECONDS);
+    # TICK_POLL_SECONDS=0 -> mode lama, sleep fix LOOP_SLEEP_SECONDS
+    TICK_POLL_SECONDS: float = float(os.getenv("TICK_POLL_SECONDS", "0.25"))
+    # analisa tambahan di tengah bar tiap N detik (0 = cuma saat bar close)
+    INTRABAR_SECONDS: float = float(os.getenv("INTRABAR_SECONDS", "0"))
     LOOP_SLEEP_SECONDS: int = int(os.getenv("LOOP_SLEEP_SECONDS", "60"))
     MIN_BARS_REQUIRED: int = int(os.getenv("MIN_BARS_REQUIRED", "200"))
 
+    # --- DATA FEED ---
+    # kapasitas ring buffer bar per symbol/timeframe di MT5Feeder
+    BAR_BUFFER_CAPACITY: int = int(os.getenv("BAR_BUFFER_CAPACITY", "2000"))
+    # simpan bar closed ke disk (data/bars/...) buat backtest & dashboard
+    BAR_STORE_ENABLED: bool = os.getenv("BAR_STORE_ENABLED", "true").lower() == "true"
+    BAR_STORE_DIR: str = os.getenv("BAR_STORE_DIR", os.path.join(BASE_DIR, "data", "bars"))
+    # history signal / trade / deal (SQLite, dibaca dashboard)
+    HISTORY_DB: str = os.getenv("HISTORY_DB", os.path.join(BASE_DIR, "data", "history.db"))
+
+    def symbol_list(self) -> List[Tuple[str, int]]:
+        """
+        List (symbol, timeframe menit) yang dijalankan bot.
+        """
+        pairs: List[Tuple[str, int]] = []
+        for part in self.SYMBOLS.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            symbol, _, tf = part.partition(":")
+            pairs.append((symbol.strip(), int(tf) if tf else self.TIMEFRAME_MINUTES))
+        return pairs or [(self.SYMBOL, self.TIMEFRAME_MINUTES)]
+
+    def higher_timeframes(self) -> List[int]:
+        return sorted({int(tf) for tf in self.HIGHER_TIMEFRAMES.split(",") if tf.strip()})
+
+    def news_keywords(self) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {}
+        for part in self.NEWS_KEYWORDS.split(","):
+            symbol, _, words = part.partition(":")
+            if symbol.strip() and words:
+                out.setdefault(symbol.strip().upper(), []).extend(w.strip() for w in words.split("|") if w.strip())
+        return out
+
 
 settings = Settings()
@@ -0,0 +1,397 @@
+"""
+Parameter sweep (grid / random search) TechnicalBrain + threshold mode Orchestrator
+di atas VectorBacktester, paralel pakai process pool.
+
+    python -m core.backtest.optimizer --symbol XAUUSD --tf 15 --workers 4
+    python -m core.backtest.optimizer data.csv --search random --samples 300 --top 5
+    python -m core.backtest.optimizer --symbol XAUUSD --space '{"ema_fast": [10, 20], "rsi_buy": [30, 35]}'
+
+- Indikator yang nggak tergantung parameter (RSI, MACD, Stoch, ATR) dihitung sekali
+  di proses utama, EMA sekali per span unik. Semuanya (plus bar) ditaruh di satu blok
+  shared memory; worker cuma attach, nggak ada pickling array
+- Satu task = satu set TechnicalParams: skor dihitung sekali, dipakai semua kandidat
+  threshold semua mode. Threshold yang jatuh di level confidence yang sama nggak
+  disimulasi ulang
+- Output: tabel ranking per mode (+ JSON kalau --out)
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from core.backtest.vector_backtest import (
+    VectorBacktester,
+    condition_flags,
+    load_bars,
+    mode_signals,
+    technical_scores,
+)
+from core.brains.indicator_engine import compute_indicators
+from core.brains.technical_params import TechnicalParams
+from core.storage.bar_store import BarStore
+
+
+DEFAULT_SPACE: Dict[str, List[Any]] = {
+    "ema_fast": [10, 20, 30],
+    "ema_slow": [50, 100],
+    "rsi_buy": [30, 35, 40],
+    "rsi_sell": [60, 65, 70],
+    "stoch_buy": [20, 25],
+    "stoch_sell": [75, 80],
+    "atr_factor": [0.5, 0.7],
+}
+# kandidat threshold per mode = threshold MODE_PARAMS + offset
+CONF_OFFSETS = (-0.1, -0.05, 0.0, 0.05, 0.1)
+LOWER_IS_BETTER = {"max_drawdown_pct"}
+BASE_INDICATORS = ("rsi", "macd", "signal", "stoch", "atr", "atr_mean")
+
+Candidate = Tuple[str, float, float]  # (mode, conf_threshold, lot)
+
+
+# ==========================================================
+# PARAMETER SPACE
+# ==========================================================
+def _valid(params: TechnicalParams) -> bool:
+    return (
+        params.ema_fast < params.ema_slow
+        and params.rsi_buy < params.rsi_sell
+        and params.stoch_buy < params.stoch_sell
+    )
+
+
+def grid(space: Dict[str, Sequence[Any]]) -> List[TechnicalParams]:
+    names = list(space)
+    sets = (TechnicalParams.from_dict(dict(zip(names, values))) for values in itertools.product(*space.values()))
+    return [p for p in sets if _valid(p)]
+
+
+def random_sample(space: Dict[str, Sequence[Any]], samples: int, seed: int = 0) -> List[TechnicalParams]:
+    """
+    `samples` set unik diambil acak dari grid (kalau grid lebih kecil -> seluruh grid).
+    """
+    if samples >= math.prod(len(v) for v in space.values()):
+        return grid(space)
+    rng = random.Random(seed)
+    seen: Dict[TechnicalParams, None] = {}
+    for _ in range(samples * 50):
+        params = TechnicalParams.from_dict({name: rng.choice(list(values)) for name, values in space.items()})
+        if _valid(params):
+            seen.setdefault(params)
+            if len(seen) >= samples:
+                break
+    return list(seen)
+
+
+def mode_candidates(
+    mode_params: Dict[str, Dict[str, float]],
+    modes: Iterable[str],
+    offsets: Sequence[float] = CONF_OFFSETS,
+) -> List[Candidate]:
+    out: List[Candidate] = []
+    for mode in modes:
+        base = mode_params[mode]
+        for conf in sorted({round(base["conf_threshold"] + off, 4) for off in offsets}):
+            if 0 < conf <= 1:
+                out.append((mode, conf, base["lot"]))
+    return out
+
+
+# ==========================================================
+# SHARED MEMORY
+# ==========================================================
+class SharedArrays:
+    """
+    Beberapa array float64 1-D (panjang sama) dalam satu blok shared memory.
+    Proses utama yang create + unlink, worker cuma `attach`.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.names = list(arrays)
+        self.n = len(next(iter(arrays.values())))
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, len(self.names) * self.n * 8))
+        block = np.ndarray((len(self.names), self.n), dtype=np.float64, buffer=self.shm.buf)
+        for i, name in enumerate(self.names):
+            block[i] = arrays[name]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @staticmethod
+    def attach(name: str, names: List[str], n: int) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        shm = shared_memory.SharedMemory(name=name)
+        block = np.ndarray((len(names), n), dtype=np.float64, buffer=shm.buf)
+        return shm, {col: block[i] for i, col in enumerate(names)}
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ==========================================================
+# SISI WORKER
+# ==========================================================
+_STATE: Dict[str, Any] = {}
+
+
+def set_state(arrays: Dict[str, np.ndarray], tester_kwargs: Dict[str, Any]) -> None:
+    _STATE.update(arrays=arrays, tester=VectorBacktester(**tester_kwargs))
+
+
+def init_worker(shm_name: str, names: List[str], n: int, tester_kwargs: Dict[str, Any]) -> None:
+    shm, arrays = SharedArrays.attach(shm_name, names, n)
+    _STATE["shm"] = shm  # referensi dipegang supaya buffer nggak ketutup
+    set_state(arrays, tester_kwargs)
+
+
+def _bars(sl: slice) -> Dict[str, np.ndarray]:
+    arrays = _STATE["arrays"]
+    bars = {col: arrays[col][sl] for col in ("open", "high", "low", "close")}
+    bars["time"] = arrays["time"][sl].astype("i8")
+    if "spread" in arrays:
+        bars["spread"] = arrays["spread"][sl]
+    return bars
+
+
+def evaluate(
+    params: TechnicalParams,
+    candidates: List[Candidate],
+    start: int = 0,
+    end: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Simulasi satu set parameter untuk semua kandidat, di range bar [start, end).
+    Indikator sudah dihitung di seluruh history (kausal), di sini cuma di-slice.
+    """
+    arrays = _STATE["arrays"]
+    tester: VectorBacktester = _STATE["tester"]
+    sl = slice(start, end)
+
+    ind = {name: arrays[name][sl] for name in BASE_INDICATORS}
+    ind["ema_fast"] = arrays[f"ema_{params.ema_fast}"][sl]
+    ind["ema_slow"] = arrays[f"ema_{params.ema_slow}"][sl]
+    scores = technical_scores(ind, params)
+    tradable = arrays["tradable"][sl] > 0.5 if tester.require_tradable else None
+    prepared = {"bars": _bars(sl)}
+
+    # confidence cuma punya beberapa level diskrit; threshold yang jatuh di level
+    # yang sama menghasilkan sinyal identik -> stats di-cache
+    levels = np.unique(scores["confidence"])
+    cache: Dict[Tuple[Optional[float], float], Dict[str, float]] = {}
+    rows = []
+    for mode, conf, lot in candidates:
+        idx = int(np.searchsorted(levels, conf, side="left"))
+        key = (float(levels[idx]) if idx < len(levels) else None, lot)
+        if key not in cache:
+            signals = mode_signals(scores, conf, tradable)
+            cache[key] = tester.simulate(prepared, signals, lot, mode).stats
+        rows.append({"mode": mode, "conf_threshold": conf, "lot": lot, **params.to_dict(), **cache[key]})
+    return rows
+
+
+# ==========================================================
+# SISI PROSES UTAMA
+# ==========================================================
+def prepare_inputs(
+    bars: Dict[str, np.ndarray], param_sets: List[TechnicalParams], tester: VectorBacktester
+) -> Tuple[Dict[str, np.ndarray], List[int]]:
+    """
+    Semua array yang dibutuhkan worker: bar, indikator dasar, EMA per span unik.
+    """
+    base = compute_indicators(bars["high"], bars["low"], bars["close"], window=tester.window)
+    arrays: Dict[str, np.ndarray] = {col: bars[col] for col in ("open", "high", "low", "close")}
+    arrays["time"] = bars["time"].astype(np.float64)
+    if "spread" in bars:
+        arrays["spread"] = bars["spread"]
+    for name in BASE_INDICATORS:
+        arrays[name] = base[name]
+
+    close = pd.Series(bars["close"])
+    spans = sorted({p.ema_fast for p in param_sets} | {p.ema_slow for p in param_sets})
+    for span in spans:
+        arrays[f"ema_{span}"] = close.ewm(span=span).mean().to_numpy()
+
+    if tester.require_tradable:
+        arrays["tradable"] = condition_flags(bars["high"], bars["low"], bars["close"])["tradable"].astype(np.float64)
+    return arrays, spans
+
+
+@contextmanager
+def worker_pool(
+    arrays: Dict[str, np.ndarray], tester_kwargs: Dict[str, Any], workers: int
+) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """
+    Pool proses yang worker-nya sudah attach ke `arrays` (shared memory).
+    workers=0 -> None, state dipasang di proses ini.
+    """
+    if workers <= 0:
+        set_state(arrays, tester_kwargs)
+        yield None
+        return
+    shared = SharedArrays(arrays)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(shared.name, shared.names, shared.n, tester_kwargs),
+        ) as pool:
+            yield pool
+    finally:
+        shared.close()
+
+
+def rank(rows: List[Dict[str, Any]], metric: str = "sharpe", min_trades: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Kelompokkan per mode, urutkan dari yang terbaik menurut `metric`.
+    Kombinasi dengan trade < `min_trades` dibuang (hasil kebetulan).
+    """
+    reverse = metric not in LOWER_IS_BETTER
+    ranked: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        if row["trades"] >= min_trades:
+            ranked.setdefault(row["mode"], []).append(row)
+    for mode_rows in ranked.values():
+        mode_rows.sort(key=lambda r: r[metric], reverse=reverse)
+    return ranked
+
+
+def optimize(
+    data: Any,
+    param_sets: List[TechnicalParams],
+    modes: Optional[Iterable[str]] = None,
+    offsets: Sequence[float] = CONF_OFFSETS,
+    workers: int = 0,
+    metric: str = "sharpe",
+    min_trades: int = 0,
+    tester_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Evaluasi semua `param_sets` x kandidat threshold tiap mode.
+    workers=0 -> jalan di proses ini (tanpa pool / shared memory).
+    """
+    tester_kwargs = dict(tester_kwargs or {})
+    tester = VectorBacktester(**tester_kwargs)
+    candidates = mode_candidates(tester.mode_params, modes or tester.mode_params.keys(), offsets)
+    bars = load_bars(data)
+
+    t0 = time.perf_counter()
+    arrays, spans = prepare_inputs(bars, param_sets, tester)
+    logger.info(
+        "Optimizer: {} bar, {} set parameter x {} kandidat mode, EMA span {} (prepare {:.2f}s)",
+        len(bars["close"]),
+        len(param_sets),
+        len(candidates),
+        spans,
+        time.perf_counter() - t0,
+    )
+
+    rows: List[Dict[str, Any]] = []
+    with worker_pool(arrays, tester_kwargs, workers) as pool:
+        if pool is None:
+            for params in param_sets:
+                rows.extend(evaluate(params, candidates))
+        else:
+            chunksize = max(1, len(param_sets) // (workers * 4))
+            for part in pool.map(evaluate, param_sets, itertools.repeat(candidates), chunksize=chunksize):
+                rows.extend(part)
+
+    logger.info("Optimizer: {} kombinasi selesai dalam {:.2f}s", len(rows), time.perf_counter() - t0)
+    return rank(rows, metric, min_trades)
+
+
+# ==========================================================
+# CLI
+# ==========================================================
+TABLE_COLUMNS = [
+    "conf_threshold",
+    *TechnicalParams().to_dict(),
+    "net_pnl",
+    "return_pct",
+    "trades",
+    "win_rate",
+    "max_drawdown_pct",
+    "sharpe",
+]
+
+
+def _print_table(mode: str, rows: List[Dict[str, Any]], metric: str) -> None:
+    print(f"\n=== {mode} (urut {metric}) ===")
+    if not rows:
+        print("(nggak ada kombinasi yang lolos --min-trades)")
+        return
+    df = pd.DataFrame(rows)[TABLE_COLUMNS]
+    df.insert(0, "rank", range(1, len(df) + 1))
+    print(df.round(4).to_string(index=False))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Optimizer parameter TechnicalBrain + mode Orchestrator")
+    parser.add_argument("csv", nargs="?", help="CSV dengan kolom time,open,high,low,close[,spread]")
+    parser.add_argument("--symbol", help="baca dari BarStore (data/bars) kalau CSV nggak dikasih")
+    parser.add_argument("--tf", type=int, default=15, help="timeframe BarStore (menit)")
+    parser.add_argument("--start", help="awal range BarStore (mis. 2024-01-01)")
+    parser.add_argument("--end", help="akhir range BarStore")
+    parser.add_argument("--slippage", type=float, default=5.0, help="slippage (points)")
+    parser.add_argument("--spread", type=float, default=None, help="spread tetap (points)")
+    parser.add_argument("--require-tradable", action="store_true")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=100, help="jumlah set parameter (--search random)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--space", help="JSON {param: [nilai, ...]} pengganti DEFAULT_SPACE")
+    parser.add_argument("--modes", help="mis. SAFE,BALANCED (default semua)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 = tanpa pool")
+    parser.add_argument("--metric", default="sharpe", help="sharpe | net_pnl | return_pct | win_rate | max_drawdown_pct")
+    parser.add_argument("--min-trades", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", help="simpan ranking (top N per mode) ke JSON")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        data = pd.read_csv(args.csv)
+    elif args.symbol:
+        data = BarStore(args.symbol, args.tf).read(args.start, args.end)
+    else:
+        parser.error("isi path CSV atau --symbol")
+
+    space = json.loads(args.space) if args.space else DEFAULT_SPACE
+    unknown = set(space) - set(TechnicalParams().to_dict())
+    if unknown:
+        parser.error(f"parameter nggak dikenal: {sorted(unknown)}")
+    param_sets = grid(space) if args.search == "grid" else random_sample(space, args.samples, args.seed)
+
+    ranked = optimize(
+        data,
+        param_sets,
+        modes=[m.strip().upper() for m in args.modes.split(",")] if args.modes else None,
+        workers=args.workers,
+        metric=args.metric,
+        min_trades=args.min_trades,
+        tester_kwargs={
+            "spread_points": args.spread,
+            "slippage_points": args.slippage,
+            "require_tradable": args.require_tradable,
+        },
+    )
+    for mode, rows in ranked.items():
+        _print_table(mode, rows[: args.top], args.metric)
+
+    if args.out:
+        out = {"metric": args.metric, "space": space, "modes": {m: rows[: args.top] for m, rows in ranked.items()}}
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(out, fh, indent=2)
+        print(f"\nHasil disimpan: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
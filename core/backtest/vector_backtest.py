@@ -0,0 +1,312 @@
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from core.brains.indicator_engine import compute_indicators
+from core.brains.technical_params import TechnicalParams
+from core.orchestrator.orchestrator import MODE_PARAMS
+from core.storage.bar_store import BarStore
+
+
+FILL_DTYPE = np.dtype(
+    [
+        ("bar", "i8"),
+        ("time", "i8"),
+        ("side", "i1"),
+        ("qty", "f8"),
+        ("price", "f8"),
+        ("cost", "f8"),
+    ]
+)
+
+
+@dataclass
+class BacktestResult:
+    mode: str
+    signals: np.ndarray  # +1 BUY, -1 SELL, 0 HOLD (per bar, di close bar)
+    position: np.ndarray  # posisi yang dipegang selama bar (-1 / 0 / +1)
+    fills: np.ndarray  # FILL_DTYPE
+    equity: np.ndarray
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+def _epoch_seconds(values: Any) -> np.ndarray:
+    """
+    Kolom time -> epoch detik (int64). Bisa angka epoch, datetime64 unit apa saja
+    (ns / us / s), atau string tanggal (CSV).
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "OUS":
+        values = np.asarray(pd.to_datetime(values, utc=True).tz_convert(None))
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[s]")
+    return values.astype("i8")
+
+
+def load_bars(data: Any) -> Dict[str, np.ndarray]:
+    """
+    Normalisasi input jadi dict kolom numpy.
+    Bisa: structured array dari MT5 (copy_rates_*), DataFrame dari MT5Feeder
+    (index datetime), atau dict kolom.
+    """
+    if isinstance(data, pd.DataFrame):
+        cols = {c: data[c].to_numpy() for c in data.columns}
+        if "time" not in cols:
+            index = data.index
+            if isinstance(index, pd.DatetimeIndex):
+                cols["time"] = index if index.tz is None else index.tz_convert(None)
+            else:
+                cols["time"] = np.arange(len(data), dtype="i8")
+    elif isinstance(data, np.ndarray) and data.dtype.names:
+        cols = {name: data[name] for name in data.dtype.names}
+    else:
+        cols = {k: np.asarray(v) for k, v in dict(data).items()}
+
+    for key in ("open", "high", "low", "close"):
+        if key not in cols:
+            raise ValueError(f"kolom '{key}' wajib ada di data backtest")
+
+    bars = {key: np.asarray(cols[key], dtype=float) for key in ("open", "high", "low", "close")}
+    n = len(bars["close"])
+    bars["time"] = _epoch_seconds(cols.get("time", np.arange(n)))
+    if "spread" in cols:
+        bars["spread"] = np.asarray(cols["spread"], dtype=float)
+    return bars
+
+
+def technical_scores(ind: Dict[str, np.ndarray], params: Optional[TechnicalParams] = None) -> Dict[str, np.ndarray]:
+    """
+    Scoring TechnicalBrain versi vectorized (aturan sama persis dengan `_score`).
+    `ind["ema_fast"]` / `ind["ema_slow"]` harus sudah pakai span dari `params`.
+    """
+    p = params or TechnicalParams()
+    trend_up = ind["ema_fast"] > ind["ema_slow"]
+    macd_up = ind["macd"] > ind["signal"]
+
+    buy = trend_up.astype(float) + (ind["rsi"] < p.rsi_buy) + macd_up + (ind["stoch"] < p.stoch_buy)
+    sell = (~trend_up).astype(float) + (ind["rsi"] > p.rsi_sell) + (~macd_up) + (ind["stoch"] > p.stoch_sell)
+
+    weak = ind["atr"] < ind["atr_mean"] * p.atr_factor
+    buy = np.where(weak, buy * p.atr_weaken, buy)
+    sell = np.where(weak, sell * p.atr_weaken, sell)
+
+    diff = buy - sell
+    return {
+        "buy_score": buy,
+        "sell_score": sell,
+        "direction": np.sign(diff).astype(np.int8),
+        "confidence": np.minimum(1.0, np.abs(diff) / 4),
+    }
+
+
+def condition_flags(high: np.ndarray, low: np.ndarray, close: np.ndarray, lookback: int = 50) -> Dict[str, np.ndarray]:
+    """
+    ConditionBrain versi vectorized: `tradable` per bar dari range 50 bar terakhir.
+    """
+    ranges = pd.Series(high - low)
+    avg_range = ranges.rolling(lookback, min_periods=1).mean().to_numpy()
+    vol_ratio = avg_range / close
+    return {
+        "vol_ratio": vol_ratio,
+        "tradable": (vol_ratio >= 0.001) & (vol_ratio <= 0.01),
+    }
+
+
+def mode_signals(
+    scores: Dict[str, np.ndarray],
+    conf_threshold: float,
+    tradable: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Aturan Orchestrator.decide: confidence >= threshold -> ikut arah teknikal.
+    """
+    active = scores["confidence"] >= conf_threshold
+    if tradable is not None:
+        active &= tradable
+    return np.where(active, scores["direction"], 0).astype(np.int8)
+
+
+class VectorBacktester:
+    """
+    Replay TechnicalBrain + ConditionBrain + Orchestrator di seluruh history
+    dalam satu pass vectorized (nggak manggil analyze() per bar).
+
+    Model eksekusi (sederhana, stop-and-reverse):
+    - sinyal dihitung di close bar t, fill di open bar t+1
+    - BUY/SELL set posisi +1/-1 x lot mode, HOLD pegang posisi sebelumnya
+      (atau flat kalau `exit_on_hold=True`)
+    - biaya per fill = setengah spread + slippage
+    """
+
+    def __init__(
+        self,
+        contract_size: float = 100.0,
+        point: float = 0.01,
+        spread_points: Optional[float] = None,
+        slippage_points: float = 5.0,
+        initial_balance: float = 10_000.0,
+        window: int = 500,
+        require_tradable: bool = False,
+        exit_on_hold: bool = False,
+        mode_params: Optional[Dict[str, Dict[str, float]]] = None,
+        technical_params: Optional[TechnicalParams] = None,
+    ) -> None:
+        self.contract_size = contract_size
+        self.point = point
+        self.spread_points = spread_points
+        self.slippage_points = slippage_points
+        self.initial_balance = initial_balance
+        self.window = window
+        self.require_tradable = require_tradable
+        self.exit_on_hold = exit_on_hold
+        self.mode_params = mode_params or MODE_PARAMS
+        self.technical_params = technical_params or TechnicalParams()
+
+    def prepare(self, data: Any) -> Dict[str, Any]:
+        """
+        Hitung semua yang nggak tergantung mode sekali saja:
+        indikator, skor teknikal, flag kondisi.
+        """
+        if isinstance(data, dict) and "scores" in data:
+            return data  # sudah di-prepare sebelumnya
+
+        bars = load_bars(data)
+        ind = compute_indicators(
+            bars["high"], bars["low"], bars["close"], window=self.window, params=self.technical_params
+        )
+        cond = condition_flags(bars["high"], bars["low"], bars["close"])
+        return {
+            "bars": bars,
+            "indicators": ind,
+            "scores": technical_scores(ind, self.technical_params),
+            "condition": cond,
+        }
+
+    def _cost_per_unit(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        if self.spread_points is not None or "spread" not in bars:
+            spread = np.full(len(bars["close"]), self.spread_points or 0.0)
+        else:
+            spread = bars["spread"]
+        return (spread / 2.0 + self.slippage_points) * self.point
+
+    def simulate(self, prepared: Dict[str, Any], signals: np.ndarray, lot: float, mode: str = "") -> BacktestResult:
+        bars = prepared["bars"]
+        opens = bars["open"]
+        n = len(opens)
+
+        # target posisi setelah close bar t
+        if self.exit_on_hold:
+            target = signals.astype(float)
+        else:
+            target = pd.Series(np.where(signals != 0, signals, np.nan)).ffill().fillna(0).to_numpy()
+
+        # posisi yang dipegang selama bar t (masuk di open t)
+        position = np.zeros(n)
+        position[1:] = target[:-1]
+
+        units = lot * self.contract_size
+        next_open = np.append(opens[1:], bars["close"][-1])
+        bar_pnl = position * (next_open - opens) * units
+
+        change = np.diff(position, prepend=0.0)
+        fill_idx = np.nonzero(change)[0]
+        cost_unit = self._cost_per_unit(bars)
+        fill_cost = np.abs(change[fill_idx]) * cost_unit[fill_idx] * units
+
+        costs = np.zeros(n)
+        costs[fill_idx] = fill_cost
+        equity = self.initial_balance + np.cumsum(bar_pnl - costs)
+
+        fills = np.empty(len(fill_idx), dtype=FILL_DTYPE)
+        fills["bar"] = fill_idx
+        fills["time"] = bars["time"][fill_idx]
+        fills["side"] = np.sign(change[fill_idx])
+        fills["qty"] = np.abs(change[fill_idx]) * lot
+        fills["price"] = opens[fill_idx] + np.sign(change[fill_idx]) * cost_unit[fill_idx]
+        fills["cost"] = fill_cost
+
+        return BacktestResult(
+            mode=mode,
+            signals=signals,
+            position=position,
+            fills=fills,
+            equity=equity,
+            stats=self._stats(bars, position, bar_pnl - costs, equity),
+        )
+
+    def _stats(self, bars, position, net_pnl, equity) -> Dict[str, float]:
+        # trade = segmen posisi non-zero yang sama arah
+        seg_start = np.diff(position, prepend=0.0) != 0
+        trade_id = np.cumsum(seg_start)
+        in_trade = position != 0
+        _, trade_idx = np.unique(trade_id[in_trade], return_inverse=True)
+        trade_pnl = np.bincount(trade_idx, weights=net_pnl[in_trade])
+
+        peak = np.maximum.accumulate(np.append(self.initial_balance, equity))
+        drawdown = (peak[1:] - equity) / peak[1:]
+
+        returns = np.diff(np.append(self.initial_balance, equity)) / self.initial_balance
+        times = bars["time"]
+        bar_seconds = float(np.median(np.diff(times))) if len(times) > 1 else 60.0
+        bars_per_year = 365 * 24 * 3600 / max(bar_seconds, 1.0)
+        std = returns.std()
+
+        final = float(equity[-1]) if len(equity) else self.initial_balance
+        return {
+            "bars": float(len(position)),
+            "net_pnl": final - self.initial_balance,
+            "return_pct": (final / self.initial_balance - 1) * 100,
+            "trades": float(len(trade_pnl)),
+            "win_rate": float((trade_pnl > 0).mean()) if len(trade_pnl) else 0.0,
+            "max_drawdown_pct": float(drawdown.max() * 100) if len(drawdown) else 0.0,
+            "sharpe": float(returns.mean() / std * np.sqrt(bars_per_year)) if std > 0 else 0.0,
+            "exposure": float(in_trade.mean()) if len(position) else 0.0,
+        }
+
+    def run(self, data: Any, modes: Optional[Iterable[str]] = None) -> Dict[str, BacktestResult]:
+        prepared = self.prepare(data)
+        tradable = prepared["condition"]["tradable"] if self.require_tradable else None
+
+        results: Dict[str, BacktestResult] = {}
+        for mode in modes or self.mode_params.keys():
+            params = self.mode_params[mode]
+            signals = mode_signals(prepared["scores"], params["conf_threshold"], tradable)
+            results[mode] = self.simulate(prepared, signals, params["lot"], mode)
+            logger.info("Backtest {}: {}", mode, results[mode].stats)
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vectorized backtest decision stack")
+    parser.add_argument("csv", nargs="?", help="CSV dengan kolom time,open,high,low,close[,spread]")
+    parser.add_argument("--symbol", help="baca dari BarStore (data/bars) kalau CSV nggak dikasih")
+    parser.add_argument("--tf", type=int, default=15, help="timeframe BarStore (menit)")
+    parser.add_argument("--start", help="awal range BarStore (mis. 2024-01-01)")
+    parser.add_argument("--end", help="akhir range BarStore")
+    parser.add_argument("--slippage", type=float, default=5.0, help="slippage (points)")
+    parser.add_argument("--spread", type=float, default=None, help="spread tetap (points)")
+    parser.add_argument("--require-tradable", action="store_true")
+    args = parser.parse_args()
+
+    if args.csv:
+        data = pd.read_csv(args.csv)
+    elif args.symbol:
+        data = BarStore(args.symbol, args.tf).read(args.start, args.end)
+    else:
+        parser.error("isi path CSV atau --symbol")
+
+    tester = VectorBacktester(
+        spread_points=args.spread,
+        slippage_points=args.slippage,
+        require_tradable=args.require_tradable,
+    )
+    for mode, res in tester.run(data).items():
+        print(mode, {k: round(v, 4) for k, v in res.stats.items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Walk-forward evaluation decision stack (train/test rolling atau anchored).
+
+    python -m core.backtest.walk_forward --symbol XAUUSD --tf 15 --folds 6
+    python -m core.backtest.walk_forward data.csv --folds 8 --anchored --optimize --workers 4
+
+- Tanpa --optimize: parameter sekarang (TechnicalParams default + MODE_PARAMS) dievaluasi
+  di tiap fold, train vs test, buat lihat seberapa stabil
+- Dengan --optimize: tiap fold pilih kombinasi terbaik di train (grid optimizer),
+  lalu dinilai di test (out-of-sample)
+- Indikator dihitung sekali di seluruh history (kausal, jadi nggak bocor ke depan)
+  lalu di-slice per fold; fold jalan paralel di pool yang attach ke shared memory
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from core.backtest import optimizer
+from core.backtest.vector_backtest import VectorBacktester, load_bars
+from core.brains.technical_params import TechnicalParams
+from core.storage.bar_store import BarStore
+
+
+STAT_KEYS = ("net_pnl", "return_pct", "trades", "win_rate", "max_drawdown_pct", "sharpe", "exposure")
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    train_start: int
+    train_end: int  # eksklusif, = test_start
+    test_end: int
+
+
+def make_folds(
+    n: int,
+    folds: int,
+    train_mult: float = 3.0,
+    warmup: int = 0,
+    anchored: bool = False,
+) -> List[Fold]:
+    """
+    Bagi bar [warmup, n) jadi `folds` window test berurutan, masing-masing didahului
+    window train `train_mult` x panjang test. anchored=True -> train selalu mulai dari warmup.
+    """
+    usable = n - warmup
+    test_len = int(usable // (folds + train_mult))
+    if folds < 1 or test_len < 2:
+        raise ValueError(f"data terlalu pendek buat {folds} fold ({usable} bar setelah warm-up)")
+    train_len = usable - folds * test_len
+
+    out = []
+    for k in range(folds):
+        test_start = warmup + train_len + k * test_len
+        train_start = warmup if anchored else test_start - train_len
+        out.append(Fold(k, train_start, test_start, test_start + test_len))
+    return out
+
+
+def _best(rows: List[Dict[str, Any]], metric: str, min_trades: int) -> Optional[Dict[str, Any]]:
+    ranked = optimizer.rank(rows, metric, min_trades)
+    return next(iter(ranked.values()))[0] if ranked else None
+
+
+def run_fold(
+    fold: Fold,
+    param_sets: List[TechnicalParams],
+    candidates: List[optimizer.Candidate],
+    metric: str,
+    min_trades: int,
+) -> List[Dict[str, Any]]:
+    """
+    Satu fold (jalan di worker): per mode, pilih kombinasi terbaik di train lalu
+    evaluasi kombinasi itu di test.
+    """
+    modes = list(dict.fromkeys(c[0] for c in candidates))
+    train_rows = [
+        row for params in param_sets for row in optimizer.evaluate(params, candidates, fold.train_start, fold.train_end)
+    ]
+
+    out = []
+    for mode in modes:
+        chosen = _best([r for r in train_rows if r["mode"] == mode], metric, min_trades)
+        if chosen is None:
+            # nggak ada kombinasi yang cukup trade di train -> pakai yang pertama (parameter sekarang)
+            chosen = next(r for r in train_rows if r["mode"] == mode)
+        params = TechnicalParams.from_dict(chosen)
+        candidate = (mode, chosen["conf_threshold"], chosen["lot"])
+        test = optimizer.evaluate(params, [candidate], fold.train_end, fold.test_end)[0]
+        out.append(
+            {
+                "fold": fold.index,
+                "mode": mode,
+                "params": {"conf_threshold": chosen["conf_threshold"], **params.to_dict()},
+                "train": {k: chosen[k] for k in STAT_KEYS},
+                "test": {k: test[k] for k in STAT_KEYS},
+            }
+        )
+    return out
+
+
+def aggregate(rows: List[Dict[str, Any]], metric: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Ringkasan per mode dari hasil test semua fold.
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    for mode in dict.fromkeys(r["mode"] for r in rows):
+        fold_rows = [r for r in rows if r["mode"] == mode]
+        tests = [r["test"] for r in fold_rows]
+        trains = [r["train"] for r in fold_rows]
+        summary[mode] = {
+            "folds": len(fold_rows),
+            "test_net_pnl_total": sum(t["net_pnl"] for t in tests),
+            "test_profitable_folds": sum(t["net_pnl"] > 0 for t in tests) / len(tests),
+            f"test_{metric}_mean": statistics.fmean(t[metric] for t in tests),
+            f"test_{metric}_median": statistics.median(t[metric] for t in tests),
+            f"train_{metric}_mean": statistics.fmean(t[metric] for t in trains),
+            # train - test: makin besar makin overfit
+            f"{metric}_degradation": statistics.fmean(r["train"][metric] - r["test"][metric] for r in fold_rows),
+            "test_win_rate_mean": statistics.fmean(t["win_rate"] for t in tests),
+            "test_trades_total": sum(t["trades"] for t in tests),
+            "test_max_drawdown_pct": max(t["max_drawdown_pct"] for t in tests),
+        }
+    return summary
+
+
+def walk_forward(
+    data: Any,
+    folds: int = 5,
+    train_mult: float = 3.0,
+    anchored: bool = False,
+    param_sets: Optional[List[TechnicalParams]] = None,
+    offsets: Sequence[float] = (0.0,),
+    modes: Optional[Sequence[str]] = None,
+    metric: str = "sharpe",
+    min_trades: int = 0,
+    workers: int = 0,
+    tester_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    {"folds": [...], "results": [baris per fold x mode], "summary": {mode: agregat}}.
+    workers=0 -> fold jalan berurutan di proses ini.
+    """
+    tester_kwargs = dict(tester_kwargs or {})
+    tester = VectorBacktester(**tester_kwargs)
+    param_sets = param_sets or [TechnicalParams()]
+    candidates = optimizer.mode_candidates(tester.mode_params, modes or tester.mode_params.keys(), offsets)
+    bars = load_bars(data)
+    # warm-up = panjang window TechnicalBrain, supaya rata-rata ATR dsb sudah stabil
+    fold_list = make_folds(len(bars["close"]), folds, train_mult, min(tester.window, len(bars["close"]) // 4), anchored)
+
+    t0 = time.perf_counter()
+    arrays, _ = optimizer.prepare_inputs(bars, param_sets, tester)
+    logger.info(
+        "WalkForward: {} bar, {} fold, {} set parameter x {} kandidat (prepare {:.2f}s)",
+        len(bars["close"]),
+        len(fold_list),
+        len(param_sets),
+        len(candidates),
+        time.perf_counter() - t0,
+    )
+
+    rows: List[Dict[str, Any]] = []
+    with optimizer.worker_pool(arrays, tester_kwargs, workers) as pool:
+        if pool is None:
+            for fold in fold_list:
+                rows.extend(run_fold(fold, param_sets, candidates, metric, min_trades))
+        else:
+            futures = [pool.submit(run_fold, fold, param_sets, candidates, metric, min_trades) for fold in fold_list]
+            for fut in futures:
+                rows.extend(fut.result())
+    logger.info("WalkForward: selesai dalam {:.2f}s", time.perf_counter() - t0)
+
+    times = bars["time"]
+    return {
+        "folds": [
+            {
+                **asdict(f),
+                "train_from": _ts(times[f.train_start]),
+                "test_from": _ts(times[f.train_end]),
+                "test_to": _ts(times[f.test_end - 1]),
+            }
+            for f in fold_list
+        ],
+        "results": rows,
+        "summary": aggregate(rows, metric),
+    }
+
+
+def _ts(epoch: Any) -> str:
+    return datetime.fromtimestamp(int(epoch), tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+# ==========================================================
+# CLI
+# ==========================================================
+def _print_report(report: Dict[str, Any], metric: str) -> None:
+    folds = {f["index"]: f for f in report["folds"]}
+    for mode, summary in report["summary"].items():
+        print(f"\n=== {mode} ===")
+        table = []
+        for row in (r for r in report["results"] if r["mode"] == mode):
+            f = folds[row["fold"]]
+            table.append(
+                {
+                    "fold": row["fold"],
+                    "test_from": f["test_from"],
+                    "test_to": f["test_to"],
+                    "conf": row["params"]["conf_threshold"],
+                    f"train_{metric}": row["train"][metric],
+                    f"test_{metric}": row["test"][metric],
+                    "test_pnl": row["test"]["net_pnl"],
+                    "test_trades": row["test"]["trades"],
+                    "test_dd_pct": row["test"]["max_drawdown_pct"],
+                }
+            )
+        print(pd.DataFrame(table).round(4).to_string(index=False))
+        print("  " + ", ".join(f"{k}={round(v, 4)}" for k, v in summary.items()))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation decision stack")
+    parser.add_argument("csv", nargs="?", help="CSV dengan kolom time,open,high,low,close[,spread]")
+    parser.add_argument("--symbol", help="baca dari BarStore (data/bars) kalau CSV nggak dikasih")
+    parser.add_argument("--tf", type=int, default=15, help="timeframe BarStore (menit)")
+    parser.add_argument("--start", help="awal range BarStore (mis. 2024-01-01)")
+    parser.add_argument("--end", help="akhir range BarStore")
+    parser.add_argument("--slippage", type=float, default=5.0, help="slippage (points)")
+    parser.add_argument("--spread", type=float, default=None, help="spread tetap (points)")
+    parser.add_argument("--require-tradable", action="store_true")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--train-mult", type=float, default=3.0, help="panjang train = N x panjang test")
+    parser.add_argument("--anchored", action="store_true", help="train selalu mulai dari awal data")
+    parser.add_argument("--optimize", action="store_true", help="pilih parameter terbaik di train (grid optimizer)")
+    parser.add_argument("--space", help="JSON {param: [nilai, ...]} buat --optimize")
+    parser.add_argument("--modes", help="mis. SAFE,BALANCED (default semua)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 = tanpa pool")
+    parser.add_argument("--metric", default="sharpe")
+    parser.add_argument("--min-trades", type=int, default=5)
+    parser.add_argument("--out", help="simpan laporan ke JSON")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        data = pd.read_csv(args.csv)
+    elif args.symbol:
+        data = BarStore(args.symbol, args.tf).read(args.start, args.end)
+    else:
+        parser.error("isi path CSV atau --symbol")
+
+    param_sets = None
+    offsets: Sequence[float] = (0.0,)
+    if args.optimize:
+        param_sets = optimizer.grid(json.loads(args.space) if args.space else optimizer.DEFAULT_SPACE)
+        offsets = optimizer.CONF_OFFSETS
+
+    report = walk_forward(
+        data,
+        folds=args.folds,
+        train_mult=args.train_mult,
+        anchored=args.anchored,
+        param_sets=param_sets,
+        offsets=offsets,
+        modes=[m.strip().upper() for m in args.modes.split(",")] if args.modes else None,
+        metric=args.metric,
+        min_trades=args.min_trades,
+        workers=args.workers,
+        tester_kwargs={
+            "spread_points": args.spread,
+            "slippage_points": args.slippage,
+            "require_tradable": args.require_tradable,
+        },
+    )
+    _print_report(report, args.metric)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, default=lambda v: v.item() if isinstance(v, np.generic) else str(v))
+        print(f"\nHasil disimpan: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
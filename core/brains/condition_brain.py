@@ -1,9 +1,9 @@
-from typing import Dict, Any
+from typing import Any, Dict
 
-import numpy as np
-import pandas as pd
 from loguru import logger
 
+from core.feeder.bar_buffer import ohlc_arrays
+
 
 class ConditionBrain:
     """
@@ -12,18 +12,22 @@ class ConditionBrain:
     - choppy atau tidak (sangat sederhana dulu)
     """
 
-    def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
-        if df is None or df.empty:
-            logger.warning("ConditionBrain: DataFrame kosong.")
+    def analyze(self, bars: Any) -> Dict[str, Any]:
+        """
+        bars = structured array MT5 atau DataFrame; cuma 50 bar terakhir yang dipakai.
+        """
+        if bars is None or len(bars) == 0:
+            logger.warning("ConditionBrain: data bar kosong.")
             return {"tradable": False, "reason": "no_data", "info": {}}
 
-        recent = df.tail(50)
+        recent = ohlc_arrays(bars, tail=50)
         ranges = recent["high"] - recent["low"]
         avg_range = ranges.mean()
-        std_range = ranges.std()
+        # ddof=1 sama dengan Series.std() versi lama
+        std_range = ranges.std(ddof=1) if len(ranges) > 1 else float("nan")
 
         # bandingkan range dengan harga
-        last_close = recent["close"].iloc[-1]
+        last_close = recent["close"][-1]
         vol_ratio = avg_range / last_close
 
         tradable = True
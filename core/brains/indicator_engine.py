@@ -0,0 +1,269 @@
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from core.brains.technical_params import TechnicalParams
+
+
+def _div(a: float, b: float) -> float:
+    """
+    Pembagian ala numpy/pandas (IEEE): x/0 -> inf, 0/0 -> nan.
+    Python float biasa malah lempar ZeroDivisionError.
+    """
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class _Ema:
+    """
+    EMA identik dengan pandas `ewm(span=N).mean()` (adjust=True).
+    State cukup numerator + denominator, update O(1).
+    """
+
+    def __init__(self, span: int) -> None:
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.num = 0.0
+        self.den = 0.0
+
+    def peek(self, x: float) -> float:
+        return (self.num * self.decay + x) / (self.den * self.decay + 1.0)
+
+    def push(self, x: float) -> float:
+        self.num = self.num * self.decay + x
+        self.den = self.den * self.decay + 1.0
+        return self.num / self.den
+
+
+class _Window:
+    """
+    Rolling window fixed-size (mirip pandas `rolling(N)` dengan min_periods=N).
+    Kalau window belum penuh atau ada NaN di dalamnya -> hasil NaN.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values: deque = deque(maxlen=size)
+
+    def _with(self, x: float) -> Optional[list]:
+        if len(self.values) < self.size - 1:
+            return None
+        vals = list(self.values)[len(self.values) - (self.size - 1):]
+        vals.append(x)
+        if any(math.isnan(v) for v in vals):
+            return None
+        return vals
+
+    def peek_mean(self, x: float) -> float:
+        vals = self._with(x)
+        return math.nan if vals is None else sum(vals) / self.size
+
+    def peek_min(self, x: float) -> float:
+        vals = self._with(x)
+        return math.nan if vals is None else min(vals)
+
+    def peek_max(self, x: float) -> float:
+        vals = self._with(x)
+        return math.nan if vals is None else max(vals)
+
+    def push(self, x: float) -> None:
+        self.values.append(x)
+
+
+class _RunningMean:
+    """
+    Mean dari N nilai valid terakhir (buat `df['atr'].mean()`).
+    Running sum di-recompute tiap N push biar nggak drift.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.values: deque = deque(maxlen=max(1, size))
+        self.total = 0.0
+        self._pushes = 0
+
+    def _evicted(self) -> float:
+        if len(self.values) == self.values.maxlen:
+            return self.values[0]
+        return 0.0
+
+    def peek(self, x: float) -> float:
+        if math.isnan(x):
+            return self.total / len(self.values) if self.values else math.nan
+        count = min(len(self.values) + 1, self.values.maxlen)
+        return (self.total - self._evicted() + x) / count
+
+    def push(self, x: float) -> None:
+        if math.isnan(x):
+            return
+        self.total += x - self._evicted()
+        self.values.append(x)
+        self._pushes += 1
+        if self._pushes >= self.values.maxlen:
+            self.total = math.fsum(self.values)
+            self._pushes = 0
+
+
+class IndicatorEngine:
+    """
+    Engine indikator streaming buat TechnicalBrain.
+    - State EMA / rolling window disimpan, tiap bar closed baru cuma O(1)
+    - `preview()` hitung indikator untuk bar yang masih jalan tanpa ngubah state
+    - `window` = panjang frame yang dianalisa (biasanya 500 bar dari feeder),
+      dipakai supaya rata-rata ATR sama persis dengan versi pandas
+    """
+
+    PERIOD = 14
+
+    def __init__(self, window: int = 500, params: Optional[TechnicalParams] = None) -> None:
+        self.params = params or TechnicalParams()
+        self.reset(window)
+
+    def reset(self, window: Optional[int] = None) -> None:
+        if window is not None:
+            self.window = window
+
+        self.ema_fast = _Ema(self.params.ema_fast)
+        self.ema_slow = _Ema(self.params.ema_slow)
+        self.ema12 = _Ema(12)
+        self.ema26 = _Ema(26)
+        self.signal = _Ema(9)
+
+        self.gain = _Window(self.PERIOD)
+        self.loss = _Window(self.PERIOD)
+        self.low14 = _Window(self.PERIOD)
+        self.high14 = _Window(self.PERIOD)
+        self.tr = _Window(self.PERIOD)
+        # ATR valid pertama muncul di bar ke-14 frame, sisanya masuk rata-rata
+        self.atr_mean = _RunningMean(self.window - self.PERIOD)
+
+        self.prev_close: float = math.nan
+        self.last_time: Any = None
+        self.count = 0
+
+    # ------------------------------------------------------------------
+    def _compute(self, high: float, low: float, close: float) -> Dict[str, Any]:
+        delta = close - self.prev_close
+        gain_x = delta if delta > 0 else 0.0
+        loss_x = -delta if delta < 0 else 0.0
+
+        ema12 = self.ema12.peek(close)
+        ema26 = self.ema26.peek(close)
+        macd = ema12 - ema26
+
+        low14 = self.low14.peek_min(low)
+        high14 = self.high14.peek_max(high)
+
+        if math.isnan(self.prev_close):
+            tr = math.nan
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        atr = self.tr.peek_mean(tr)
+
+        rs = _div(self.gain.peek_mean(gain_x), self.loss.peek_mean(loss_x))
+
+        return {
+            "ema_fast": self.ema_fast.peek(close),
+            "ema_slow": self.ema_slow.peek(close),
+            "rsi": 100 - (100 / (1 + rs)),
+            "macd": macd,
+            "signal": self.signal.peek(macd),
+            "stoch": 100 * _div(close - low14, high14 - low14),
+            "atr": atr,
+            "atr_mean": self.atr_mean.peek(atr),
+            # dipakai update() biar nggak ngitung dua kali
+            "_gain": gain_x,
+            "_loss": loss_x,
+            "_tr": tr,
+        }
+
+    def preview(self, high: float, low: float, close: float) -> Dict[str, Any]:
+        """
+        Nilai indikator kalau bar ini ditambahkan, tanpa commit state.
+        Cocok buat bar terakhir dari MT5 yang belum close.
+        """
+        values = self._compute(float(high), float(low), float(close))
+        return {k: v for k, v in values.items() if not k.startswith("_")}
+
+    def update(self, high: float, low: float, close: float, time: Any = None) -> Dict[str, Any]:
+        """
+        Commit satu bar closed ke state. O(1).
+        """
+        high, low, close = float(high), float(low), float(close)
+        values = self._compute(high, low, close)
+
+        self.ema_fast.push(close)
+        self.ema_slow.push(close)
+        self.ema12.push(close)
+        self.ema26.push(close)
+        self.signal.push(values["macd"])
+        self.gain.push(values["_gain"])
+        self.loss.push(values["_loss"])
+        self.low14.push(low)
+        self.high14.push(high)
+        self.tr.push(values["_tr"])
+        self.atr_mean.push(values["atr"])
+
+        self.prev_close = close
+        self.last_time = time
+        self.count += 1
+        return {k: v for k, v in values.items() if not k.startswith("_")}
+
+    def warm_up(
+        self,
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        times: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """
+        Isi state dari history (bulk). Dipanggil sekali di awal / kalau ada gap.
+        """
+        self.reset()
+        for i in range(len(close)):
+            self.update(high[i], low[i], close[i], times[i] if times is not None else i)
+        logger.debug("IndicatorEngine warm-up: {} bar (window={})", self.count, self.window)
+
+
+def compute_indicators(
+    high, low, close, window: int = 500, params: Optional[TechnicalParams] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Versi bulk (vectorized) untuk seluruh history sekaligus, buat backtest.
+    Tiap index t = nilai indikator yang dilihat TechnicalBrain kalau frame-nya
+    berakhir di bar t dengan panjang `window` (termasuk rata-rata ATR).
+    """
+    params = params or TechnicalParams()
+    high = pd.Series(np.asarray(high, dtype=float))
+    low = pd.Series(np.asarray(low, dtype=float))
+    close = pd.Series(np.asarray(close, dtype=float))
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rs = gain / loss
+
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+
+    low14 = low.rolling(14).min()
+    high14 = high.rolling(14).max()
+
+    prev_close = close.shift()
+    tr = np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close)))
+    atr = tr.rolling(14).mean()
+
+    return {
+        "ema_fast": close.ewm(span=params.ema_fast).mean().to_numpy(),
+        "ema_slow": close.ewm(span=params.ema_slow).mean().to_numpy(),
+        "rsi": (100 - (100 / (1 + rs))).to_numpy(),
+        "macd": macd.to_numpy(),
+        "signal": macd.ewm(span=9).mean().to_numpy(),
+        "stoch": (100 * ((close - low14) / (high14 - low14))).to_numpy(),
+        "atr": atr.to_numpy(),
+        "atr_mean": atr.rolling(max(1, window - 14), min_periods=1).mean().to_numpy(),
+    }
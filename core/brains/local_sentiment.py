@@ -0,0 +1,295 @@
+"""
+Scorer sentiment lokal (offline, tanpa network), dipakai SentimentBrain buat:
+- fallback kalau LLM nggak selesai dalam budget latency (atau nggak ada network)
+- pre-screen: headline yang jelas arahnya nggak perlu dikirim ke LLM
+
+Skor = lexicon finansial (arah gerak x aset yang disebut, relatif ke symbol)
++ model linear hashed-feature yang belajar dari skor LLM (atau file label).
+
+    python -m core.brains.local_sentiment train labels.csv   # kolom headline,symbol,score
+    python -m core.brains.local_sentiment score XAUUSD "Gold slips as dollar firms"
+"""
+import argparse
+import csv
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from core.brains.sentiment_cache import normalize_headline
+from core.config import settings
+from core.feeder.news_index import ASSET_ALIASES, DIRECTION, _tokens
+
+
+# kebijakan moneter -> efek ke mata uang bank sentralnya (+ hawkish / - dovish)
+POLICY: Dict[str, float] = {
+    **dict.fromkeys(["hawkish", "rate hike", "rate hikes", "tightening", "hot inflation"], 1.0),
+    **dict.fromkeys(["dovish", "rate cut", "rate cuts", "easing", "cooling inflation"], -1.0),
+}
+NEGATORS = {"not", "no", "fails", "without", "despite"}
+NEGATE_WINDOW = 3  # negator membalik arah sampai 3 kata sesudahnya ("not expected to rise")
+# batas klausa: tanda baca dan kata sambung, kata arah nggak nyebrang ke aset di klausa lain
+CLAUSE_BREAK = re.compile(r"[,;:!?|]|\s[-\u2013\u2014]\s")
+CONJUNCTIONS = {"as", "while", "but", "after", "amid", "though", "although", "whereas", "when"}
+
+HASH_DIM = 1 << 18
+LABEL_THRESHOLD = 0.2  # sama dengan ambang bullish/bearish di SentimentBrain
+
+
+def _codes(symbol: str) -> List[Tuple[str, float]]:
+    """
+    Kode aset symbol + arah pengaruhnya: base naik = symbol naik, quote naik = symbol turun.
+    """
+    sym = "".join(ch for ch in symbol.upper() if ch.isalpha())
+    if len(sym) >= 6:
+        return [(sym[:3], 1.0), (sym[3:6], -1.0)]
+    return [(sym, 1.0)]
+
+
+def _clauses(headline: str) -> List[List[str]]:
+    """
+    Pecah headline jadi klausa (tanda baca / kata sambung), tiap klausa sudah dinormalisasi.
+    "Fed signals rate cut, gold rallies" -> [["fed", "signals", "rate", "cut"], ["gold", "rallies"]]
+    """
+    out: List[List[str]] = []
+    for part in CLAUSE_BREAK.split(headline):
+        words: List[str] = []
+        for word in normalize_headline(part).split():
+            if word in CONJUNCTIONS:
+                if words:
+                    out.append(words)
+                words = []
+            else:
+                words.append(word)
+        if words:
+            out.append(words)
+    return out
+
+
+class LexiconScorer:
+    """
+    Skor arah headline relatif ke symbol. Tiap kata arah dikaitkan ke aset terdekat
+    di klausa yang sama ("Gold slips as dollar firms" -> gold turun, dollar naik ->
+    dua-duanya bearish buat XAUUSD). Aset terdekatnya bukan bagian symbol (mis. euro
+    buat XAUUSD) -> kata arah itu diabaikan.
+    """
+
+    def __init__(self) -> None:
+        self._subjects: Dict[str, Dict[str, float]] = {}
+
+    def _subject_map(self, symbol: str) -> Dict[str, float]:
+        # alias -> sign (+1 base, -1 quote, 0 aset lain); kata aset kuat dan makro (fed, ecb, ...).
+        # Istilah kebijakan ("rate cut") bukan subjek, dihitung lewat POLICY.
+        symbol = symbol.upper()
+        out = self._subjects.get(symbol)
+        if out is None:
+            codes = dict(_codes(symbol))
+            out = {}
+            for code, (strong, macro) in ASSET_ALIASES.items():
+                for alias in (*strong, *macro):
+                    if alias not in POLICY:
+                        out[alias] = out.get(alias) or codes.get(code, 0.0)
+            self._subjects[symbol] = out
+        return out
+
+    def _policy_sign(self, symbol: str, text: str) -> Optional[float]:
+        # bank sentral yang disebut (fed, ecb, boj, ...); nggak ada -> diasumsikan Fed (USD)
+        codes = _codes(symbol)
+        for code, sign in codes:
+            if any(f" {alias} " in text for alias in ASSET_ALIASES.get(code, ((), ()))[1]):
+                return sign
+        return dict(codes).get("USD")
+
+    @staticmethod
+    def _nearest(i: int, positions: List[int]) -> Optional[int]:
+        # kata sifat sebelum aset ("strong dollar") -> ikut aset sesudahnya;
+        # selain itu aset terdekat, kalau sama jauh yang sebelumnya
+        if i + 1 in positions:
+            return i + 1
+        return min(positions, key=lambda p: (abs(p - i), p > i), default=None)
+
+    def score(self, headline: str, symbol: str) -> Tuple[float, bool]:
+        """
+        Return (skor mentah, oriented). oriented=False -> nggak ada kata arah yang jatuh
+        ke aset symbol (atau kebijakan moneternya), skor 0 dan sebaiknya diserahkan ke LLM.
+        """
+        subjects = self._subject_map(symbol)
+        policy_sign = self._policy_sign(symbol, f" {normalize_headline(headline)} ")
+
+        raw = 0.0
+        oriented = False
+        for words in _clauses(headline):
+            pairs = [f"{a} {b}" for a, b in zip(words, words[1:])] + [""]
+            mentions = {
+                i: subjects[pair] if pair in subjects else subjects[word]
+                for i, (word, pair) in enumerate(zip(words, pairs))
+                if pair in subjects or word in subjects
+            }
+            positions = sorted(mentions)
+            negated_at: Optional[int] = None
+            for i, (word, pair) in enumerate(zip(words, pairs)):
+                if word in NEGATORS:
+                    negated_at = i
+                    continue
+                flip = -1.0 if negated_at is not None and i - negated_at <= NEGATE_WINDOW else 1.0
+                direction = DIRECTION.get(pair) or DIRECTION.get(word)
+                subject = self._nearest(i, positions) if direction else None
+                if subject is not None and mentions[subject]:
+                    raw += direction * flip * mentions[subject]
+                    oriented = True
+                policy = POLICY.get(pair) or POLICY.get(word)
+                if policy and policy_sign:
+                    raw += policy * flip * policy_sign
+                    oriented = True
+        return raw, oriented
+
+
+class HashedLinearModel:
+    """
+    Regresi linear (output tanh) di atas fitur token yang di-hash (unigram, bigram,
+    dan token x symbol). Dilatih online (SGD) dari pasangan (headline, symbol, skor).
+    """
+
+    def __init__(self, dim: int = HASH_DIM, lr: float = 0.05, l2: float = 1e-6) -> None:
+        self.dim = dim
+        self.lr = lr
+        self.l2 = l2
+        self.w = np.zeros(dim, dtype=np.float32)
+        self.b = 0.0
+        self.updates = 0
+
+    def features(self, headline: str, symbol: str) -> np.ndarray:
+        toks = set(_tokens(headline))
+        sym = symbol.upper()
+        keys = [*toks, *(f"{sym}|{t}" for t in toks)]
+        return np.unique(np.fromiter((zlib.crc32(k.encode("utf-8")) % self.dim for k in keys), dtype=np.int64))
+
+    def predict(self, headline: str, symbol: str) -> float:
+        idx = self.features(headline, symbol)
+        return float(np.tanh(self.w[idx].sum() + self.b))
+
+    def learn(self, headline: str, symbol: str, target: float) -> None:
+        idx = self.features(headline, symbol)
+        pred = np.tanh(self.w[idx].sum() + self.b)
+        # turunan squared loss lewat tanh
+        grad = (pred - target) * (1.0 - pred * pred)
+        self.w[idx] -= self.lr * (grad + self.l2 * self.w[idx])
+        self.b -= self.lr * grad
+        self.updates += 1
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(tmp, w=self.w, b=np.float64(self.b), updates=np.int64(self.updates))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["HashedLinearModel"]:
+        try:
+            with np.load(path) as data:
+                model = cls(dim=len(data["w"]))
+                model.w = data["w"].astype(np.float32)
+                model.b = float(data["b"])
+                model.updates = int(data["updates"])
+            return model
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+class LocalSentimentScorer:
+    """
+    Gabungan lexicon + model hashed. Model baru ikut menentukan skor setelah
+    belajar >= `min_updates` contoh; sebelum itu lexicon saja.
+    Output sama bentuknya dengan hasil GeminiClient.analyze_batch (+ confidence, source).
+    """
+
+    def __init__(self, model_path: Optional[str] = None, min_updates: int = 200) -> None:
+        self.lexicon = LexiconScorer()
+        self.path = Path(model_path or settings.SENTIMENT_LOCAL_MODEL_FILE)
+        self.model = HashedLinearModel.load(self.path) or HashedLinearModel()
+        self.min_updates = min_updates
+        self._dirty = False
+        if self.model.updates:
+            logger.debug("LocalSentimentScorer: model {} ({} contoh)", self.path, self.model.updates)
+
+    @property
+    def trained(self) -> bool:
+        return self.model.updates >= self.min_updates
+
+    def score(self, headline: str, symbol: str) -> Dict[str, Any]:
+        raw, oriented = self.lexicon.score(headline, symbol)
+        score = float(np.tanh(raw / 2.0))
+        confidence = min(1.0, abs(raw) / 2.0) if oriented else 0.0
+        if self.trained:
+            learned = self.model.predict(headline, symbol)
+            score = 0.5 * score + 0.5 * learned
+            # dua-duanya searah -> lebih yakin, berlawanan -> ambigu
+            agree = np.sign(learned) == np.sign(raw) and raw != 0
+            confidence = min(1.0, abs(score) * 1.5) if agree else min(confidence, abs(score))
+        if score > LABEL_THRESHOLD:
+            label = "bullish"
+        elif score < -LABEL_THRESHOLD:
+            label = "bearish"
+        else:
+            label = "neutral"
+        return {"label": label, "score": round(score, 3), "confidence": round(confidence, 3), "source": "local"}
+
+    def learn(self, headline: str, symbol: str, score: float) -> None:
+        self.model.learn(headline, symbol, max(-1.0, min(1.0, float(score))))
+        self._dirty = True
+
+    def fit(self, samples: Iterable[Tuple[str, str, float]], epochs: int = 5, seed: int = 0) -> int:
+        data = list(samples)
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            for i in rng.permutation(len(data)):
+                self.learn(*data[i])
+        return len(data)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.model.save(self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("LocalSentimentScorer: gagal simpan {}: {}", self.path, e)
+
+
+# ==========================================================
+# CLI
+# ==========================================================
+def _read_labels(path: str) -> List[Tuple[str, str, float]]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        return [(row["headline"], row.get("symbol") or settings.SYMBOL, float(row["score"])) for row in csv.DictReader(fh)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scorer sentiment lokal")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    train = sub.add_parser("train", help="latih model dari CSV headline,symbol,score")
+    train.add_argument("csv")
+    train.add_argument("--epochs", type=int, default=5)
+    train.add_argument("--model", help="path model (default SENTIMENT_LOCAL_MODEL_FILE)")
+    score = sub.add_parser("score", help="skor satu / beberapa headline")
+    score.add_argument("symbol")
+    score.add_argument("headlines", nargs="+")
+    score.add_argument("--model")
+    args = parser.parse_args(argv)
+
+    scorer = LocalSentimentScorer(args.model)
+    if args.cmd == "train":
+        n = scorer.fit(_read_labels(args.csv), epochs=args.epochs)
+        scorer.save()
+        print(f"{n} contoh x {args.epochs} epoch -> {scorer.path} ({scorer.model.updates} update)")
+        return
+    for headline in args.headlines:
+        print(scorer.score(headline, args.symbol), headline)
+
+
+if __name__ == "__main__":
+    main()
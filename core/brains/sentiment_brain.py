@@ -1,6 +1,11 @@
 import os
+import time
+from typing import Any, Dict, List, Optional
+
 from loguru import logger
 from ai_api.gemini_client import GeminiClient
+from core.brains.local_sentiment import LocalSentimentScorer
+from core.brains.sentiment_cache import SentimentCache
 from core.feeder.news_feeder import NewsFeeder
 from core.config import settings
 
@@ -8,65 +13,131 @@ from core.config import settings
 class SentimentBrain:
     """
     Ambil news → analisa sentiment → return dict
+    - Skor disimpan per headline (SentimentCache), LLM cuma dipanggil buat headline baru
+    - Semua symbol di-skor dalam satu batch request (GeminiClient.analyze_batch)
+    - LLM dibatasi budget latency; headline yang nggak ke-skor (timeout / offline)
+      pakai scorer lokal. Opsional pre-screen: yang jelas arahnya nggak ke LLM sama sekali
     """
 
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY", None)
         self.gemini = GeminiClient()
         self.news = NewsFeeder()
+        self.cache = SentimentCache(
+            settings.SENTIMENT_CACHE_FILE,
+            ttl_seconds=settings.SENTIMENT_CACHE_TTL_SECONDS,
+            max_entries=settings.SENTIMENT_CACHE_MAX_ENTRIES,
+        )
+        self.local = LocalSentimentScorer()
         logger.info("SentimentBrain v2 initialized")
 
-    def analyze(self):
-        """
-        Fetch & analyze news
-        """
-        symbol = settings.SYMBOL  # === FIX DI SINI ===
-
-        # --- Ambil berita ---
-        headlines = self.news.get_recent_headlines(symbol=symbol, limit=6)
-
-        if not headlines:
+    def _aggregate(
+        self, headlines: List[str], scored: Dict[str, Dict], misses: List[str], local: int = 0
+    ) -> Dict[str, Any]:
+        if not scored:
             return {
                 "sentiment": "neutral",
                 "confidence": 0.1,
-                "reason": "no_news"
+                "reason": "no_scores",
+                "headlines": len(headlines)
             }
 
-        text = "\n".join(headlines)
+        avg = sum(e["score"] for e in scored.values()) / len(scored)
 
-        logger.debug("SentimentBrain: analyzing sentiment via Gemini...")
+        if avg > 0.2:
+            sentiment = "bullish"
+        elif avg < -0.2:
+            sentiment = "bearish"
+        else:
+            sentiment = "neutral"
 
-        # --- Analisa menggunakan AI ---
-        try:
-            result = self.gemini.analyze_text(
-                f"Analyze financial sentiment from these headlines:\n{text}"
-            )
-
-            res = result.lower()
-
-            if any(w in res for w in ["bull", "up", "buy", "rally"]):
-                return {
-                    "sentiment": "bullish",
-                    "confidence": 0.7,
-                    "reason": "ai_bullish",
-                    "headlines": len(headlines)
-                }
+        return {
+            "sentiment": sentiment,
+            "confidence": round(min(1.0, 0.4 + abs(avg) * 0.6), 2) if sentiment != "neutral" else 0.4,
+            "reason": f"{'local' if local == len(scored) else 'ai'}_{sentiment}",
+            "score": round(avg, 3),
+            "headlines": len(headlines),
+            "cached": len(headlines) - len(misses),
+            "local": local,
+        }
 
-            elif any(w in res for w in ["bear", "down", "sell", "drop"]):
-                return {
-                    "sentiment": "bearish",
-                    "confidence": 0.7,
-                    "reason": "ai_bearish",
-                    "headlines": len(headlines)
-                }
+    def analyze_many(self, symbols: List[str], deadline: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Sentiment buat banyak symbol sekaligus: headline yang belum ada di cache
+        dari semua symbol digabung jadi satu batch LLM per cycle.
+        `deadline` (detik) = batas total refresh: fetch berita dan budget LLM dipotong
+        ke sisa waktunya, yang nggak kebagian pakai cache feed / scorer lokal.
+        """
+        end = time.monotonic() + deadline if deadline is not None else None
+        per_symbol: Dict[str, Dict[str, Any]] = {}
+        items: List[Dict[str, Any]] = []
+        prescreen = settings.SENTIMENT_LOCAL_PRESCREEN
+
+        # --- Ambil berita: semua feed sekali per refresh, lalu dipilih per symbol ---
+        news_items = self.news.fetch(deadline)
+        for symbol in symbols:
+            headlines = self.news.select(news_items, symbol, limit=6)
+            scored, misses = self.cache.split(headlines, symbol)
+            per_symbol[symbol] = {"headlines": headlines, "scored": scored, "misses": misses, "local": 0}
+            for h in misses:
+                local = self.local.score(h, symbol)
+                if prescreen > 0 and local["confidence"] >= prescreen:
+                    # arahnya jelas -> nggak perlu LLM. Nggak di-cache / dipelajari (bukan label LLM)
+                    scored[h] = local
+                    per_symbol[symbol]["local"] += 1
+                    continue
+                items.append({"id": len(items), "symbol": symbol, "headline": h, "local": local})
+
+        # --- Analisa menggunakan AI (cuma headline baru & ambigu) ---
+        if items:
+            logger.debug("SentimentBrain: scoring {} headline baru ({} symbol) via Gemini...", len(items), len(symbols))
+            try:
+                budget = settings.SENTIMENT_LLM_BUDGET_SECONDS
+                if end is not None:
+                    budget = max(0.0, min(budget, end - time.monotonic()))
+                fresh = self.gemini.analyze_batch(items, budget=budget)
+            except Exception as e:
+                logger.error(f"SentimentBrain Error: {e}")
+                fresh = {}
 
-            else:
-                return {
+            fallback = 0
+            for it in items:
+                st = per_symbol[it["symbol"]]
+                entry = fresh.get(it["id"])
+                if entry is None:
+                    # LLM gagal / lewat budget -> skor lokal (nggak di-cache, dicoba LLM lagi cycle berikutnya)
+                    st["scored"][it["headline"]] = it["local"]
+                    st["local"] += 1
+                    fallback += 1
+                    continue
+                self.cache.put(it["headline"], entry["label"], entry["score"], it["symbol"])
+                self.local.learn(it["headline"], it["symbol"], entry["score"])
+                st["scored"][it["headline"]] = entry
+            if fallback:
+                logger.warning("SentimentBrain: {} dari {} headline pakai scorer lokal", fallback, len(items))
+            self.cache.save()
+            self.local.save()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for symbol, st in per_symbol.items():
+            if not st["headlines"]:
+                results[symbol] = {
                     "sentiment": "neutral",
-                    "confidence": 0.4,
-                    "reason": "ai_neutral",
-                    "headlines": len(headlines)
+                    "confidence": 0.1,
+                    "reason": "no_news"
                 }
+                continue
+            results[symbol] = self._aggregate(st["headlines"], st["scored"], st["misses"], st["local"])
+        return results
+
+    def analyze(self, symbol: Optional[str] = None):
+        """
+        Fetch & analyze news
+        """
+        symbol = symbol or settings.SYMBOL  # === FIX DI SINI ===
+
+        try:
+            return self.analyze_many([symbol])[symbol]
 
         except Exception as e:
             logger.error(f"SentimentBrain Error: {e}")
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+def normalize_headline(text: str) -> str:
+    """
+    Lowercase, buang tanda baca & spasi dobel. Headline yang sama dari feed
+    beda (beda kapital / tanda kutip) jadi satu key.
+    """
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
+
+
+def headline_key(text: str, symbol: str = "") -> str:
+    # skor headline bisa beda per symbol (gold vs saham), jadi symbol ikut jadi key
+    return hashlib.sha1(f"{symbol.upper()}|{normalize_headline(text)}".encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Cache skor sentiment per headline.
+    - key = sha1 symbol + headline yang sudah dinormalisasi
+    - eviction LRU (max_entries) + TTL
+    - disimpan ke file JSON kecil supaya tetap ada setelah restart
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 6 * 3600, max_entries: int = 2000) -> None:
+        self.path = Path(path)
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return now - entry.get("ts", 0) > self.ttl
+
+    def get(self, headline: str, symbol: str = "") -> Optional[Dict]:
+        key = headline_key(headline, symbol)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry, time.time()):
+            del self._entries[key]
+            self._dirty = True
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, headline: str, label: str, score: float, symbol: str = "") -> None:
+        key = headline_key(headline, symbol)
+        self._entries[key] = {"label": label, "score": float(score), "ts": time.time()}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def split(self, headlines: List[str], symbol: str = "") -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Pisahkan headline yang sudah ada skornya (hits) dan yang belum (misses).
+        """
+        hits: Dict[str, Dict] = {}
+        misses: List[str] = []
+        for h in headlines:
+            entry = self.get(h, symbol)
+            if entry is None:
+                misses.append(h)
+            else:
+                hits[h] = entry
+        return hits, misses
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning("SentimentCache: gagal baca {}: {}", self.path, e)
+            return
+
+        now = time.time()
+        entries = sorted(raw.items(), key=lambda kv: kv[1].get("ts", 0))
+        for key, entry in entries[-self.max_entries:]:
+            if not self._expired(entry, now):
+                self._entries[key] = entry
+        logger.debug("SentimentCache: load {} entry dari {}", len(self._entries), self.path)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("SentimentCache: gagal simpan {}: {}", self.path, e)
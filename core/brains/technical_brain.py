@@ -1,108 +1,200 @@
+from typing import Any, Dict, Optional
+
 import pandas as pd
 import numpy as np
 from loguru import logger
 
+from core.brains.indicator_engine import IndicatorEngine
+from core.feeder.bar_buffer import ohlc_arrays
+from core.brains.technical_params import TechnicalParams
+
+
 class TechnicalBrain:
 
-    def __init__(self):
+    def __init__(self, params: Optional[TechnicalParams] = None):
+        # params None = default (nilai lama); hasil optimizer bisa dipasang di sini
+        self.params = params or TechnicalParams()
+        # state indikator streaming, di-warm-up dari frame pertama
+        self.engine = IndicatorEngine(params=self.params)
         logger.info("TechnicalBrain loaded with EMA, RSI, MACD, STOCH, ATR")
 
-    def analyze(self, df: pd.DataFrame):
+    def _sync_engine(self, cols: Dict[str, np.ndarray]) -> None:
+        """
+        Masukin bar closed yang belum pernah dilihat engine (semua kecuali bar terakhir).
+        Kalau frame nggak nyambung (awal jalan / gap / panjang frame beda) -> warm-up ulang.
+        """
+        times, high, low, close = cols["time"], cols["high"], cols["low"], cols["close"]
+        n = len(close)
+        n_closed = n - 1
+
+        engine = self.engine
+        if engine.count and engine.window == n and n_closed > 0:
+            pos = int(np.searchsorted(times[:n_closed], engine.last_time))
+            if pos < n_closed and times[pos] == engine.last_time:
+                for i in range(pos + 1, n_closed):
+                    engine.update(high[i], low[i], close[i], times[i])
+                return
+
+        engine.reset(window=n)
+        engine.warm_up(high[:n_closed], low[:n_closed], close[:n_closed], times[:n_closed])
+
+    def _indicators_pandas(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Versi lama full-recompute pakai pandas. Dipertahankan sebagai referensi
+        (dan buat cek equivalence engine streaming). Nggak nulis kolom ke df caller.
+        """
+        close = df['close']
+
+        # EMA
+        ema_fast = close.ewm(span=self.params.ema_fast).mean()
+        ema_slow = close.ewm(span=self.params.ema_slow).mean()
+
+        # RSI
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+
+        # MACD
+        ema12 = close.ewm(span=12).mean()
+        ema26 = close.ewm(span=26).mean()
+        macd = ema12 - ema26
+        signal = macd.ewm(span=9).mean()
+
+        # Stochastic
+        low14 = df['low'].rolling(14).min()
+        high14 = df['high'].rolling(14).max()
+        stoch = 100 * ((df['close'] - low14) / (high14 - low14))
+
+        # ATR
+        tr = np.maximum(df['high'] - df['low'],
+                        np.maximum(abs(df['high'] - df['close'].shift()),
+                                   abs(df['low'] - df['close'].shift())))
+        atr = tr.rolling(14).mean()
+
+        return {
+            "ema_fast": ema_fast.iloc[-1],
+            "ema_slow": ema_slow.iloc[-1],
+            "rsi": rsi.iloc[-1],
+            "macd": macd.iloc[-1],
+            "signal": signal.iloc[-1],
+            "stoch": stoch.iloc[-1],
+            "atr": atr.iloc[-1],
+            "atr_mean": atr.mean(),
+        }
+
+    def _score(self, last: Dict[str, Any]):
+        p = self.params
+        # === SCORE CALCULATION ===
+        buy_score = 0
+        sell_score = 0
+
+        # Trend → EMA crossover
+        if last['ema_fast'] > last['ema_slow']:
+            buy_score += 1
+        else:
+            sell_score += 1
+
+        # RSI Logic
+        if last['rsi'] < p.rsi_buy:
+            buy_score += 1
+        elif last['rsi'] > p.rsi_sell:
+            sell_score += 1
+
+        # MACD momentum
+        if last['macd'] > last['signal']:
+            buy_score += 1
+        else:
+            sell_score += 1
+
+        # Stochastic timing
+        if last['stoch'] < p.stoch_buy:
+            buy_score += 1
+        elif last['stoch'] > p.stoch_sell:
+            sell_score += 1
+
+        # ATR filter → if ATR too small = sideways
+        if last['atr'] < last['atr_mean'] * p.atr_factor:
+            logger.debug("ATR low → sideways → signal weakened")
+            buy_score *= p.atr_weaken
+            sell_score *= p.atr_weaken
+
+        # Decision
+        diff = buy_score - sell_score
+        conf = min(1.0, abs(diff) / 4)
+
+        if diff > 0:
+            direction = "buy"
+        elif diff < 0:
+            direction = "sell"
+        else:
+            direction = "neutral"
+
+        logger.debug(
+            f"TechnicalBrain => buy_score={buy_score}, sell_score={sell_score}, "
+            f"dir={direction}, conf={conf}"
+        )
+
+        return {
+                 "direction": direction,
+                 "confidence": conf,
+                 "buy_score": buy_score,
+                 "sell_score": sell_score
+}
+
+    def analyze(self, bars: Any):
         """
-        df = MT5 feeder already gives OHLC data
+        bars = structured array dari MT5Feeder.get_rates (jalur utama, tanpa pandas)
+        atau DataFrame get_history.
+        Bar terakhir dianggap bar yang masih jalan: bar closed masuk engine (O(1)/bar),
+        bar terakhir cuma di-preview.
         """
 
         try:
-            close = df['close']
-
-            # EMA
-            df['ema_fast'] = close.ewm(span=20).mean()
-            df['ema_slow'] = close.ewm(span=50).mean()
-
-            # RSI
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-
-            # MACD
-            ema12 = close.ewm(span=12).mean()
-            ema26 = close.ewm(span=26).mean()
-            df['macd'] = ema12 - ema26
-            df['signal'] = df['macd'].ewm(span=9).mean()
-
-            # Stochastic
-            low14 = df['low'].rolling(14).min()
-            high14 = df['high'].rolling(14).max()
-            df['stoch'] = 100 * ((df['close'] - low14) / (high14 - low14))
-
-            # ATR
-            df['tr'] = np.maximum(df['high'] - df['low'],
-                                  np.maximum(abs(df['high'] - df['close'].shift()),
-                                             abs(df['low'] - df['close'].shift())))
-            df['atr'] = df['tr'].rolling(14).mean()
-
-            last = df.iloc[-1]
-
-            # === SCORE CALCULATION ===
-            buy_score = 0
-            sell_score = 0
-
-            # Trend → EMA crossover
-            if last['ema_fast'] > last['ema_slow']:
-                buy_score += 1
-            else:
-                sell_score += 1
-
-            # RSI Logic
-            if last['rsi'] < 35:
-                buy_score += 1
-            elif last['rsi'] > 65:
-                sell_score += 1
-
-            # MACD momentum
-            if last['macd'] > last['signal']:
-                buy_score += 1
-            else:
-                sell_score += 1
-
-            # Stochastic timing
-            if last['stoch'] < 25:
-                buy_score += 1
-            elif last['stoch'] > 75:
-                sell_score += 1
-
-            # ATR filter → if ATR too small = sideways
-            if last['atr'] < df['atr'].mean() * 0.7:
-                logger.debug("ATR low → sideways → signal weakened")
-                buy_score *= 0.8
-                sell_score *= 0.8
-
-            # Decision
-            diff = buy_score - sell_score
-            conf = min(1.0, abs(diff) / 4)
-
-            if diff > 0:
-                direction = "buy"
-            elif diff < 0:
-                direction = "sell"
-            else:
-                direction = "neutral"
-
-            logger.debug(
-                f"TechnicalBrain => buy_score={buy_score}, sell_score={sell_score}, "
-                f"dir={direction}, conf={conf}"
-            )
-
-            return {
-                     "direction": direction,
-                     "confidence": conf,
-                     "buy_score": buy_score,
-                     "sell_score": sell_score
-}
+            cols = ohlc_arrays(bars)
+            self._sync_engine(cols)
+            return self._score(self.engine.preview(cols["high"][-1], cols["low"][-1], cols["close"][-1]))
 
+        except Exception as e:
+            logger.error(f"TechnicalBrain ERROR: {e}")
+            return "neutral", 0.1
+
+    def analyze_full(self, df: pd.DataFrame):
+        """
+        Jalur lama: hitung ulang semua indikator dari nol pakai pandas.
+        """
+        try:
+            return self._score(self._indicators_pandas(df))
 
         except Exception as e:
             logger.error(f"TechnicalBrain ERROR: {e}")
             return "neutral", 0.1
+
+
+def confirm_with_higher(
+    primary: Dict[str, Any], higher: Dict[int, Dict[str, Any]], conflict_factor: float = 0.5
+) -> Dict[str, Any]:
+    """
+    Konfirmasi sinyal timeframe utama dengan timeframe lebih tinggi.
+    Ada TF tinggi yang arahnya berlawanan (bukan neutral) -> confidence dikali `conflict_factor`.
+    Hasil TF tinggi ditaruh di "mtf" buat status / dashboard.
+    """
+    if not higher:
+        return primary
+    direction = primary.get("direction", "neutral")
+    conflicts = [
+        tf
+        for tf, res in higher.items()
+        if direction != "neutral" and res.get("direction", "neutral") not in ("neutral", direction)
+    ]
+    out = dict(primary)
+    out["mtf"] = {
+        tf: {"direction": res.get("direction", "neutral"), "confidence": res.get("confidence", 0.0)}
+        for tf, res in higher.items()
+    }
+    out["mtf_aligned"] = not conflicts
+    if conflicts:
+        out["confidence"] = primary.get("confidence", 0.0) * conflict_factor
+        logger.debug("TechnicalBrain: arah {} berlawanan dengan TF {} → confidence dikurangi", direction, conflicts)
+    return out
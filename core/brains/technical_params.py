@@ -0,0 +1,30 @@
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class TechnicalParams:
+    """
+    Parameter TechnicalBrain (span EMA, batas RSI/Stoch, filter ATR).
+    Default = nilai hard-coded versi awal, jadi tanpa params perilaku sama persis.
+    """
+
+    ema_fast: int = 20
+    ema_slow: int = 50
+    rsi_buy: float = 35.0  # RSI di bawah ini -> +1 buy
+    rsi_sell: float = 65.0  # RSI di atas ini -> +1 sell
+    stoch_buy: float = 25.0
+    stoch_sell: float = 75.0
+    atr_factor: float = 0.7  # ATR < rata-rata * faktor -> sideways
+    atr_weaken: float = 0.8  # skor dikali ini kalau sideways
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TechnicalParams":
+        """
+        Key yang nggak dikenal diabaikan (mis. baris hasil optimizer yang ada stats-nya).
+        """
+        known = {f.name: f.type for f in fields(cls)}
+        return cls(**{k: (int(v) if known[k] in (int, "int") else float(v)) for k, v in data.items() if k in known})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -23,9 +23,37 @@ class Settings(BaseSettings):
     # News sentiment ON/OFF
     USE_SENTIMENT: bool = True
 
+    # Cache skor sentiment per headline (biar LLM nggak dipanggil ulang buat berita sama)
+    SENTIMENT_CACHE_FILE: str = "data/sentiment_cache.json"
+    SENTIMENT_CACHE_TTL_SECONDS: int = 6 * 3600
+    SENTIMENT_CACHE_MAX_ENTRIES: int = 2000
+
+    # Budget token (perkiraan) per request batch sentiment ke LLM
+    LLM_BATCH_MAX_TOKENS: int = 3000
+    # timeout satu request LLM (detik)
+    LLM_TIMEOUT_SECONDS: float = 10.0
+    # circuit breaker per provider: gagal beruntun segini -> provider di-skip selama RESET detik
+    LLM_BREAKER_FAILURES: int = 3
+    LLM_BREAKER_RESET_SECONDS: float = 60.0
+    # hedging: fallback ditembak paralel kalau provider utama belum jawab dalam N ms (0 = off)
+    LLM_HEDGE_AFTER_MS: int = 0
+
+    # Budget latency scoring LLM per refresh; headline yang belum ke-skor saat
+    # budget habis (atau LLM gagal / offline) pakai scorer lokal
+    SENTIMENT_LLM_BUDGET_SECONDS: float = 8.0
+    # confidence scorer lokal >= ini -> headline nggak dikirim ke LLM (0 = nonaktif)
+    SENTIMENT_LOCAL_PRESCREEN: float = 0.0
+    # model hashed scorer lokal (belajar dari skor LLM)
+    SENTIMENT_LOCAL_MODEL_FILE: str = "data/sentiment_model.npz"
+
     # API Keys
     GEMINI_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+    OPENAI_MODEL: str = "gpt-4.1-mini"
+    # base URL provider (bisa diarahkan ke server lokal buat testing)
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com"
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
 
     # === Risk Management (dari config lama, tetap kita support) ===
     risk_per_trade_pct: float = 1.0
@@ -1,74 +1,189 @@
-from typing import Optional
+import time
+from typing import List, Optional
 
-import MetaTrader5 as mt5
 from loguru import logger
 
 from config.settings import settings
+from core.execution.order_queue import OrderRequest, OrderResult, make_client_id
+from core.feeder.broker_state import BrokerState, SymbolSpec
+from core.mt5_backend import mt5
+from core.utils.metrics import metrics
+
+# bit di symbol_info.filling_mode (SYMBOL_FILLING_FOK / SYMBOL_FILLING_IOC)
+_SYMBOL_FILLING_FOK = 1
+_SYMBOL_FILLING_IOC = 2
 
 
 class MT5Executor:
-    def __init__(self, symbol: str) -> None:
+    def __init__(self, symbol: str, broker: Optional[BrokerState] = None) -> None:
         self.symbol = symbol
         self.dry_run = settings.DRY_RUN
+        self.broker = broker or BrokerState(spec_ttl=settings.SYMBOL_SPEC_TTL_SECONDS)
+        self.magic = settings.ORDER_MAGIC
+        self.deviation = settings.ORDER_DEVIATION_POINTS
+        self.max_retries = settings.ORDER_MAX_RETRIES
 
-    def _send_order(
-        self,
-        order_type: int,
-        lot: float,
-        price: Optional[float] = None,
-        sl: Optional[float] = None,
-        tp: Optional[float] = None,
-        comment: str = "",
-    ) -> bool:
-        symbol_info = mt5.symbol_info(self.symbol)
-        if not symbol_info:
-            logger.error("MT5Executor: gagal ambil symbol_info.")
+    @staticmethod
+    def _filling_modes(spec: SymbolSpec) -> List[int]:
+        """
+        Urutan fill mode yang dicoba: FOK -> IOC -> RETURN, cuma yang diizinkan symbol.
+        """
+        modes = []
+        if spec.filling_mode & _SYMBOL_FILLING_FOK:
+            modes.append(mt5.ORDER_FILLING_FOK)
+        if spec.filling_mode & _SYMBOL_FILLING_IOC:
+            modes.append(mt5.ORDER_FILLING_IOC)
+        modes.append(mt5.ORDER_FILLING_RETURN)
+        return modes
+
+    def _comment(self, request: OrderRequest) -> str:
+        # client_id di depan supaya tetap ada walau comment dipotong broker (max 31 char)
+        return f"{request.client_id}|{request.reason}"[:31]
+
+    def _already_filled(self, request: OrderRequest, fresh: bool = False) -> bool:
+        """
+        Cek posisi yang sudah kebuka dengan client_id ini (mis. ack hilang / bot restart).
+        """
+        if not request.client_id:
             return False
+        return any(
+            p.magic == self.magic and str(p.comment).startswith(request.client_id)
+            for p in self.broker.positions(request.symbol, fresh=fresh)
+        )
+
+    def execute(self, request: OrderRequest) -> OrderResult:
+        """
+        Kirim satu order dengan retry:
+        - requote / price changed / off quotes -> ambil tick baru, kirim ulang
+        - fill mode ditolak -> coba fill mode berikutnya
+        Latency send->ack tiap attempt dicatat di result.
+        """
+        if not request.client_id:
+            request.client_id = make_client_id(request.symbol, request.side, request.created_at)
+        result = OrderResult(request.client_id, False)
+
+        spec = self.broker.spec(request.symbol)
+        if not spec:
+            logger.error("MT5Executor: gagal ambil symbol_info.")
+            result.comment = "no_symbol_info"
+            return result
+
+        if self._already_filled(request):
+            logger.warning("MT5Executor: order {} sudah ada di posisi, skip.", request.client_id)
+            result.ok, result.comment = True, "already_filled"
+            return result
 
-        if price is None:
-            tick = mt5.symbol_info_tick(self.symbol)
+        order_type = mt5.ORDER_TYPE_BUY if request.side == "BUY" else mt5.ORDER_TYPE_SELL
+        modes = self._filling_modes(spec)
+        mode_idx = 0
+        retryable = (mt5.TRADE_RETCODE_REQUOTE, mt5.TRADE_RETCODE_PRICE_CHANGED, mt5.TRADE_RETCODE_PRICE_OFF)
+
+        while result.attempts <= self.max_retries:
+            # attempt pertama pakai tick snapshot cycle ini, retry selalu tick baru
+            tick = self.broker.tick(request.symbol, fresh=result.attempts > 0)
             if not tick:
                 logger.error("MT5Executor: gagal ambil tick.")
-                return False
+                result.comment = "no_tick"
+                return result
             price = tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid
 
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": self.symbol,
-            "volume": lot,
-            "type": order_type,
-            "price": price,
-            "sl": sl,
-            "tp": tp,
-            "deviation": 50,
-            "magic": 123456,
-            "comment": comment,
-            "type_filling": mt5.ORDER_FILLING_FOK,
-            "type_time": mt5.ORDER_TIME_GTC,
-        }
-
-        logger.info("MT5Executor request: {}", request)
-
-        if self.dry_run:
-            logger.info("[DRY_RUN] Tidak mengirim order ke MT5.")
-            return True
-
-        result = mt5.order_send(request)
-        if result is None:
-            logger.error("MT5Executor: order_send hasil None: {}", mt5.last_error())
-            return False
+            order = {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": request.symbol,
+                "volume": request.lot,
+                "type": order_type,
+                "price": price,
+                "sl": request.sl,
+                "tp": request.tp,
+                "deviation": self.deviation,
+                "magic": self.magic,
+                "comment": self._comment(request),
+                "type_filling": modes[mode_idx],
+                "type_time": mt5.ORDER_TIME_GTC,
+            }
+            result.attempts += 1
+            result.fill_mode = modes[mode_idx]
+            result.price = price
 
-        if result.retcode != mt5.TRADE_RETCODE_DONE:
-            logger.error("MT5Executor: order gagal, retcode={}, comment={}", result.retcode, result.comment)
-            return False
+            logger.info("MT5Executor request: {}", order)
+
+            if self.dry_run:
+                logger.info("[DRY_RUN] Tidak mengirim order ke MT5.")
+                result.ok, result.comment = True, "dry_run"
+                return result
+
+            t0 = time.perf_counter()
+            sent = mt5.order_send(order)
+            result.latencies.append(time.perf_counter() - t0)
+            metrics.observe(
+                "order_send",
+                result.latencies[-1],
+                error=sent is None or sent.retcode != mt5.TRADE_RETCODE_DONE,
+            )
+
+            if sent is None:
+                logger.error("MT5Executor: order_send hasil None: {}", mt5.last_error())
+                # ack hilang: bisa jadi order tetap masuk, cek dulu sebelum kirim ulang
+                if self._already_filled(request, fresh=True):
+                    result.ok, result.comment = True, "filled_unacked"
+                    return result
+                result.comment = str(mt5.last_error())
+                continue
+
+            result.retcode = sent.retcode
+            result.comment = sent.comment
+            if sent.retcode == mt5.TRADE_RETCODE_DONE:
+                result.ok = True
+                result.order = getattr(sent, "order", None)
+                result.price = getattr(sent, "price", price) or price
+                logger.info(
+                    "Order berhasil: {} ({} attempt, {:.1f} ms)",
+                    sent,
+                    result.attempts,
+                    result.latencies[-1] * 1000,
+                )
+                return result
+
+            if sent.retcode == mt5.TRADE_RETCODE_INVALID_FILL and mode_idx + 1 < len(modes):
+                mode_idx += 1
+                logger.warning("MT5Executor: fill mode ditolak, coba mode {}", modes[mode_idx])
+                continue
+
+            if sent.retcode in retryable:
+                logger.warning(
+                    "MT5Executor: retcode={} ({}), retry {}/{}",
+                    sent.retcode,
+                    sent.comment,
+                    result.attempts,
+                    self.max_retries,
+                )
+                continue
+
+            break
 
-        logger.info("Order berhasil: {}", result)
-        return True
+        logger.error(
+            "MT5Executor: order gagal, retcode={}, comment={}, attempts={}",
+            result.retcode,
+            result.comment,
+            result.attempts,
+        )
+        return result
+
+    def _send_order(
+        self,
+        side: str,
+        lot: float,
+        sl: Optional[float] = None,
+        tp: Optional[float] = None,
+        comment: str = "",
+    ) -> bool:
+        request = OrderRequest(self.symbol, side, lot, sl=sl, tp=tp, reason=comment)
+        return self.execute(request).ok
 
     def buy_market(self, lot: float, sl: Optional[float], tp: Optional[float], reason: str) -> bool:
         logger.info("Eksekusi BUY: lot={}, sl={}, tp={}, reason={}", lot, sl, tp, reason)
-        return self._send_order(mt5.ORDER_TYPE_BUY, lot, sl=sl, tp=tp, comment=reason)
+        return self._send_order("BUY", lot, sl=sl, tp=tp, comment=reason)
 
     def sell_market(self, lot: float, sl: Optional[float], tp: Optional[float], reason: str) -> bool:
         logger.info("Eksekusi SELL: lot={}, sl={}, tp={}, reason={}", lot, sl, tp, reason)
-        return self._send_order(mt5.ORDER_TYPE_SELL, lot, sl=sl, tp=tp, comment=reason)
+        return self._send_order("SELL", lot, sl=sl, tp=tp, comment=reason)
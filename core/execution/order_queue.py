@@ -0,0 +1,159 @@
+import hashlib
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from loguru import logger
+
+
+def make_client_id(*parts: Any) -> str:
+    """
+    Client order ID deterministik (mis. symbol + tf + open time bar + side).
+    Keputusan yang sama di bar yang sama -> ID sama -> order nggak dobel.
+    Pendek karena ikut masuk comment MT5 (max 31 char).
+    """
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:10]
+
+
+@dataclass
+class OrderRequest:
+    symbol: str
+    side: str  # "BUY" / "SELL"
+    lot: float
+    sl: Optional[float] = None
+    tp: Optional[float] = None
+    reason: str = ""
+    client_id: str = ""
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class OrderResult:
+    client_id: str
+    ok: bool
+    retcode: Optional[int] = None
+    comment: str = ""
+    attempts: int = 0
+    fill_mode: Optional[int] = None
+    price: Optional[float] = None
+    order: Optional[int] = None
+    latencies: List[float] = field(default_factory=list)  # send -> ack per attempt (detik)
+    queue_wait: float = 0.0
+
+
+class LatencyStats:
+    """
+    Ringkasan latency send->ack (window N sampel terakhir).
+    """
+
+    def __init__(self, window: int = 500) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count}
+
+        def pct(q: float) -> float:
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+class OrderQueue:
+    """
+    Antrian eksekusi order. Satu thread worker yang kirim order ke MT5
+    (berurutan), loop trading cukup `submit` lalu lanjut.
+    - client_id yang sama nggak dikirim dua kali (return future yang lama)
+    - hasil & latency tiap order dicatat buat status/dashboard
+    """
+
+    def __init__(self, max_history: int = 200) -> None:
+        self._queue: "queue.Queue[Optional[tuple[Any, OrderRequest, Future, float]]]" = queue.Queue()
+        self._futures: Dict[str, Future] = {}
+        self._recent: Deque[OrderResult] = deque(maxlen=max_history)
+        self._lock = threading.Lock()
+        self.latency = LatencyStats()
+        self.sent = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="order-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, executor: Any, request: OrderRequest) -> Future:
+        with self._lock:
+            if request.client_id and request.client_id in self._futures:
+                logger.info("OrderQueue: client_id {} sudah pernah dikirim, skip.", request.client_id)
+                return self._futures[request.client_id]
+            fut: Future = Future()
+            if request.client_id:
+                self._futures[request.client_id] = fut
+                # batasi memori dedup
+                while len(self._futures) > 5000:
+                    self._futures.pop(next(iter(self._futures)))
+        self._queue.put((executor, request, fut, time.monotonic()))
+        return fut
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            executor, request, fut, queued_at = item
+            queue_wait = time.monotonic() - queued_at
+            try:
+                result = executor.execute(request)
+                result.queue_wait = queue_wait
+            except Exception as e:
+                logger.error("OrderQueue: eksekusi {} gagal: {}", request.client_id, e)
+                result = OrderResult(request.client_id, False, comment=str(e), queue_wait=queue_wait)
+
+            for seconds in result.latencies:
+                self.latency.add(seconds)
+            self.sent += 1
+            if not result.ok:
+                self.failed += 1
+            self._recent.append(result)
+            fut.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        recent = list(self._recent)
+        return {
+            "pending": self._queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "latency": self.latency.summary(),
+            "last": [
+                {
+                    "client_id": r.client_id,
+                    "ok": r.ok,
+                    "retcode": r.retcode,
+                    "attempts": r.attempts,
+                    "fill_mode": r.fill_mode,
+                    "latency_ms": [round(x * 1000, 2) for x in r.latencies],
+                }
+                for r in recent[-10:]
+            ],
+        }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def ohlc_arrays(bars: Any, tail: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Kolom time/high/low/close sebagai array numpy contiguous (float64, time = epoch detik).
+    Input: structured array MT5 (jalur utama, tanpa pandas) atau DataFrame get_history.
+    `tail` -> cuma N bar terakhir yang dikonversi.
+    """
+    if isinstance(bars, pd.DataFrame):
+        if tail is not None:
+            bars = bars.iloc[-tail:]
+        cols = {col: bars[col].to_numpy() for col in ("high", "low", "close")}
+        if "time" in bars.columns:
+            times = bars["time"].to_numpy()
+        elif isinstance(bars.index, pd.DatetimeIndex):
+            # unit index bisa ns / us / s (pandas 3) -> konversi lewat datetime64 di bawah
+            index = bars.index if bars.index.tz is None else bars.index.tz_convert(None)
+            times = np.asarray(index)
+        else:
+            times = bars.index.to_numpy()
+    else:
+        if tail is not None:
+            bars = bars[-tail:]
+        cols = {col: bars[col] for col in ("high", "low", "close")}
+        times = bars["time"]
+
+    out = {col: np.ascontiguousarray(values, dtype=np.float64) for col, values in cols.items()}
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype("datetime64[s]")
+    out["time"] = times.astype(np.int64)
+    return out
+
+
+def to_frame(rates: np.ndarray) -> pd.DataFrame:
+    """
+    Structured array MT5 -> DataFrame dengan index datetime. Cuma buat dashboard /
+    debug / manusia; jalur analisa per cycle pakai array langsung.
+    """
+    df = pd.DataFrame(rates)
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    df.set_index("time", inplace=True)
+    return df
+
+
+class BarBuffer:
+    """
+    Ring buffer bar OHLC kapasitas tetap (satu per symbol/timeframe).
+    - Storage 2x kapasitas, jadi `view()` selalu contiguous tanpa copy
+      (data digeser ke depan sekali tiap ~kapasitas bar, amortized O(1))
+    - `merge()` ganti bar terakhir yang masih jalan in-place, bar baru di-append
+    """
+
+    def __init__(self, capacity: int, dtype: Optional[np.dtype] = None) -> None:
+        self.capacity = capacity
+        self.dtype = dtype
+        self._data: Optional[np.ndarray] = None
+        self._start = 0
+        self._end = 0
+        if dtype is not None:
+            self._alloc(dtype)
+
+    def _alloc(self, dtype: np.dtype) -> None:
+        self.dtype = dtype
+        self._data = np.zeros(self.capacity * 2, dtype=dtype)
+        self._start = self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    @property
+    def last_time(self) -> Optional[int]:
+        if not len(self):
+            return None
+        return int(self._data["time"][self._end - 1])
+
+    def view(self, bars: Optional[int] = None) -> np.ndarray:
+        """
+        View read-only ke `bars` bar terakhir (default semua). Bukan copy,
+        jadi isinya bisa berubah setelah merge berikutnya.
+        """
+        if self._data is None:
+            return np.zeros(0)
+        start = self._start if bars is None else max(self._start, self._end - bars)
+        out = self._data[start:self._end]
+        out.flags.writeable = False
+        return out
+
+    def _append(self, rows: np.ndarray) -> None:
+        k = len(rows)
+        if k >= self.capacity:
+            self._data[: self.capacity] = rows[-self.capacity:]
+            self._start, self._end = 0, self.capacity
+            return
+
+        if self._end + k > len(self._data):
+            keep = min(len(self), self.capacity - k)
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+
+        self._data[self._end:self._end + k] = rows
+        self._end += k
+        if len(self) > self.capacity:
+            self._start = self._end - self.capacity
+
+    def merge(self, rates: np.ndarray) -> int:
+        """
+        Gabungkan hasil copy_rates_* (urut waktu naik). Return jumlah bar baru.
+        Bar dengan waktu == bar terakhir menimpa bar itu (update bar yang masih jalan).
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+        if self._data is None:
+            self._alloc(rates.dtype)
+
+        last = self.last_time
+        if last is None:
+            self._append(rates)
+            return len(rates)
+
+        times = rates["time"]
+        pos = int(np.searchsorted(times, last))
+        if pos < len(rates) and times[pos] == last:
+            self._data[self._end - 1] = rates[pos]
+            pos += 1
+
+        new = rates[pos:]
+        if len(new):
+            self._append(new)
+        return len(new)
@@ -0,0 +1,132 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from core.mt5_backend import mt5
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """
+    Spec statis symbol (jarang berubah, aman di-cache lama).
+    """
+
+    symbol: str
+    point: float
+    contract_size: float
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    digits: int
+    filling_mode: int
+
+    @classmethod
+    def from_info(cls, symbol: str, info: Any) -> "SymbolSpec":
+        return cls(
+            symbol=symbol,
+            point=float(info.point),
+            contract_size=float(info.trade_contract_size),
+            volume_min=float(info.volume_min),
+            volume_max=float(info.volume_max),
+            volume_step=float(info.volume_step),
+            digits=int(getattr(info, "digits", 0)),
+            filling_mode=int(getattr(info, "filling_mode", 0)),
+        )
+
+
+class BrokerState:
+    """
+    Snapshot state broker yang dipakai bareng RiskGovernor & MT5Executor.
+    - account / positions / tick: diambil sekali per cycle (lazy), di-reset
+      oleh `begin_cycle()` atau otomatis kalau lebih tua dari `cycle_ttl`
+    - spec symbol (point, contract size, volume): cache `spec_ttl` detik
+    """
+
+    def __init__(self, spec_ttl: float = 3600.0, cycle_ttl: float = 1.0) -> None:
+        self.spec_ttl = spec_ttl
+        self.cycle_ttl = cycle_ttl
+        self._lock = threading.Lock()
+        self._specs: Dict[str, Tuple[float, SymbolSpec]] = {}
+        self._cycle_at = 0.0
+        self._account: Any = None
+        self._positions: Optional[Tuple] = None
+        self._ticks: Dict[str, Any] = {}
+        self.calls = 0  # jumlah round trip ke terminal (buat debug / metrics)
+
+    # ---------- cycle ----------
+    def begin_cycle(self) -> None:
+        """
+        Buang data per-cycle; dipanggil main loop di awal tiap cycle.
+        """
+        with self._lock:
+            self._reset_cycle(time.monotonic())
+
+    def _reset_cycle(self, now: float) -> None:
+        self._cycle_at = now
+        self._account = None
+        self._positions = None
+        self._ticks = {}
+
+    def _check_cycle(self) -> None:
+        now = time.monotonic()
+        if now - self._cycle_at > self.cycle_ttl:
+            self._reset_cycle(now)
+
+    # ---------- data per cycle ----------
+    def account(self) -> Any:
+        with self._lock:
+            self._check_cycle()
+            if self._account is None:
+                self.calls += 1
+                self._account = mt5.account_info()
+            return self._account
+
+    def positions(self, symbol: Optional[str] = None, fresh: bool = False) -> Tuple:
+        """
+        Semua posisi diambil sekali (positions_get tanpa filter), filter symbol di sini.
+        fresh=True -> paksa ambil ulang (mis. cek order yang ack-nya hilang).
+        """
+        with self._lock:
+            self._check_cycle()
+            if self._positions is None or fresh:
+                self.calls += 1
+                positions = mt5.positions_get()
+                self._positions = tuple(positions) if positions is not None else ()
+            if symbol is None:
+                return self._positions
+            return tuple(p for p in self._positions if p.symbol == symbol)
+
+    def tick(self, symbol: str, fresh: bool = False) -> Any:
+        with self._lock:
+            self._check_cycle()
+            if symbol not in self._ticks or fresh:
+                self.calls += 1
+                self._ticks[symbol] = mt5.symbol_info_tick(symbol)
+            return self._ticks[symbol]
+
+    # ---------- spec statis ----------
+    def spec(self, symbol: str) -> Optional[SymbolSpec]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._specs.get(symbol)
+            if cached is not None and now - cached[0] < self.spec_ttl:
+                return cached[1]
+
+            self.calls += 1
+            info = mt5.symbol_info(symbol)
+            if not info:
+                logger.error("BrokerState: gagal ambil symbol_info {}: {}", symbol, mt5.last_error())
+                return None
+            spec = SymbolSpec.from_info(symbol, info)
+            self._specs[symbol] = (now, spec)
+            return spec
+
+    def invalidate_spec(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._specs.clear()
+            else:
+                self._specs.pop(symbol, None)
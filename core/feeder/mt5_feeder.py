@@ -1,10 +1,14 @@
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
 
-import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from config.settings import settings
+from core.feeder.bar_buffer import BarBuffer, to_frame
+from core.feeder.resampler import Resampler
+from core.mt5_backend import mt5
+from core.storage.bar_store import BarStore
 
 
 TIMEFRAME_MAP = {
@@ -17,10 +21,16 @@ TIMEFRAME_MAP = {
 
 
 class MT5Feeder:
-    def __init__(self) -> None:
-        self.symbol: str = settings.SYMBOL
-        self.tf_minutes: int = settings.TIMEFRAME_MINUTES
+    def __init__(self, symbol: Optional[str] = None, tf_minutes: Optional[int] = None) -> None:
+        self.symbol: str = symbol or settings.SYMBOL
+        self.tf_minutes: int = tf_minutes or settings.TIMEFRAME_MINUTES
         self.timeframe = TIMEFRAME_MAP.get(self.tf_minutes, mt5.TIMEFRAME_M15)
+        # cache bar per (symbol, timeframe), diisi incremental tiap loop
+        self._buffers: Dict[Tuple[str, int], BarBuffer] = {}
+        self._stores: Dict[Tuple[str, int], BarStore] = {}
+        # timeframe turunan dari M1 (get_rates_multi), per menit
+        self._resamplers: Dict[int, Resampler] = {}
+        self._m1_short_logged = False
 
     def initialize(self) -> bool:
         """
@@ -68,7 +78,13 @@ class MT5Feeder:
                 "Diasumsikan sudah login via terminal MT5."
             )
 
-        # pastikan symbol tersedia
+        return self.select_symbol()
+
+    def select_symbol(self) -> bool:
+        """
+        Pastikan symbol tersedia di Market Watch. Buat feeder symbol ke-2 dst
+        (koneksi MT5 sudah di-initialize feeder pertama).
+        """
         if not mt5.symbol_select(self.symbol, True):
             logger.error("Gagal select symbol {}: {}", self.symbol, mt5.last_error())
             return False
@@ -76,16 +92,121 @@ class MT5Feeder:
         logger.info("MT5Feeder siap. Symbol: {}, TF: {}m", self.symbol, self.tf_minutes)
         return True
 
-    def get_history(self, bars: int = 500) -> Optional[pd.DataFrame]:
-        rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
+    def _buffer(self, bars: int, timeframe: Optional[int] = None) -> BarBuffer:
+        key = (self.symbol, self.timeframe if timeframe is None else timeframe)
+        buf = self._buffers.get(key)
+        if buf is None or buf.capacity < bars:
+            buf = BarBuffer(capacity=max(bars, settings.BAR_BUFFER_CAPACITY))
+            self._buffers[key] = buf
+        return buf
+
+    def _fetch_new_rates(self, buf: BarBuffer, bars: int, timeframe: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Ambil cuma bar yang lebih baru dari bar terakhir di buffer.
+        Mulai dari 2 bar (bar jalan + bar yang barusan close), digandakan
+        sampai overlap dengan buffer. Kalau gap lebih dari kapasitas -> reload penuh.
+        """
+        timeframe = self.timeframe if timeframe is None else timeframe
+        last_time = buf.last_time
+        if last_time is None:
+            return mt5.copy_rates_from_pos(self.symbol, timeframe, 0, bars)
+
+        count = 2
+        while True:
+            rates = mt5.copy_rates_from_pos(self.symbol, timeframe, 0, count)
+            if rates is None or len(rates) == 0:
+                return rates
+            if rates["time"][0] <= last_time:
+                return rates
+            if count >= buf.capacity:
+                logger.warning("MT5Feeder: gap data > {} bar, reload buffer.", buf.capacity)
+                buf.clear()
+                return rates
+            count = min(count * 2, buf.capacity)
+
+    def get_rates(self, bars: int = 500) -> Optional[np.ndarray]:
+        """
+        Versi array: view (tanpa copy) ke `bars` bar terakhir di buffer.
+        Bar terakhir = bar yang masih jalan.
+        """
+        buf = self._buffer(bars)
+        rates = self._fetch_new_rates(buf, bars)
         if rates is None:
             logger.error("Gagal ambil data rates: {}", mt5.last_error())
             return None
 
-        df = pd.DataFrame(rates)
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        df.set_index("time", inplace=True)
-        return df
+        buf.merge(rates)
+        view = buf.view(bars)
+        self._persist(view)
+        return view
+
+    def get_rates_multi(self, tfs: Sequence[int], bars: int = 500) -> Optional[Dict[int, np.ndarray]]:
+        """
+        Beberapa timeframe sekaligus dari satu stream M1: M1 diambil incremental
+        (satu copy_rates_from_pos per cycle), timeframe lain di-resample incremental.
+        Return {tf menit: view `bars` bar terakhir}, bar terakhir = bar yang masih jalan.
+        TF utama dapat `bars` bar; TF tertinggi cukup MIN_BARS_REQUIRED bar (bars x TF
+        tertinggi dalam M1 gampang lewat batas "Max bars in chart" terminal).
+        """
+        top = max(tfs)
+        primary = bars * self.tf_minutes if self.tf_minutes in tfs else 0
+        m1_bars = min(bars * top, max(primary, settings.MIN_BARS_REQUIRED * top))
+        buf = self._buffer(m1_bars, mt5.TIMEFRAME_M1)
+        rates = self._fetch_new_rates(buf, m1_bars, mt5.TIMEFRAME_M1)
+        if rates is None:
+            logger.error("Gagal ambil data rates M1: {}", mt5.last_error())
+            return None
+        buf.merge(rates)
+        m1 = buf.view()
+        if len(m1) < m1_bars and not self._m1_short_logged:
+            # history M1 di terminal kurang (Max bars in chart / data belum di-download)
+            self._m1_short_logged = True
+            logger.warning(
+                "MT5Feeder: terminal cuma kasih {} bar M1 {} (butuh {}), TF {}m baru ~{} bar",
+                len(m1),
+                self.symbol,
+                m1_bars,
+                top,
+                len(m1) // top,
+            )
+
+        out: Dict[int, np.ndarray] = {}
+        for tf in tfs:
+            if tf == 1:
+                out[tf] = buf.view(bars)
+                continue
+            resampler = self._resamplers.get(tf)
+            if resampler is None:
+                resampler = self._resamplers[tf] = Resampler(tf, max(bars, settings.BAR_BUFFER_CAPACITY))
+            out[tf] = resampler.update(m1).view(bars)
+
+        if self.tf_minutes in out:
+            self._persist(out[self.tf_minutes])
+        return out
+
+    def _persist(self, rates: np.ndarray) -> None:
+        """
+        Tulis bar yang sudah close (semua kecuali bar terakhir) ke BarStore.
+        """
+        if not settings.BAR_STORE_ENABLED or len(rates) < 2:
+            return
+        key = (self.symbol, self.tf_minutes)
+        store = self._stores.get(key)
+        if store is None:
+            store = self._stores[key] = BarStore(self.symbol, self.tf_minutes)
+        try:
+            store.append(rates[:-1])
+        except OSError as e:
+            logger.warning("MT5Feeder: gagal tulis BarStore {}: {}", store.path, e)
+
+    def get_history(self, bars: int = 500) -> Optional[pd.DataFrame]:
+        """
+        Versi DataFrame (index datetime) buat dashboard / debug. Loop analisa pakai get_rates.
+        """
+        rates = self.get_rates(bars)
+        if rates is None:
+            return None
+        return to_frame(rates)
 
     def get_tick_info(self) -> Optional[dict]:
         tick = mt5.symbol_info_tick(self.symbol)
@@ -1,10 +1,16 @@
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 import feedparser
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from config.settings import settings
+from core.feeder.news_index import MinHashDeduper, RelevanceIndex
+from core.utils.metrics import metrics
 
 
 class NewsFeeder:
@@ -13,11 +19,16 @@ class NewsFeeder:
     - Pake beberapa sumber (multi-feed)
     - Pake User-Agent supaya nggak gampang di-403
     - Kalau semua gagal, balik list kosong (sentiment jadi neutral).
+    - Semua feed di-fetch paralel dengan satu deadline total
+    - Session keep-alive + ETag/Last-Modified: feed yang nggak berubah dapat 304,
+      nggak perlu feedparser.parse ulang
+    - Berita sindikasi yang sama dari beberapa feed digabung jadi satu (MinHash),
+      lalu cuma headline yang relevan dengan symbol yang diteruskan ke LLM
     """
 
-    def __init__(self) -> None:
+    def __init__(self, feeds: Optional[List[str]] = None, deadline: Optional[float] = None) -> None:
         # List feed bisa lo modif sendiri nanti
-        self.feeds = [
+        self.feeds = feeds or [
             # CNBC World Markets (kadang 403, tapi kita coba dulu)
             "https://www.cnbc.com/id/100003114/device/rss/rss.html",
             # Wall Street Journal Markets
@@ -27,6 +38,7 @@ class NewsFeeder:
             # FXStreet: market news (forex/commodities)
             "https://www.fxstreet.com/rss/news",
         ]
+        self.deadline = deadline if deadline is not None else settings.NEWS_FETCH_DEADLINE_SECONDS
 
         # Header biar request keliatan kayak browser normal
         self.headers = {
@@ -37,19 +49,46 @@ class NewsFeeder:
             )
         }
 
+        # koneksi keep-alive dipakai ulang antar loop
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.feeds), pool_maxsize=len(self.feeds))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.feeds), thread_name_prefix="news")
+
+        # per feed: validator (etag / last-modified) + item hasil parse terakhir
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._cache: Dict[str, List[Dict]] = {}
+
+        self.relevance = RelevanceIndex(settings.news_keywords())
+        self.min_relevance = settings.NEWS_MIN_RELEVANCE
+        self.deduper = MinHashDeduper(threshold=settings.NEWS_DEDUP_THRESHOLD)
+
     def _fetch_feed(self, url: str) -> List[Dict]:
         """
         Ambil satu feed RSS dan kembalikan list item sederhana:
         {title, published, link}
         """
+        headers = {}
+        validator = self._validators.get(url, {})
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = self.session.get(url, headers=headers, timeout=self.deadline)
+            if resp.status_code == 304 and url in self._cache:
+                logger.debug("NewsFeeder: {} belum berubah (304)", url)
+                return self._cache[url]
             resp.raise_for_status()
             parsed = feedparser.parse(resp.text)
         except Exception as e:
             # Jangan panik kalau satu feed gagal, kita masih punya feed lain
-            logger.warning("NewsFeeder: gagal fetch {}: {}", url, e)
-            return []
+            # (dan item terakhirnya, sama seperti feed yang lewat deadline)
+            logger.warning("NewsFeeder: gagal fetch {}: {}, pakai cache.", url, e)
+            return self._cache.get(url, [])
 
         items: List[Dict] = []
         for entry in parsed.entries[:20]:
@@ -74,8 +113,44 @@ class NewsFeeder:
 
             items.append(item)
 
+        self._cache[url] = items
+        self._validators[url] = {
+            "etag": resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+        }
         return items
 
+    def _fetch_all(self, deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Fetch semua feed paralel. Feed yang belum selesai saat deadline habis
+        diganti item cache terakhirnya (kalau ada).
+        `deadline` (detik) = batas lebih ketat dari self.deadline, mis. sisa deadline refresh sentiment.
+        """
+        deadline = self.deadline if deadline is None else min(deadline, self.deadline)
+        t0 = time.perf_counter()
+        futures = {self._executor.submit(self._fetch_feed, url): url for url in self.feeds}
+        done, pending = wait(futures, timeout=deadline)
+        metrics.observe("news", time.perf_counter() - t0, error=bool(pending))
+
+        all_items: List[Dict] = []
+        for fut, url in futures.items():
+            if fut in done:
+                all_items.extend(fut.result())
+            else:
+                logger.warning("NewsFeeder: {} lewat deadline {:.1f}s, pakai cache.", url, deadline)
+                all_items.extend(self._cache.get(url, []))
+        return all_items
+
+    def fetch(self, deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Satu kali fetch semua feed (sekali per refresh sentiment); hasilnya dipakai
+        `select` buat semua symbol.
+        """
+        all_items = self._fetch_all(deadline)
+        if not all_items:
+            logger.warning("NewsFeeder: tidak ada item dari semua feed (mungkin jaringan atau blokir situs).")
+        return all_items
+
     def get_recent_headlines(
         self,
         symbol: str,
@@ -83,17 +158,24 @@ class NewsFeeder:
         max_age_minutes: int = 60,
     ) -> List[str]:
         """
-        Ambil beberapa headline terbaru (gabungan beberapa RSS).
-        Parameter `symbol` belum dipakai, tapi nanti bisa buat filter spesifik
-        (misal cuma ambil yang nyebut 'gold', 'XAU', 'dollar', dll).
+        Fetch + select buat satu symbol. Buat banyak symbol: `fetch()` sekali lalu `select` per symbol.
         """
-        all_items: List[Dict] = []
-        for url in self.feeds:
-            items = self._fetch_feed(url)
-            all_items.extend(items)
+        return self.select(self.fetch(), symbol, limit, max_age_minutes)
 
+    def select(
+        self,
+        all_items: List[Dict],
+        symbol: str,
+        limit: int = 5,
+        max_age_minutes: int = 60,
+    ) -> List[str]:
+        """
+        Pilih beberapa headline terbaru dari hasil `fetch()` yang relevan dengan `symbol` (tanpa network).
+        Urutan: filter umur -> urut terbaru -> filter relevansi -> gabung near-duplicate.
+        Symbol yang nggak punya keyword (bukan FX/metal/crypto dan nggak ada di NEWS_KEYWORDS)
+        nggak difilter relevansinya.
+        """
         if not all_items:
-            logger.warning("NewsFeeder: tidak ada item dari semua feed (mungkin jaringan atau blokir situs).")
             return []
 
         filtered: List[Dict] = []
@@ -127,13 +209,26 @@ class NewsFeeder:
 
         filtered_sorted = sorted(filtered, key=sort_key, reverse=True)
 
+        # relevansi dulu, baru dedup: headline symbol lain nggak boleh "menelan" headline symbol ini
         headlines = [it["title"] for it in filtered_sorted]
+        dropped = 0
+        if symbol and self.relevance.add_symbol(symbol):
+            relevant = [h for h in headlines if self.relevance.score(h, symbol) >= self.min_relevance]
+            dropped = len(headlines) - len(relevant)
+            headlines = relevant
+
+        # berita yang sama dari feed lain -> yang terbaru saja
+        kept, dup_of = self.deduper.collapse(headlines)
+        headlines = [headlines[i] for i in kept]
         headlines = headlines[:limit]
 
         logger.info(
-            "NewsFeeder: dapat {} headline (limit={}, max_age={}m)",
+            "NewsFeeder: dapat {} headline {} (limit={}, max_age={}m, duplikat={}, nggak relevan={})",
             len(headlines),
+            symbol,
             limit,
             max_age_minutes,
+            len(dup_of),
+            dropped,
         )
         return headlines
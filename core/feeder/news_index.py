@@ -0,0 +1,233 @@
+import re
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.brains.sentiment_cache import normalize_headline
+
+
+# alias per mata uang / aset: (keyword kuat = aset itu sendiri, keyword makro = faktor penggerak)
+ASSET_ALIASES: Dict[str, Tuple[Sequence[str], Sequence[str]]] = {
+    "XAU": (("gold", "bullion", "xau", "precious metal", "precious metals"), ("safe haven", "haven demand", "etf")),
+    "XAG": (("silver", "xag", "precious metal", "precious metals"), ("industrial metals",)),
+    "USD": (
+        ("dollar", "greenback", "usd", "dxy"),
+        ("fed", "fomc", "powell", "yields", "treasury", "treasuries", "inflation", "cpi", "pce", "payrolls",
+         "nonfarm", "jobs report", "rate cut", "rate hike", "interest rates", "tariff", "tariffs"),
+    ),
+    "EUR": (("euro", "eur", "eurozone", "euro zone"), ("ecb", "lagarde", "bund", "bunds")),
+    "GBP": (("pound", "sterling", "gbp"), ("boe", "bank of england", "gilt", "gilts")),
+    "JPY": (("yen", "jpy"), ("boj", "bank of japan", "ueda", "jgb")),
+    "CHF": (("franc", "chf", "swissie"), ("snb",)),
+    "AUD": (("aussie", "aud"), ("rba", "iron ore")),
+    "CAD": (("loonie", "cad"), ("boc", "bank of canada", "oil", "crude")),
+    "NZD": (("kiwi", "nzd"), ("rbnz",)),
+    "BTC": (("bitcoin", "btc"), ("crypto", "cryptocurrency", "etf")),
+    "ETH": (("ether", "ethereum", "eth"), ("crypto", "cryptocurrency")),
+}
+# kata arah gerak -> bobot (+ naik, - turun); dipakai LexiconScorer dan cek dedup
+DIRECTION: Dict[str, float] = {
+    **dict.fromkeys(
+        "rise rises rising rose gain gains gained advance advances higher climb climbs climbed "
+        "rebound rebounds rebounded firm firms firmer strengthens stronger strong up boost boosts "
+        "upbeat bullish beat beats recovers recovery".split(),
+        1.0,
+    ),
+    **dict.fromkeys("jump jumps jumped rally rallies rallied surge surges surged soar soars soared".split(), 1.5),
+    **dict.fromkeys(["record high", "all time", "fresh high", "year high"], 1.5),
+    **dict.fromkeys(
+        "fall falls fell falling drop drops dropped decline declines declined lower slip slips slipped "
+        "slide slides slid weak weaker weakens down lose loses lost retreat retreats eases dips dip "
+        "bearish miss misses pressured".split(),
+        -1.0,
+    ),
+    **dict.fromkeys("plunge plunges plunged tumble tumbles tumbled slump slumps slumped sink sinks sank".split(), -1.5),
+    **dict.fromkeys(["sell off", "selloff", "year low", "record low"], -1.5),
+}
+# alias (kuat + makro) -> kode aset, mis. "ecb" -> {"EUR"}, "etf" -> {"XAU", "BTC"}
+ALIAS_CODES: Dict[str, FrozenSet[str]] = {
+    alias: frozenset(code for code, (strong, macro) in ASSET_ALIASES.items() if alias in (*strong, *macro))
+    for aliases in ASSET_ALIASES.values()
+    for alias in (*aliases[0], *aliases[1])
+}
+
+STRONG_WEIGHT = 2.0  # nyebut asetnya langsung
+MACRO_WEIGHT = 1.0  # faktor makro yang biasanya gerakin aset itu
+
+
+def _tokens(text: str) -> List[str]:
+    """
+    Unigram + bigram dari headline yang sudah dinormalisasi ("rate cut" jadi satu token).
+    """
+    words = normalize_headline(text).split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def symbol_keywords(symbol: str, extra: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Keyword -> bobot buat satu symbol. Symbol 6 huruf (XAUUSD, EURUSD, ...) dipecah
+    jadi base + quote, alias dua-duanya dipakai. Symbol yang nggak dikenal (mis. US30)
+    cuma dapat keyword dari `extra` (NEWS_KEYWORDS).
+    """
+    sym = re.sub(r"[^A-Z]", "", symbol.upper())
+    codes = [sym[:3], sym[3:6]] if len(sym) >= 6 else [sym]
+    out: Dict[str, float] = {}
+    for code in codes:
+        strong, macro = ASSET_ALIASES.get(code, ((), ()))
+        for kw in macro:
+            out[kw] = max(out.get(kw, 0.0), MACRO_WEIGHT)
+        for kw in strong:
+            out[kw] = STRONG_WEIGHT
+    for kw in extra or ():
+        kw = normalize_headline(kw)
+        if kw:
+            out[kw] = STRONG_WEIGHT
+    return out
+
+
+class RelevanceIndex:
+    """
+    Inverted index keyword -> {symbol: bobot}. Satu pass token per headline
+    langsung dapat skor relevansi buat semua symbol sekaligus.
+    """
+
+    def __init__(self, extra: Optional[Dict[str, List[str]]] = None) -> None:
+        self.extra = {k.upper(): v for k, v in (extra or {}).items()}
+        self._index: Dict[str, Dict[str, float]] = {}
+        self._symbols: set = set()
+        self._indexed: set = set()
+
+    def add_symbol(self, symbol: str) -> bool:
+        """
+        Daftarkan symbol (sekali). False kalau symbol nggak punya keyword sama sekali.
+        """
+        symbol = symbol.upper()
+        if symbol not in self._symbols:
+            for kw, weight in symbol_keywords(symbol, self.extra.get(symbol)).items():
+                self._index.setdefault(kw, {})[symbol] = weight
+                self._indexed.add(symbol)
+            self._symbols.add(symbol)
+        return symbol in self._indexed
+
+    def scores(self, headline: str) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for tok in set(_tokens(headline)):
+            for symbol, weight in self._index.get(tok, {}).items():
+                out[symbol] = out.get(symbol, 0.0) + weight
+        return out
+
+    def score(self, headline: str, symbol: str) -> float:
+        self.add_symbol(symbol)
+        return self.scores(headline).get(symbol.upper(), 0.0)
+
+
+# ==========================================================
+# NEAR-DUPLICATE (MinHash + LSH banding)
+# ==========================================================
+_PRIME = (1 << 61) - 1
+
+
+StoryKey = Tuple[FrozenSet[str], FrozenSet[float]]  # (kode aset, arah gerak)
+
+
+def story_key(text: str) -> StoryKey:
+    """
+    Aset yang disebut + arah geraknya. Dua headline dengan key beda bukan berita
+    yang sama walau kata-katanya mirip ("gold rises" vs "gold falls", ECB vs BoE).
+    """
+    codes: set = set()
+    signs: set = set()
+    for tok in _tokens(text):
+        codes |= ALIAS_CODES.get(tok, frozenset())
+        weight = DIRECTION.get(tok)
+        if weight:
+            signs.add(float(np.sign(weight)))
+    return frozenset(codes), frozenset(signs)
+
+
+class MinHashDeduper:
+    """
+    Gabung headline yang hampir sama (berita sindikasi beda feed, beda tanda baca /
+    satu-dua kata). Signature MinHash dari shingle kata, kandidat lewat LSH
+    banding, lalu dicek estimasi Jaccard >= threshold dan aset + arah yang disebut sama.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 32,
+        shingle: int = 1,
+        threshold: float = 0.75,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm harus kelipatan bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle = shingle
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        # headline yang sama muncul lagi tiap cycle -> signature + story key di-cache
+        self._sigs: Dict[str, Tuple[np.ndarray, StoryKey]] = {}
+
+    def _entry(self, text: str) -> Tuple[np.ndarray, StoryKey]:
+        norm = normalize_headline(text)
+        entry = self._sigs.get(norm)
+        if entry is None:
+            if len(self._sigs) >= 4096:
+                self._sigs.clear()
+            entry = self._sigs[norm] = (self._signature(norm), story_key(norm))
+        return entry
+
+    def signature(self, text: str) -> np.ndarray:
+        return self._entry(text)[0]
+
+    def _signature(self, norm: str) -> np.ndarray:
+        # shingle = k kata berurutan (default 1: headline pendek, sisipan "the" / "- Reuters"
+        # nggak boleh merusak terlalu banyak shingle); headline lebih pendek dari k -> satu shingle
+        words = norm.split()
+        k = self.shingle
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        h = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a*x + b) mod p; x < 2^32 dan a < 2^61 -> overflow uint64 nggak masalah buat hashing
+        return ((h[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+
+    def collapse(self, headlines: Sequence[str]) -> Tuple[List[int], Dict[int, int]]:
+        """
+        Return (index headline yang dipertahankan, {index duplikat: index yang dipertahankan}).
+        Urutan input dihormati: yang pertama (terbaru) yang disimpan.
+        """
+        kept: List[int] = []
+        dup_of: Dict[int, int] = {}
+        if not headlines:
+            return kept, dup_of
+        entries = [self._entry(text) for text in headlines]
+        sigs = np.stack([sig for sig, _ in entries])
+        band_keys = sigs.reshape(len(headlines), self.bands, self.rows)
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for i in range(len(headlines)):
+            bands = [(b, band_keys[i, b].tobytes()) for b in range(self.bands)]
+            candidates = sorted({j for band in bands for j in buckets.get(band, ())})
+            if candidates:
+                # estimasi Jaccard semua kandidat sekaligus
+                similarity = (sigs[candidates] == sigs[i]).mean(axis=1)
+                key = entries[i][1]
+                hit = next(
+                    (
+                        candidates[int(h)]
+                        for h in np.flatnonzero(similarity >= self.threshold)
+                        if entries[candidates[int(h)]][1] == key
+                    ),
+                    None,
+                )
+                if hit is not None:
+                    dup_of[i] = hit
+                    continue
+            kept.append(i)
+            for band in bands:
+                buckets.setdefault(band, []).append(i)
+        return kept, dup_of
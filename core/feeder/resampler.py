@@ -0,0 +1,55 @@
+import numpy as np
+
+from core.feeder.bar_buffer import BarBuffer
+
+
+def resample(m1: np.ndarray, minutes: int) -> np.ndarray:
+    """
+    Agregasi bar M1 (structured array MT5, urut waktu) ke timeframe `minutes`.
+    Bucket = time // (minutes * 60), sama dengan alignment bar MT5 buat M5..H4/D1.
+    Bar M1 terakhir yang masih jalan ikut masuk -> bar TF terakhir juga bar jalan.
+    """
+    if len(m1) == 0:
+        return m1[:0].copy()
+
+    seconds = minutes * 60
+    bucket = m1["time"] // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(m1)] - 1
+
+    out = np.zeros(len(starts), dtype=m1.dtype)
+    out["time"] = bucket[starts]
+    out["open"] = m1["open"][starts]
+    out["high"] = np.maximum.reduceat(m1["high"], starts)
+    out["low"] = np.minimum.reduceat(m1["low"], starts)
+    out["close"] = m1["close"][ends]
+    names = m1.dtype.names
+    for col in ("tick_volume", "real_volume"):
+        if col in names:
+            out[col] = np.add.reduceat(m1[col], starts)
+    if "spread" in names:
+        out["spread"] = m1["spread"][ends]
+    return out
+
+
+class Resampler:
+    """
+    M1 -> timeframe N menit secara incremental.
+    Tiap `update()` cuma M1 mulai dari bucket bar TF terakhir yang di-resample ulang
+    (bar TF yang masih jalan ditimpa, bar baru di-append ke BarBuffer).
+    """
+
+    def __init__(self, minutes: int, capacity: int) -> None:
+        self.minutes = minutes
+        self.buffer = BarBuffer(capacity)
+
+    def update(self, m1: np.ndarray) -> BarBuffer:
+        last = self.buffer.last_time
+        if last is not None and len(m1):
+            if m1["time"][0] > last:
+                # buffer M1 di-reload / gap lebih panjang dari buffer -> bangun ulang
+                self.buffer.clear()
+            else:
+                m1 = m1[int(np.searchsorted(m1["time"], last, side="left")):]
+        self.buffer.merge(resample(m1, self.minutes))
+        return self.buffer
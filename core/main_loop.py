@@ -1,36 +1,323 @@
-from core.utils.control_loader import load_control
-import MetaTrader5 as mt5
-
-...
-
-decision = orchestrator.decide(technical_result, sentiment_result, condition_result)
-
-action = decision["action"]
-lot = decision["lot"]
-reason = decision["reason"]
-
-logger.info(f"DECISION: {action} | lot={lot} | reason={reason}")
-
-control = load_control()
-if not control["trading_enabled"]:
-    logger.info("Trading disabled from dashboard → HOLD")
-else:
-    if action == "BUY":
-        mt5.order_send({
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": settings.SYMBOL,
-            "volume": lot,
-            "type": mt5.ORDER_TYPE_BUY,
-            "deviation": 10,
-        })
-        logger.info(f"EXECUTED BUY {lot}")
-
-    elif action == "SELL":
-        mt5.order_send({
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": settings.SYMBOL,
-            "volume": lot,
-            "type": mt5.ORDER_TYPE_SELL,
-            "deviation": 10,
-        })
-        logger.info(f"EXECUTED SELL {lot}")
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from config.settings import settings
+from core.brains.sentiment_brain import SentimentBrain
+from core.execution.mt5_executor import MT5Executor
+from core.execution.order_queue import OrderQueue, OrderRequest, make_client_id
+from core.feeder.broker_state import BrokerState
+from core.feeder.mt5_feeder import MT5Feeder
+from core.mt5_backend import mt5
+from core.orchestrator.analysis_pool import AnalysisPool, Key
+from core.orchestrator.orchestrator import Orchestrator
+from core.pipeline.bar_scheduler import BarCloseScheduler
+from core.pipeline.event_publisher import EventPublisher
+from core.pipeline.sentiment_worker import SentimentWorker
+from core.risk.risk_governor import RiskGovernor
+from core.storage.history_store import HistoryStore
+from core.utils.control_loader import control_store
+from core.utils.metrics import metrics
+
+LOG_FILE = "data/logs/bot.log"
+STATUS_FILE = Path("data/status.json")
+METRICS_FILE = Path("data/metrics.json")
+
+
+def setup_logger() -> None:
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    logger.add(LOG_FILE, level="DEBUG", rotation="5 MB", retention=5, encoding="utf-8")
+    logger.info("Logger initialized. Log file: {}", LOG_FILE)
+
+
+def write_status(data: Dict[str, Any]) -> None:
+    """
+    status.json buat dashboard. Ditulis ke file temp dulu lalu rename,
+    jadi dashboard nggak pernah baca file setengah jadi.
+    """
+    STATUS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATUS_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, STATUS_FILE)
+
+
+def _sync_deals(history: HistoryStore) -> None:
+    """
+    Tarik deal broker sejak deal terakhir yang sudah tercatat (buat P/L harian/mingguan).
+    """
+    since = history.last_deal_time() or int(time.time()) - 7 * 86400
+    # jam server broker bisa di depan UTC, batas atas dilebihkan sehari
+    deals = mt5.history_deals_get(since, int(time.time()) + 86400)
+    if deals:
+        history.add_deals(deals)
+
+
+def _stage(seconds: float, deadline: float) -> Dict[str, Any]:
+    return {"seconds": round(seconds, 4), "deadline": deadline, "late": seconds > deadline}
+
+
+def main() -> None:
+    setup_logger()
+    pairs = settings.symbol_list()
+    symbols = sorted({symbol for symbol, _ in pairs})
+    logger.info("Starting AI Trading Bot for symbol {}", ", ".join(f"{s}:{tf}m" for s, tf in pairs))
+
+    # satu proses ini yang pegang koneksi MT5; feeder pertama yang initialize
+    feeders = {(symbol, tf): MT5Feeder(symbol, tf) for symbol, tf in pairs}
+    first, *others = feeders.values()
+    if not first.initialize() or not all(f.select_symbol() for f in others):
+        logger.error("Gagal inisialisasi feeder. Keluar.")
+        return
+
+    # TechnicalBrain / ConditionBrain jalan di pool worker (bar lewat shared memory)
+    pool = AnalysisPool(settings.ANALYSIS_WORKERS, pairs)
+    orchestrator = Orchestrator()
+    # satu snapshot broker (account/positions/tick per cycle + spec symbol) buat risk & executor
+    broker = BrokerState(spec_ttl=settings.SYMBOL_SPEC_TTL_SECONDS)
+    risk_governor = RiskGovernor(broker)
+    executors = {symbol: MT5Executor(symbol, broker) for symbol in symbols}
+    # order dikirim thread terpisah (retry/requote nggak nahan loop)
+    order_queue = OrderQueue()
+    # signal / hasil order / deal dicatat append-only (SQLite) buat dashboard
+    history = HistoryStore()
+
+    # sentiment (RSS + LLM) jalan sendiri di background, loop trading nggak nunggu network
+    sentiment_brain = SentimentBrain()
+    sentiment_worker = SentimentWorker(
+        sentiment_brain.analyze_many,
+        symbols=symbols,
+        interval=settings.SENTIMENT_REFRESH_SECONDS,
+        deadline=settings.SENTIMENT_DEADLINE_SECONDS,
+    )
+    sentiment_worker.start()
+
+    # push ke dashboard (SSE), jalan di thread sendiri
+    publisher = None
+    if settings.DASHBOARD_EVENTS_URL:
+        publisher = EventPublisher(settings.DASHBOARD_EVENTS_URL, settings.DASHBOARD_EVENTS_TOKEN)
+        publisher.start()
+
+    logger.info("Loop dimulai. DRY_RUN={}, TIMEFRAME={}m", settings.DRY_RUN, settings.TIMEFRAME_MINUTES)
+
+    def record_trade(request: OrderRequest, future: Future) -> None:
+        # jalan di thread OrderQueue waktu order selesai
+        if future.exception() is not None:
+            return
+        try:
+            history.add_trade(request, future.result())
+        except Exception as e:
+            logger.warning("Gagal catat trade {} ke history: {}", request.client_id, e)
+
+    # timeframe konfirmasi (HIGHER_TIMEFRAMES), dibangun dari M1 di feeder
+    higher_tfs = settings.higher_timeframes()
+    if higher_tfs:
+        logger.info("Konfirmasi multi-timeframe: {} (dari stream M1)", ", ".join(f"{tf}m" for tf in higher_tfs))
+
+    # hasil terakhir per pair, supaya status.json tetap lengkap walau cuma sebagian pair yang close
+    latest: Dict[str, Dict[str, Any]] = {}
+    # bar terakhir yang signal-nya sudah dicatat per pair (re-analisa intrabar nggak dicatat ulang)
+    signaled_bar: Dict[Key, int] = {}
+
+    def run_cycle(keys: List[Key], trigger: str) -> None:
+        logger.info("=== LOOP MULAI: {} ({}) ===", datetime.now(), trigger)
+        t_cycle = time.monotonic()
+        broker.begin_cycle()
+
+        # --- STAGE 1: market data (pair yang dipicu) ---
+        t0 = time.monotonic()
+        jobs = {}
+        higher = {}
+        for key in keys:
+            tf = key[1]
+            with metrics.timer("feed"):
+                if higher_tfs:
+                    # satu stream M1, TF utama + TF konfirmasi hasil resample
+                    frames = feeders[key].get_rates_multi([tf, *higher_tfs], bars=500) or {}
+                    rates = frames.get(tf)
+                else:
+                    rates = feeders[key].get_rates(bars=500)
+            if rates is None or len(rates) < settings.MIN_BARS_REQUIRED:
+                logger.warning("Data bar {} belum cukup ({}), skip.", key, 0 if rates is None else len(rates))
+                continue
+            jobs[key] = rates
+            if higher_tfs:
+                # TF tinggi yang bar-nya belum cukup buat EMA lambat nggak dipakai
+                higher[key] = {h: frames[h] for h in higher_tfs if h > tf and len(frames[h]) >= 50}
+        market_sec = time.monotonic() - t0
+
+        # --- STAGE 2: analisa (cuma indikator, tanpa network) ---
+        t0 = time.monotonic()
+        analyses = pool.analyze(jobs, higher)
+        analysis_sec = time.monotonic() - t0
+
+        # --- sentiment: ambil yang terakhir dipublish worker (non-blocking) ---
+        snapshot = sentiment_worker.latest()
+        # satu snapshot control per cycle, dipakai semua symbol
+        control = control_store.get()
+
+        for (symbol, tf), analysis in analyses.items():
+            if analysis is None:
+                metrics.observe("analysis", analysis_sec, error=True)
+                continue
+            for stage, seconds in analysis.get("timing", {}).items():
+                metrics.observe(stage, seconds)
+            technical = analysis["technical"]
+            condition = analysis["condition"]
+            sentiment = snapshot.for_symbol(symbol, settings.SENTIMENT_MAX_AGE_SECONDS)
+
+            timing = {
+                "stages": {
+                    "market": _stage(market_sec, settings.MARKET_STAGE_DEADLINE_SECONDS),
+                    "analysis": _stage(analysis_sec, settings.ANALYSIS_STAGE_DEADLINE_SECONDS),
+                },
+                "sentiment_age": sentiment["age_seconds"],
+                "sentiment_max_age": settings.SENTIMENT_MAX_AGE_SECONDS,
+            }
+
+            decision = orchestrator.decide(technical, sentiment, condition, timing, control)
+
+            action = decision["action"]
+            lot = decision["lot"]
+            reason = decision["reason"]
+
+            # --- risk check (SL estimasi = 2x range rata-rata bar) ---
+            if action in ("BUY", "SELL"):
+                sl_points = risk_governor.sl_points_from_distance(
+                    symbol, condition.get("info", {}).get("avg_range", 0.0) * 2
+                )
+                with metrics.timer("risk"):
+                    risk = risk_governor.evaluate(symbol, sl_points, daily_pl_pct=None)
+                if not risk.allowed:
+                    action, lot, reason = "HOLD", 0, f"risk_{risk.reason}"
+                else:
+                    lot = min(lot, risk.lot)
+                decision.update(action=action, lot=lot, reason=reason)
+
+            logger.info(f"DECISION {symbol} {tf}m: {action} | lot={lot} | reason={reason}")
+
+            if action in ("BUY", "SELL"):
+                # client_id per bar: keputusan yang sama di bar yang sama nggak dikirim dua kali
+                bar_time = int(jobs[(symbol, tf)]["time"][-1])
+                client_id = make_client_id(symbol, tf, bar_time, action)
+                if signaled_bar.get((symbol, tf)) != bar_time:
+                    signaled_bar[(symbol, tf)] = bar_time
+                    history.add_signal(symbol, action, lot, reason, tf, control["trading_enabled"], client_id)
+
+            if not control["trading_enabled"]:
+                logger.info("Trading disabled from dashboard → HOLD")
+            elif action in ("BUY", "SELL"):
+                logger.info("Eksekusi {}: lot={}, reason={}", action, lot, reason)
+                request = OrderRequest(symbol, action, lot, reason=reason, client_id=client_id)
+                future = order_queue.submit(executors[symbol], request)
+                future.add_done_callback(partial(record_trade, request))
+            else:
+                logger.info("HOLD: reason={}", reason)
+
+            latest[f"{symbol}:{tf}"] = {
+                "symbol": symbol,
+                "timeframe_minutes": tf,
+                "trigger": trigger,
+                "technical": technical,
+                "sentiment": sentiment,
+                "condition": condition,
+                "decision": decision,
+            }
+            if publisher is not None:
+                publisher.publish(
+                    "decision",
+                    {
+                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "symbol": symbol,
+                        "timeframe_minutes": tf,
+                        "bar_time": int(jobs[(symbol, tf)]["time"][-1]),
+                        "trigger": trigger,
+                        **decision,
+                    },
+                )
+
+        if latest:
+            # field top-level = pair pertama (format lama dashboard), sisanya di "symbols"
+            primary = latest.get(f"{pairs[0][0]}:{pairs[0][1]}") or next(iter(latest.values()))
+            status = {
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                **primary,
+                "mode": orchestrator.mode,
+                "dry_run": settings.DRY_RUN,
+                "timing": {
+                    "market_seconds": round(market_sec, 4),
+                    "analysis_seconds": round(analysis_sec, 4),
+                    "cycle_seconds": round(time.monotonic() - t_cycle, 4),
+                    "sentiment_age": snapshot.age() if snapshot.updated_at else None,
+                },
+                "execution": order_queue.stats(),
+                "symbols": latest,
+            }
+            write_status(status)
+            if publisher is not None:
+                publisher.publish_status(status)
+
+        try:
+            _sync_deals(history)
+        except Exception as e:
+            logger.warning("Gagal sync deal ke history: {}", e)
+
+        metrics.observe("cycle", time.monotonic() - t_cycle)
+        try:
+            metrics.dump(METRICS_FILE)
+        except OSError as e:
+            logger.warning("Gagal tulis {}: {}", METRICS_FILE, e)
+        if publisher is not None:
+            publisher.publish("metrics", metrics.snapshot())
+        logger.info("=== LOOP SELESAI ===")
+
+    scheduler = None
+    try:
+        # cycle awal buat semua pair, supaya status langsung ada tanpa nunggu bar close
+        run_cycle(list(feeders), "startup")
+
+        if settings.TICK_POLL_SECONDS <= 0:
+            while True:
+                time.sleep(settings.LOOP_SLEEP_SECONDS)
+                run_cycle(list(feeders), "timer")
+
+        scheduler = BarCloseScheduler(pairs, settings.TICK_POLL_SECONDS, settings.INTRABAR_SECONDS)
+        for events in scheduler.wait():
+            for event in events:
+                logger.debug(
+                    "Bar {} {} {}m @{} (lag {:.2f}s)",
+                    event.kind,
+                    event.symbol,
+                    event.tf_minutes,
+                    event.bar_time,
+                    time.time() - event.detected_at,
+                )
+            # satu cycle per batch; pair yang close & intrabar bareng dianalisa sekali
+            keys = list(dict.fromkeys(event.key for event in events))
+            trigger = "close" if any(event.kind == "close" for event in events) else "intrabar"
+            run_cycle(keys, trigger)
+
+    except KeyboardInterrupt:
+        logger.info("Bot dihentikan oleh user (CTRL+C).")
+    finally:
+        if scheduler is not None:
+            scheduler.stop()
+        sentiment_worker.stop()
+        order_queue.stop()
+        if publisher is not None:
+            publisher.stop()
+        pool.close()
+        mt5.shutdown()
+        logger.info("MT5 shutdown, bot selesai.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Pilih backend MT5: terminal asli (package MetaTrader5, cuma Windows) atau
+simulator in-process (core/sim/mt5_sim.py). Diatur lewat MT5_BACKEND.
+
+Pemakaian: `from core.mt5_backend import mt5` (ganti `import MetaTrader5 as mt5`).
+"""
+from config.settings import settings
+
+if settings.MT5_BACKEND == "sim":
+    from core.sim import mt5_sim as mt5
+else:
+    import MetaTrader5 as mt5
+
+__all__ = ["mt5"]
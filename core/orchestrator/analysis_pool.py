@@ -0,0 +1,180 @@
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.settings import settings
+
+Key = Tuple[str, int]  # (symbol, timeframe menit)
+
+
+# ==========================================================
+# SISI WORKER (jalan di proses analisa)
+# ==========================================================
+_BRAINS: Dict[Key, Any] = {}
+_HIGHER_BRAINS: Dict[Tuple[Key, int], Any] = {}
+# blok shared memory yang sudah di-attach, per slot (key / (key, tf))
+_ATTACHED: Dict[Any, shared_memory.SharedMemory] = {}
+
+
+def _brains_for(key: Key):
+    if key not in _BRAINS:
+        from core.brains.condition_brain import ConditionBrain
+        from core.brains.technical_brain import TechnicalBrain
+
+        _BRAINS[key] = (TechnicalBrain(), ConditionBrain())
+    return _BRAINS[key]
+
+
+def _higher_brain(key: Key, tf: int):
+    # TechnicalBrain terpisah per TF tinggi (state IndicatorEngine sendiri)
+    if (key, tf) not in _HIGHER_BRAINS:
+        from core.brains.technical_brain import TechnicalBrain
+
+        _HIGHER_BRAINS[(key, tf)] = TechnicalBrain()
+    return _HIGHER_BRAINS[(key, tf)]
+
+
+def _attach(slot: Any, name: str) -> shared_memory.SharedMemory:
+    shm = _ATTACHED.get(slot)
+    if shm is not None and shm.name == name:
+        return shm
+    if shm is not None:
+        # blok slot ini dialokasi ulang di proses utama -> lepas handle lama
+        try:
+            shm.close()
+        except BufferError:
+            # masih ada view numpy yang hidup; ditutup GC nanti
+            pass
+    shm = _ATTACHED[slot] = shared_memory.SharedMemory(name=name)
+    return shm
+
+
+def analyze_rates(key: Key, rates: np.ndarray, higher: Optional[Dict[int, np.ndarray]] = None) -> Dict[str, Any]:
+    """
+    Jalankan TechnicalBrain + ConditionBrain untuk satu symbol/timeframe.
+    State indikator streaming disimpan per key di proses ini.
+    `higher` = {tf menit: bar} timeframe lebih tinggi buat konfirmasi arah.
+    """
+    from core.brains.technical_brain import confirm_with_higher
+
+    technical_brain, condition_brain = _brains_for(key)
+
+    t0 = time.perf_counter()
+    technical = technical_brain.analyze(rates)
+    if not isinstance(technical, dict):
+        technical = {"direction": "neutral", "confidence": 0.1}
+    if higher:
+        results = {}
+        for tf, tf_rates in higher.items():
+            res = _higher_brain(key, tf).analyze(tf_rates)
+            if isinstance(res, dict):
+                results[tf] = res
+        technical = confirm_with_higher(technical, results, settings.MTF_CONFLICT_FACTOR)
+    t1 = time.perf_counter()
+    condition = condition_brain.analyze(rates)
+    t2 = time.perf_counter()
+    # timing dibalikin ke proses utama (registry metrics worker nggak kelihatan dari sana)
+    return {"technical": technical, "condition": condition, "timing": {"technical": t1 - t0, "condition": t2 - t1}}
+
+
+def _analyze_shared(
+    key: Key, shm_name: str, n: int, descr: List, higher: Optional[Dict[int, Tuple[str, int]]] = None
+) -> Dict[str, Any]:
+    dtype = np.dtype(descr)
+    rates = np.ndarray((n,), dtype=dtype, buffer=_attach(key, shm_name).buf)
+    higher_rates = {
+        tf: np.ndarray((tf_n,), dtype=dtype, buffer=_attach((key, tf), tf_shm).buf)
+        for tf, (tf_shm, tf_n) in (higher or {}).items()
+    }
+    return analyze_rates(key, rates, higher_rates)
+
+
+# ==========================================================
+# SISI PROSES UTAMA (yang pegang MT5)
+# ==========================================================
+class AnalysisPool:
+    """
+    Fan-out analisa teknikal banyak symbol ke pool proses.
+    - Bar dikirim lewat shared memory (nggak ada pickling DataFrame)
+    - Tiap symbol selalu ke worker yang sama (shard), jadi state
+      IndicatorEngine per symbol tetap hidup di worker itu. Shard dibagi
+      round-robin sesuai urutan `keys` (symbol_list), jadi beban rata
+    - workers=0 -> analisa di proses utama (tanpa pool)
+    """
+
+    def __init__(self, workers: int, keys: Optional[List[Key]] = None) -> None:
+        self.workers = workers
+        self._shards = [ProcessPoolExecutor(max_workers=1) for _ in range(workers)]
+        # key -> index shard; key yang belum terdaftar dapat giliran berikutnya
+        self._assigned: Dict[Key, int] = {}
+        for key in keys or ():
+            self._shard_index(key)
+        # blok per key (+ per (key, tf) buat timeframe konfirmasi)
+        self._blocks: Dict[Any, shared_memory.SharedMemory] = {}
+        logger.info("AnalysisPool siap: {} worker", workers or "in-process")
+
+    def _shard_index(self, key: Key) -> int:
+        index = self._assigned.get(key)
+        if index is None:
+            index = self._assigned[key] = len(self._assigned) % max(1, len(self._shards))
+        return index
+
+    def _shard(self, key: Key) -> ProcessPoolExecutor:
+        return self._shards[self._shard_index(key)]
+
+    def _publish(self, key: Any, rates: np.ndarray) -> str:
+        """
+        Copy bar ke blok shared memory milik key ini (dialokasi ulang kalau kurang besar).
+        """
+        shm = self._blocks.get(key)
+        if shm is None or shm.size < rates.nbytes:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            shm = self._blocks[key] = shared_memory.SharedMemory(create=True, size=max(rates.nbytes * 2, 1))
+        np.ndarray(rates.shape, dtype=rates.dtype, buffer=shm.buf)[:] = rates
+        return shm.name
+
+    def analyze(
+        self,
+        jobs: Dict[Key, np.ndarray],
+        higher: Optional[Dict[Key, Dict[int, np.ndarray]]] = None,
+    ) -> Dict[Key, Optional[Dict[str, Any]]]:
+        """
+        jobs = {(symbol, tf): structured array bar}, higher = {(symbol, tf): {tf tinggi: bar}}
+        (opsional). Return hasil per key (None kalau worker error).
+        """
+        higher = higher or {}
+        if not self._shards:
+            return {key: analyze_rates(key, rates, higher.get(key)) for key, rates in jobs.items()}
+
+        futures: Dict[Key, Future] = {}
+        for key, rates in jobs.items():
+            name = self._publish(key, rates)
+            higher_meta = {
+                tf: (self._publish((key, tf), tf_rates), len(tf_rates)) for tf, tf_rates in higher.get(key, {}).items()
+            }
+            futures[key] = self._shard(key).submit(
+                _analyze_shared, key, name, len(rates), rates.dtype.descr, higher_meta
+            )
+
+        results: Dict[Key, Optional[Dict[str, Any]]] = {}
+        for key, fut in futures.items():
+            try:
+                results[key] = fut.result()
+            except Exception as e:
+                logger.error("AnalysisPool: analisa {} gagal: {}", key, e)
+                results[key] = None
+        return results
+
+    def close(self) -> None:
+        for ex in self._shards:
+            ex.shutdown(wait=True, cancel_futures=True)
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
@@ -1,39 +1,62 @@
 from loguru import logger
 from core.utils.control_loader import load_control
 
+# threshold confidence teknikal & lot per mode (dipakai juga oleh backtest)
+MODE_PARAMS = {
+    "SAFE": {"conf_threshold": 0.40, "lot": 0.01},
+    "BALANCED": {"conf_threshold": 0.30, "lot": 0.02},
+    "AGGRESSIVE": {"conf_threshold": 0.20, "lot": 0.04},
+    "SCALPING_M5": {"conf_threshold": 0.15, "lot": 0.03},
+}
+
+
 class Orchestrator:
     def __init__(self):
         self.mode = "SAFE"
         self.conf_threshold = 0.35
         self.lot_size = 0.01
+        self._mode_loaded = False
 
-    def update_mode(self):
-        control = load_control()
-        self.mode = control["mode"].upper()
-
-        if self.mode == "SAFE":
-            self.conf_threshold = 0.40
-            self.lot_size = 0.01
+    def update_mode(self, control=None):
+        control = control or load_control()
+        mode = control["mode"].upper()
+        if mode == self.mode and self._mode_loaded:
+            return
+        self.mode = mode
+        self._mode_loaded = True
 
-        elif self.mode == "BALANCED":
-            self.conf_threshold = 0.30
-            self.lot_size = 0.02
+        params = MODE_PARAMS.get(self.mode)
+        if params:
+            self.conf_threshold = params["conf_threshold"]
+            self.lot_size = params["lot"]
 
-        elif self.mode == "AGGRESSIVE":
-            self.conf_threshold = 0.20
-            self.lot_size = 0.04
+        logger.info(f"MODE UPDATED: {self.mode}, threshold={self.conf_threshold}, lot={self.lot_size}")
 
-        elif self.mode == "SCALPING_M5":
-            self.conf_threshold = 0.15
-            self.lot_size = 0.03
+    def decide(self, technical, sentiment, condition, timing=None, control=None):
+        """
+        control (opsional): snapshot control.json satu cycle dari main loop.
+        Kalau None, diambil sekali dari control store (cache).
 
-        logger.info(f"MODE UPDATED: {self.mode}, threshold={self.conf_threshold}, lot={self.lot_size}")
+        timing (opsional, dari pipeline main loop):
+        {
+          "stages": {"market": {"seconds": float, "deadline": float, "late": bool}, ...},
+          "sentiment_age": float | None,
+          "sentiment_max_age": float,
+        }
+        """
+        control = control or load_control()
+        decision = self._decide(technical, sentiment, condition, timing or {}, control)
+        if timing:
+            decision["sentiment_stale"] = bool(sentiment.get("stale", False))
+            decision["late_stages"] = [
+                name for name, info in timing.get("stages", {}).items() if info.get("late")
+            ]
+        return decision
 
-    def decide(self, technical, sentiment, condition):
-        self.update_mode()  # refresh mode tiap loop
+    def _decide(self, technical, sentiment, condition, timing, control):
+        self.update_mode(control)  # refresh mode tiap loop
 
         # trading disabled →
-        control = load_control()
         if not control["trading_enabled"]:
             return {
                 "action": "HOLD",
@@ -41,6 +64,22 @@ class Orchestrator:
                 "lot": 0
             }
 
+        # stage data market / analisa lewat deadline → harga udah basi, jangan entry
+        late = [name for name, info in timing.get("stages", {}).items() if info.get("late")]
+        if late:
+            logger.warning(f"Orchestrator: HOLD, stage lewat deadline: {late}")
+            return {
+                "action": "HOLD",
+                "reason": "stage_deadline_exceeded",
+                "lot": 0
+            }
+
+        if sentiment.get("stale"):
+            logger.debug(
+                f"Orchestrator: sentiment basi (umur={timing.get('sentiment_age')}s, "
+                f"max={timing.get('sentiment_max_age')}s), diabaikan"
+            )
+
         # check technical confidence
         if technical["confidence"] < self.conf_threshold:
             return {
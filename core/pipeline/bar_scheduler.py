@@ -0,0 +1,112 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from loguru import logger
+
+from core.mt5_backend import mt5
+
+Key = Tuple[str, int]  # (symbol, timeframe menit)
+
+
+@dataclass(frozen=True)
+class BarEvent:
+    symbol: str
+    tf_minutes: int
+    kind: str  # "close" = bar barusan close, "intrabar" = hook periodik di tengah bar
+    bar_time: int  # open time (epoch server) bar yang close / bar yang lagi jalan
+    tick_time: float  # waktu tick (server) yang memicu event
+    detected_at: float  # time.time() lokal saat event terdeteksi
+
+    @property
+    def key(self) -> Key:
+        return (self.symbol, self.tf_minutes)
+
+
+class BarCloseScheduler:
+    """
+    Ganti sleep fix LOOP_SLEEP_SECONDS: poll `symbol_info_tick` tiap
+    `poll_interval` detik dan deteksi pergantian bar untuk tiap (symbol, timeframe).
+
+    - Bar dianggap close saat tick pertama bar berikutnya datang (sama seperti
+      MT5 bikin bar), jadi event "close" keluar tepat sekali per bar
+    - `intrabar_seconds` > 0 -> tambahan event "intrabar" tiap N detik selama
+      bar masih jalan (cuma kalau ada tick baru)
+    - Waktu pakai jam server dari tick, jadi nggak kena beda timezone broker
+    """
+
+    def __init__(
+        self,
+        pairs: List[Key],
+        poll_interval: float = 0.25,
+        intrabar_seconds: float = 0.0,
+    ) -> None:
+        self.pairs = list(pairs)
+        self.symbols = sorted({symbol for symbol, _ in self.pairs})
+        self.poll_interval = poll_interval
+        self.intrabar_seconds = intrabar_seconds
+        self._bar_open: Dict[Key, int] = {}
+        self._intrabar_at: Dict[Key, float] = {}
+        self._last_tick: Dict[str, float] = {}
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _tick_time(tick) -> float:
+        msc = getattr(tick, "time_msc", 0)
+        return msc / 1000.0 if msc else float(tick.time)
+
+    def poll(self) -> List[BarEvent]:
+        """
+        Satu putaran cek tick semua symbol. Return event yang terjadi (bisa kosong).
+        """
+        events: List[BarEvent] = []
+        now = time.time()
+        for symbol in self.symbols:
+            tick = mt5.symbol_info_tick(symbol)
+            if not tick:
+                continue
+            tick_time = self._tick_time(tick)
+            if tick_time <= self._last_tick.get(symbol, 0.0):
+                continue  # belum ada tick baru
+            self._last_tick[symbol] = tick_time
+
+            for key in self.pairs:
+                if key[0] != symbol:
+                    continue
+                period = key[1] * 60
+                bar_open = int(tick_time // period) * period
+                prev = self._bar_open.get(key)
+                self._bar_open[key] = bar_open
+
+                if prev is None:
+                    # tick pertama setelah start: cuma catat bar yang lagi jalan
+                    self._intrabar_at[key] = tick_time
+                elif bar_open > prev:
+                    events.append(BarEvent(symbol, key[1], "close", prev, tick_time, now))
+                    self._intrabar_at[key] = tick_time
+                elif self.intrabar_seconds > 0 and tick_time - self._intrabar_at[key] >= self.intrabar_seconds:
+                    events.append(BarEvent(symbol, key[1], "intrabar", bar_open, tick_time, now))
+                    self._intrabar_at[key] = tick_time
+        return events
+
+    def wait(self) -> Iterator[List[BarEvent]]:
+        """
+        Blocking generator: yield batch event tiap kali ada bar close / intrabar.
+        Berhenti setelah `stop()`.
+        """
+        logger.info(
+            "BarCloseScheduler jalan: {} pair, poll={}s, intrabar={}",
+            len(self.pairs),
+            self.poll_interval,
+            f"{self.intrabar_seconds}s" if self.intrabar_seconds > 0 else "off",
+        )
+        while not self._stop_event.is_set():
+            t0 = time.monotonic()
+            events = self.poll()
+            if events:
+                yield events
+            self._stop_event.wait(max(0.0, self.poll_interval - (time.monotonic() - t0)))
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,100 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from loguru import logger
+
+
+class EventPublisher(threading.Thread):
+    """
+    Kirim event bot (status delta / decision / metrics) ke dashboard
+    (POST /api/events/publish, lihat dashboard/events.py).
+    - `publish()` non-blocking: cuma masuk queue, loop trading nggak nunggu HTTP
+    - event yang numpuk dikirim sekali POST (batch)
+    - dashboard mati -> event dibuang, coba lagi setelah `retry_after` detik
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        timeout: float = 1.0,
+        max_queue: int = 1000,
+        retry_after: float = 5.0,
+    ) -> None:
+        super().__init__(name="event-publisher", daemon=True)
+        self.url = url
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._session = requests.Session()
+        if token:
+            self._session.headers["X-Events-Token"] = token
+        self._last_status: Dict[str, Any] = {}
+        self._down_until = 0.0
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, event: str, data: Any) -> None:
+        try:
+            self._queue.put_nowait({"event": event, "data": data})
+        except queue.Full:
+            self.dropped += 1
+
+    def publish_status(self, status: Dict[str, Any]) -> None:
+        """
+        Cuma key top-level yang berubah sejak publish terakhir (dashboard merge sendiri).
+        """
+        # copy lewat JSON: dict status di-mutate loop, dan yang dibandingkan harus nilai saat ini
+        status = json.loads(json.dumps(status, default=str))
+        delta = {k: v for k, v in status.items() if self._last_status.get(k) != v}
+        self._last_status = status
+        if delta:
+            self.publish("status", delta)
+
+    def _drain(self, first: Dict[str, Any]) -> List[Dict[str, Any]]:
+        batch = [first]
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is None:
+                self._queue.put_nowait(None)  # sinyal stop, diproses di loop berikutnya
+                return batch
+            batch.append(item)
+
+    def run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = self._drain(item)
+            if time.monotonic() < self._down_until:
+                self.dropped += len(batch)
+                continue
+            try:
+                resp = self._session.post(
+                    self.url,
+                    data=json.dumps({"events": batch}, default=str),
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                self.sent += len(batch)
+            except requests.RequestException as e:
+                self.dropped += len(batch)
+                self._down_until = time.monotonic() + self.retry_after
+                # status lengkap dikirim ulang begitu dashboard hidup lagi
+                self._last_status = {}
+                logger.debug("EventPublisher: dashboard nggak bisa dihubungi ({}): {}", self.url, e)
+
+    def stop(self) -> None:
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self.join(timeout=self.timeout + 1)
@@ -0,0 +1,106 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from core.utils.metrics import metrics
+
+
+NEUTRAL = {"sentiment": "neutral", "confidence": 0.1, "reason": "no_sentiment_yet"}
+
+
+@dataclass(frozen=True)
+class SentimentSnapshot:
+    """
+    Hasil refresh sentiment terakhir (immutable, aman dibaca thread lain).
+    """
+
+    data: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    updated_at: float = 0.0  # time.time() refresh sukses terakhir, 0 = belum pernah
+    latency: float = 0.0
+    error: Optional[str] = None
+
+    def age(self, now: Optional[float] = None) -> float:
+        if not self.updated_at:
+            return float("inf")
+        return (now or time.time()) - self.updated_at
+
+    def for_symbol(self, symbol: str, max_age: float) -> Dict[str, Any]:
+        """
+        Sentiment satu symbol + info umur. Kalau lebih tua dari `max_age`,
+        `stale=True` dan isinya netral.
+        """
+        age = self.age()
+        stale = age > max_age or symbol not in self.data
+        result = dict(NEUTRAL) if stale else dict(self.data[symbol])
+        if stale and symbol in self.data:
+            result["reason"] = "stale_sentiment"
+        result["age_seconds"] = None if age == float("inf") else round(age, 1)
+        result["stale"] = stale
+        return result
+
+
+class SentimentWorker(threading.Thread):
+    """
+    Refresh sentiment (RSS + LLM) di background dengan jadwal sendiri.
+    Loop trading cukup baca `latest()` tanpa nunggu network.
+    `deadline` diteruskan ke `analyze(symbols, deadline)`, yang memotong fetch berita
+    dan budget LLM supaya satu refresh selesai dalam batas itu.
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[List[str], float], Dict[str, Dict[str, Any]]],
+        symbols: List[str],
+        interval: float,
+        deadline: float,
+    ) -> None:
+        super().__init__(name="sentiment-worker", daemon=True)
+        self._analyze = analyze
+        self.symbols = symbols
+        self.interval = interval
+        self.deadline = deadline
+        self._snapshot = SentimentSnapshot()
+        self._stop_event = threading.Event()
+
+    def latest(self) -> SentimentSnapshot:
+        # assignment reference atomic di Python, nggak perlu lock buat baca
+        return self._snapshot
+
+    def refresh(self) -> SentimentSnapshot:
+        t0 = time.monotonic()
+        try:
+            data = self._analyze(self.symbols, self.deadline)
+            latency = time.monotonic() - t0
+            self._snapshot = SentimentSnapshot(data=data, updated_at=time.time(), latency=latency)
+        except Exception as e:
+            latency = time.monotonic() - t0
+            logger.error("SentimentWorker: refresh gagal: {}", e)
+            prev = self._snapshot
+            self._snapshot = SentimentSnapshot(prev.data, prev.updated_at, latency, str(e))
+
+        metrics.observe("sentiment", latency, error=self._snapshot.error is not None)
+        if latency > self.deadline:
+            logger.warning(
+                "SentimentWorker: refresh {:.1f}s lewat deadline {:.1f}s", latency, self.deadline
+            )
+        else:
+            logger.debug("SentimentWorker: refresh {:.2f}s", latency)
+        return self._snapshot
+
+    def run(self) -> None:
+        logger.info(
+            "SentimentWorker jalan: symbols={}, interval={}s, deadline={}s",
+            self.symbols,
+            self.interval,
+            self.deadline,
+        )
+        while not self._stop_event.is_set():
+            t0 = time.monotonic()
+            self.refresh()
+            self._stop_event.wait(max(0.0, self.interval - (time.monotonic() - t0)))
+
+    def stop(self) -> None:
+        self._stop_event.set()
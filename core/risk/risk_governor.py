@@ -1,10 +1,10 @@
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 
-import MetaTrader5 as mt5
 from loguru import logger
 
 from config.settings import settings
+from core.feeder.broker_state import BrokerState
 
 
 @dataclass
@@ -21,16 +21,15 @@ class RiskGovernor:
     - blokir trade kalau risk terlalu tinggi
     """
 
-    def __init__(self) -> None:
+    def __init__(self, broker: Optional[BrokerState] = None) -> None:
+        # snapshot broker dipakai bareng MT5Executor (account/positions/spec nggak di-fetch ulang)
+        self.broker = broker or BrokerState(spec_ttl=settings.SYMBOL_SPEC_TTL_SECONDS)
         self.risk_pct = settings.RISK_PER_TRADE_PCT
         self.max_daily_dd_pct = settings.MAX_DAILY_DRAWDOWN_PCT
         self.max_open_trades = settings.MAX_OPEN_TRADES
 
     def _count_open_trades(self, symbol: str) -> int:
-        positions = mt5.positions_get(symbol=symbol)
-        if positions is None:
-            return 0
-        return len(positions)
+        return len(self.broker.positions(symbol))
 
     def _calc_lot_from_risk(
         self,
@@ -47,25 +46,34 @@ class RiskGovernor:
         if sl_pips <= 0:
             return 0.0
 
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
+        spec = self.broker.spec(symbol)
+        if not spec:
             logger.error("RiskGovernor: gagal ambil symbol_info.")
             return 0.0
 
         # Asumsi kasar: tick_value = contract_size * tick_size
-        tick_value = symbol_info.trade_contract_size * symbol_info.point
+        tick_value = spec.contract_size * spec.point
         risk_dollar = equity * (self.risk_pct / 100.0)
         lot = risk_dollar / (sl_pips * tick_value)
-        lot = max(symbol_info.volume_min, min(lot, symbol_info.volume_max))
+        lot = max(spec.volume_min, min(lot, spec.volume_max))
         return float(lot)
 
+    def sl_points_from_distance(self, symbol: str, distance: float) -> float:
+        """
+        Konversi jarak harga (mis. range rata-rata bar) ke points buat `evaluate`.
+        """
+        spec = self.broker.spec(symbol)
+        if not spec or not spec.point:
+            return 0.0
+        return distance / spec.point
+
     def evaluate(
         self,
         symbol: str,
         sl_pips: float,
         daily_pl_pct: Optional[float],
     ) -> RiskDecision:
-        account = mt5.account_info()
+        account = self.broker.account()
         if not account:
             logger.error("RiskGovernor: gagal ambil account_info.")
             return RiskDecision(False, 0.0, "no_account")
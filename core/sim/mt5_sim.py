@@ -0,0 +1,716 @@
+"""
+Simulator MetaTrader5 in-process (drop-in buat `import MetaTrader5 as mt5`).
+
+Dipakai lewat MT5_BACKEND=sim (lihat core/mt5_backend.py), jadi bot bisa
+jalan / di-benchmark di Linux tanpa terminal MT5.
+
+- Data dasar M1 per symbol: synthetic (random walk, seed tetap) atau
+  rekaman BarStore (data/bars/SYM/M1)
+- Jam simulasi bisa dipercepat (SIM_SPEED = detik sim per detik asli),
+  SIM_SPEED=0 -> jam manual, maju cuma lewat `advance()`
+- order_send: latency, spread, requote acak, cek deviation, volume,
+  fill mode, SL/TP dicek tiap bar M1
+"""
+import math
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.settings import settings
+
+# ==========================================================
+# KONSTANTA (nilai sama dengan package MetaTrader5)
+# ==========================================================
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 1 | 0x4000
+TIMEFRAME_H4 = 4 | 0x4000
+TIMEFRAME_D1 = 24 | 0x4000
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+ORDER_TIME_GTC = 0
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_MARKET_CLOSED = 10018
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_PRICE_CHANGED = 10020
+TRADE_RETCODE_PRICE_OFF = 10021
+TRADE_RETCODE_INVALID_FILL = 10030
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_NOT_FOUND = -4
+
+RATES_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("tick_volume", "<u8"),
+        ("spread", "<i4"),
+        ("real_volume", "<u8"),
+    ]
+)
+
+_TF_MINUTES = {
+    TIMEFRAME_M1: 1,
+    TIMEFRAME_M5: 5,
+    TIMEFRAME_M15: 15,
+    TIMEFRAME_M30: 30,
+    TIMEFRAME_H1: 60,
+    TIMEFRAME_H4: 240,
+    TIMEFRAME_D1: 1440,
+}
+
+SymbolInfo = namedtuple(
+    "SymbolInfo",
+    "name point digits trade_contract_size volume_min volume_max volume_step filling_mode spread bid ask",
+)
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+AccountInfo = namedtuple(
+    "AccountInfo", "login balance equity profit margin margin_free currency leverage server"
+)
+TradePosition = namedtuple(
+    "TradePosition",
+    "ticket time time_msc type magic identifier volume price_open sl tp price_current profit symbol comment",
+)
+TradeDeal = namedtuple(
+    "TradeDeal",
+    "ticket order time time_msc type entry magic position_id volume price profit symbol comment",
+)
+OrderSendResult = namedtuple(
+    "OrderSendResult", "retcode deal order volume price bid ask comment request_id request"
+)
+
+
+# ==========================================================
+# DATA & JAM
+# ==========================================================
+class SimClock:
+    """
+    now() = start + waktu asli sejak start * speed (+ offset dari advance()).
+    speed=0 -> jam berhenti, maju cuma lewat advance().
+    """
+
+    def __init__(self, start: float, speed: float) -> None:
+        self.start = start
+        self.speed = speed
+        self._t0 = time.monotonic()
+        self._offset = 0.0
+
+    def now(self) -> float:
+        return self.start + (time.monotonic() - self._t0) * self.speed + self._offset
+
+    def advance(self, seconds: float) -> None:
+        self._offset += seconds
+
+
+class SymbolSeries:
+    """
+    Seri M1 satu symbol + cache agregasi per timeframe.
+    """
+
+    def __init__(self, name: str, m1: np.ndarray, point: float, digits: int, contract_size: float) -> None:
+        self.name = name
+        self.m1 = m1
+        self.point = point
+        self.digits = digits
+        self.contract_size = contract_size
+        self._agg: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def aggregated(self, minutes: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (bar timeframe `minutes` dari seluruh seri, index M1 awal tiap bar).
+        """
+        if minutes not in self._agg:
+            m1 = self.m1
+            period = minutes * 60
+            keys = m1["time"] // period
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+            ends = np.append(starts[1:], len(m1))
+            out = np.zeros(len(starts), dtype=RATES_DTYPE)
+            out["time"] = keys[starts] * period
+            out["open"] = m1["open"][starts]
+            out["high"] = np.maximum.reduceat(m1["high"], starts)
+            out["low"] = np.minimum.reduceat(m1["low"], starts)
+            out["close"] = m1["close"][ends - 1]
+            out["tick_volume"] = np.add.reduceat(m1["tick_volume"], starts)
+            out["spread"] = m1["spread"][starts]
+            self._agg[minutes] = (out, starts)
+        return self._agg[minutes]
+
+
+def _spec_for(symbol: str) -> Tuple[float, int, float, float]:
+    """
+    (point, digits, contract_size, harga awal) default per jenis symbol.
+    """
+    s = symbol.upper()
+    if s.startswith("XAU"):
+        return 0.01, 2, 100.0, 2000.0
+    if s.startswith("XAG"):
+        return 0.001, 3, 5000.0, 25.0
+    if s.endswith("JPY"):
+        return 0.001, 3, 100000.0, 150.0
+    return 0.00001, 5, 100000.0, 1.1
+
+
+def synthetic_m1(symbol: str, bars: int, start: int, seed: int, spread_points: int) -> np.ndarray:
+    """
+    Random walk log-normal M1 (vol ~0.03% per menit), deterministik per seed + symbol.
+    """
+    point, digits, _, price0 = _spec_for(symbol)
+    rng = np.random.default_rng([seed, sum(symbol.encode())])
+    rets = rng.normal(0.0, 0.0003, bars)
+    close = np.round(price0 * np.exp(np.cumsum(rets)), digits)
+    open_ = np.round(np.concatenate(([price0], close[:-1])), digits)
+    wick = np.abs(rng.normal(0.0, 0.00015, (2, bars))) * close
+    out = np.zeros(bars, dtype=RATES_DTYPE)
+    out["time"] = start + 60 * np.arange(bars, dtype=np.int64)
+    out["open"] = open_
+    out["close"] = close
+    out["high"] = np.round(np.maximum(open_, close) + wick[0], digits)
+    out["low"] = np.round(np.minimum(open_, close) - wick[1], digits)
+    out["tick_volume"] = rng.integers(20, 400, bars)
+    out["spread"] = spread_points
+    return out
+
+
+def _stored_m1(symbol: str) -> Optional[np.ndarray]:
+    from core.storage.bar_store import BarStore
+
+    store = BarStore(symbol, 1)
+    if len(store) == 0:
+        return None
+    cols = store.read()
+    out = np.zeros(len(cols["time"]), dtype=RATES_DTYPE)
+    for name in cols:
+        out[name] = cols[name]
+    return out
+
+
+def _to_epoch(value: Any) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+# ==========================================================
+# BROKER SIMULASI
+# ==========================================================
+class SimBroker:
+    def __init__(
+        self,
+        data_source: str = "synthetic",
+        speed: float = 1.0,
+        latency_ms: float = 0.0,
+        spread_points: int = 20,
+        requote_prob: float = 0.0,
+        filling_mode: int = SYMBOL_FILLING_FOK | SYMBOL_FILLING_IOC,
+        balance: float = 10000.0,
+        leverage: int = 100,
+        history_bars: int = 50_000,
+        future_bars: int = 50_000,
+        seed: int = 42,
+    ) -> None:
+        self.data_source = data_source
+        self.latency = latency_ms / 1000.0
+        self.spread_points = spread_points
+        self.requote_prob = requote_prob
+        self.filling_mode = filling_mode
+        self.balance = balance
+        self.leverage = leverage
+        self.history_bars = history_bars
+        self.future_bars = future_bars
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        # jam mulai: kelipatan hari (UTC), seri synthetic mulai history_bars menit sebelumnya
+        self._start = int(time.time()) // 86400 * 86400
+        self.clock = SimClock(self._start, speed)
+        self._speed = speed
+        self._lock = threading.RLock()
+        self._series: Dict[str, SymbolSeries] = {}
+        self._positions: Dict[int, Dict[str, Any]] = {}
+        self._deals: List[TradeDeal] = []
+        self._ticket = 1000
+        self._checked_idx: Dict[str, int] = {}
+        self._last_error: Tuple[int, str] = (RES_S_OK, "Success")
+        self.connected = False
+
+    # ---------- data ----------
+    def series(self, symbol: str) -> SymbolSeries:
+        s = self._series.get(symbol)
+        if s is not None:
+            return s
+
+        point, digits, contract, _ = _spec_for(symbol)
+        m1 = _stored_m1(symbol) if self.data_source == "store" else None
+        if m1 is None:
+            if self.data_source == "store":
+                logger.warning("SimBroker: BarStore M1 {} kosong, pakai data synthetic.", symbol)
+            m1 = synthetic_m1(
+                symbol,
+                self.history_bars + self.future_bars,
+                self._start - self.history_bars * 60,
+                self.seed,
+                self.spread_points,
+            )
+        elif not self._series:
+            # replay rekaman: jam mulai setelah history_bars bar pertama
+            self._start = int(m1["time"][min(self.history_bars, len(m1) - 1)])
+            self.clock = SimClock(self._start, self._speed)
+
+        s = self._series[symbol] = SymbolSeries(symbol, m1, point, digits, contract)
+        self._checked_idx[symbol] = int(np.searchsorted(m1["time"], self.clock.now(), "right")) - 1
+        return s
+
+    def _cursor(self, s: SymbolSeries, now: float) -> Tuple[int, float]:
+        """
+        (index M1 yang lagi jalan, fraksi menit yang sudah lewat 0..1).
+        """
+        idx = int(np.searchsorted(s.m1["time"], now, "right")) - 1
+        idx = min(max(idx, 0), len(s.m1) - 1)
+        frac = min(max((now - s.m1["time"][idx]) / 60.0, 0.0), 1.0)
+        return idx, frac
+
+    def _price(self, s: SymbolSeries, idx: int, frac: float) -> float:
+        bar = s.m1[idx]
+        return round(float(bar["open"] + (bar["close"] - bar["open"]) * frac), s.digits)
+
+    def _quote(self, symbol: str) -> Tuple[float, float, float, SymbolSeries]:
+        """
+        (bid, ask, waktu tick, seri) sesuai jam simulasi sekarang.
+        """
+        s = self.series(symbol)
+        now = self.clock.now()
+        idx, frac = self._cursor(s, now)
+        bid = self._price(s, idx, frac)
+        ask = round(bid + int(s.m1["spread"][idx]) * s.point, s.digits)
+        tick_time = min(now, float(s.m1["time"][idx]) + 59.999)
+        self._check_stops(s, idx)
+        return bid, ask, tick_time, s
+
+    def rates(self, symbol: str, minutes: int, tail: Optional[int] = None) -> np.ndarray:
+        """
+        Bar timeframe `minutes` sampai bar yang lagi jalan (bar terakhir parsial).
+        tail=N -> cuma N bar terakhir yang di-copy.
+        """
+        s = self.series(symbol)
+        idx, frac = self._cursor(s, self.clock.now())
+        agg, starts = s.aggregated(minutes)
+        j = int(np.searchsorted(starts, idx, "right")) - 1
+        out = agg[max(0, j + 1 - tail) if tail else 0 : j + 1].copy()
+        if len(out) == 0:
+            return out
+
+        # bar terakhir: gabungan M1 closed di bar ini + menit yang lagi jalan
+        closed = s.m1[starts[j] : idx]
+        cur = s.m1[idx]
+        price = self._price(s, idx, frac)
+        if frac < 1.0:
+            cur_high, cur_low = max(cur["open"], price), min(cur["open"], price)
+        else:
+            cur_high, cur_low = cur["high"], cur["low"]
+        last = out[-1]
+        last["high"] = closed["high"].max(initial=cur_high)
+        last["low"] = closed["low"].min(initial=cur_low)
+        last["close"] = price
+        last["tick_volume"] = int(closed["tick_volume"].sum() + cur["tick_volume"] * frac)
+        return out
+
+    # ---------- posisi ----------
+    def _position_tuple(self, pos: Dict[str, Any], bid: float, ask: float) -> TradePosition:
+        price = bid if pos["type"] == POSITION_TYPE_BUY else ask
+        return TradePosition(
+            ticket=pos["ticket"],
+            time=pos["time"],
+            time_msc=pos["time"] * 1000,
+            type=pos["type"],
+            magic=pos["magic"],
+            identifier=pos["ticket"],
+            volume=pos["volume"],
+            price_open=pos["price_open"],
+            sl=pos["sl"],
+            tp=pos["tp"],
+            price_current=price,
+            profit=self._profit(pos, price),
+            symbol=pos["symbol"],
+            comment=pos["comment"],
+        )
+
+    def _profit(self, pos: Dict[str, Any], price: float) -> float:
+        s = self._series[pos["symbol"]]
+        sign = 1.0 if pos["type"] == POSITION_TYPE_BUY else -1.0
+        return round((price - pos["price_open"]) * sign * pos["volume"] * s.contract_size, 2)
+
+    def _close(self, pos: Dict[str, Any], price: float, when: int, comment: str) -> TradeDeal:
+        profit = self._profit(pos, price)
+        self.balance += profit
+        del self._positions[pos["ticket"]]
+        self._ticket += 1
+        deal = TradeDeal(
+            ticket=self._ticket,
+            order=self._ticket,
+            time=when,
+            time_msc=when * 1000,
+            type=DEAL_TYPE_SELL if pos["type"] == POSITION_TYPE_BUY else DEAL_TYPE_BUY,
+            entry=DEAL_ENTRY_OUT,
+            magic=pos["magic"],
+            position_id=pos["ticket"],
+            volume=pos["volume"],
+            price=price,
+            profit=profit,
+            symbol=pos["symbol"],
+            comment=comment,
+        )
+        self._deals.append(deal)
+        return deal
+
+    def _check_stops(self, s: SymbolSeries, idx: int) -> None:
+        """
+        Cek SL/TP posisi terbuka terhadap bar M1 yang sudah lewat sejak cek terakhir.
+        SL dicek duluan kalau SL & TP kena di bar yang sama (pesimis).
+        """
+        start = self._checked_idx.get(s.name, idx)
+        if idx <= start:
+            return
+        self._checked_idx[s.name] = idx
+        open_pos = [p for p in self._positions.values() if p["symbol"] == s.name and (p["sl"] or p["tp"])]
+        if not open_pos:
+            return
+        bars = s.m1[start:idx]
+        spread = bars["spread"] * s.point
+        no_hit = np.zeros(len(bars), dtype=bool)
+        for pos in open_pos:
+            if pos["type"] == POSITION_TYPE_BUY:
+                # posisi buy ditutup di bid
+                sl_hit = bars["low"] <= pos["sl"] if pos["sl"] else no_hit
+                tp_hit = bars["high"] >= pos["tp"] if pos["tp"] else no_hit
+            else:
+                # posisi sell ditutup di ask
+                sl_hit = bars["high"] + spread >= pos["sl"] if pos["sl"] else no_hit
+                tp_hit = bars["low"] + spread <= pos["tp"] if pos["tp"] else no_hit
+            hits = np.flatnonzero(sl_hit | tp_hit)
+            if len(hits):
+                k = hits[0]
+                price, tag = (pos["sl"], "sl") if sl_hit[k] else (pos["tp"], "tp")
+                self._close(pos, price, int(bars["time"][k]) + 59, f"[{tag} {price}]")
+
+    # ---------- order ----------
+    def _fail(self, retcode: int, comment: str, request: Dict[str, Any], bid: float = 0.0, ask: float = 0.0):
+        return OrderSendResult(retcode, 0, 0, 0.0, 0.0, bid, ask, comment, 0, request)
+
+    def order_send(self, request: Dict[str, Any]) -> Optional[OrderSendResult]:
+        if not self.connected:
+            self._last_error = (RES_E_FAIL, "Terminal not initialized")
+            return None
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            symbol = request.get("symbol", "")
+            if request.get("action") != TRADE_ACTION_DEAL or not symbol:
+                return self._fail(TRADE_RETCODE_INVALID, "Invalid request", request)
+
+            bid, ask, tick_time, s = self._quote(symbol)
+            idx, frac = self._cursor(s, self.clock.now())
+            if frac >= 1.0:
+                # nggak ada menit yang lagi jalan (gap data / seri habis)
+                return self._fail(TRADE_RETCODE_MARKET_CLOSED, "Market closed", request, bid, ask)
+
+            fill = request.get("type_filling", ORDER_FILLING_FOK)
+            allowed = {
+                ORDER_FILLING_FOK: self.filling_mode & SYMBOL_FILLING_FOK,
+                ORDER_FILLING_IOC: self.filling_mode & SYMBOL_FILLING_IOC,
+                ORDER_FILLING_RETURN: True,
+            }
+            if not allowed.get(fill):
+                return self._fail(TRADE_RETCODE_INVALID_FILL, "Unsupported filling mode", request, bid, ask)
+
+            volume = float(request.get("volume", 0.0))
+            steps = volume / 0.01
+            if volume < 0.01 or volume > 100.0 or abs(steps - round(steps)) > 1e-6:
+                return self._fail(TRADE_RETCODE_INVALID_VOLUME, "Invalid volume", request, bid, ask)
+
+            if self.requote_prob and self.rng.random() < self.requote_prob:
+                return self._fail(TRADE_RETCODE_REQUOTE, "Requote", request, bid, ask)
+
+            order_type = request.get("type")
+            closing = request.get("position")
+            market = ask if order_type == ORDER_TYPE_BUY else bid
+            wanted = request.get("price") or market
+            if abs(wanted - market) > int(request.get("deviation", 0)) * s.point + 1e-9:
+                return self._fail(TRADE_RETCODE_REQUOTE, "Requote", request, bid, ask)
+
+            now = int(tick_time)
+            self._ticket += 1
+            ticket = self._ticket
+
+            if closing:
+                pos = self._positions.get(int(closing))
+                if pos is None:
+                    return self._fail(TRADE_RETCODE_POSITION_CLOSED, "Position closed", request, bid, ask)
+                deal = self._close(pos, market, now, request.get("comment", ""))
+                return OrderSendResult(TRADE_RETCODE_DONE, deal.ticket, deal.order, volume, market, bid, ask, "Request executed", 0, request)
+
+            margin = self._margin_used() + volume * s.contract_size * market / self.leverage
+            if margin > self._equity():
+                return self._fail(TRADE_RETCODE_NO_MONEY, "No money", request, bid, ask)
+
+            self._positions[ticket] = {
+                "ticket": ticket,
+                "time": now,
+                "type": POSITION_TYPE_BUY if order_type == ORDER_TYPE_BUY else POSITION_TYPE_SELL,
+                "magic": int(request.get("magic", 0)),
+                "volume": volume,
+                "price_open": market,
+                "sl": float(request.get("sl") or 0.0),
+                "tp": float(request.get("tp") or 0.0),
+                "symbol": symbol,
+                "comment": str(request.get("comment", ""))[:31],
+            }
+            self._deals.append(
+                TradeDeal(ticket, ticket, now, now * 1000, order_type, DEAL_ENTRY_IN,
+                          int(request.get("magic", 0)), ticket, volume, market, 0.0, symbol,
+                          str(request.get("comment", ""))[:31])
+            )
+            return OrderSendResult(TRADE_RETCODE_DONE, ticket, ticket, volume, market, bid, ask, "Request executed", 0, request)
+
+    # ---------- akun ----------
+    def _margin_used(self) -> float:
+        total = 0.0
+        for pos in self._positions.values():
+            s = self._series[pos["symbol"]]
+            total += pos["volume"] * s.contract_size * pos["price_open"] / self.leverage
+        return total
+
+    def _floating(self) -> float:
+        total = 0.0
+        for symbol in {p["symbol"] for p in self._positions.values()}:
+            bid, ask, _, _ = self._quote(symbol)
+            for pos in [p for p in self._positions.values() if p["symbol"] == symbol]:
+                total += self._profit(pos, bid if pos["type"] == POSITION_TYPE_BUY else ask)
+        return total
+
+    def _equity(self) -> float:
+        return self.balance + self._floating()
+
+    def account_info(self) -> AccountInfo:
+        with self._lock:
+            profit = self._floating()
+            margin = self._margin_used()
+            equity = self.balance + profit
+            return AccountInfo(
+                login=int(settings.MT5_LOGIN or 0),
+                balance=round(self.balance, 2),
+                equity=round(equity, 2),
+                profit=round(profit, 2),
+                margin=round(margin, 2),
+                margin_free=round(equity - margin, 2),
+                currency=settings.ACCOUNT_CURRENCY,
+                leverage=self.leverage,
+                server="SimServer",
+            )
+
+    def positions(self, symbol: Optional[str] = None, ticket: Optional[int] = None) -> Tuple[TradePosition, ...]:
+        with self._lock:
+            quotes: Dict[str, Tuple[float, float]] = {}
+            out = []
+            for pos in list(self._positions.values()):
+                if symbol and pos["symbol"] != symbol:
+                    continue
+                if ticket and pos["ticket"] != ticket:
+                    continue
+                if pos["symbol"] not in quotes:
+                    bid, ask, _, _ = self._quote(pos["symbol"])
+                    quotes[pos["symbol"]] = (bid, ask)
+                if pos["ticket"] in self._positions:  # bisa ketutup SL/TP waktu _quote
+                    out.append(self._position_tuple(pos, *quotes[pos["symbol"]]))
+            return tuple(out)
+
+    def deals(self, date_from: int, date_to: int, position: Optional[int] = None) -> Tuple[TradeDeal, ...]:
+        with self._lock:
+            return tuple(
+                d
+                for d in self._deals
+                if date_from <= d.time <= date_to and (position is None or d.position_id == position)
+            )
+
+
+# ==========================================================
+# API MODULE (sama dengan MetaTrader5)
+# ==========================================================
+_broker: Optional[SimBroker] = None
+
+
+def configure(**kwargs: Any) -> SimBroker:
+    """
+    Buat ulang broker simulasi (buat test / benchmark). Default dari settings SIM_*.
+    """
+    global _broker
+    params = dict(
+        data_source=settings.SIM_DATA_SOURCE,
+        speed=settings.SIM_SPEED,
+        latency_ms=settings.SIM_LATENCY_MS,
+        spread_points=settings.SIM_SPREAD_POINTS,
+        requote_prob=settings.SIM_REQUOTE_PROB,
+        seed=settings.SIM_SEED,
+    )
+    params.update(kwargs)
+    _broker = SimBroker(**params)
+    return _broker
+
+
+def broker() -> SimBroker:
+    return _broker if _broker is not None else configure()
+
+
+def advance(seconds: float) -> None:
+    """Majukan jam simulasi (mode manual / fast-forward)."""
+    broker().clock.advance(seconds)
+
+
+def initialize(path: Optional[str] = None, **kwargs: Any) -> bool:
+    b = broker()
+    b.connected = True
+    b._last_error = (RES_S_OK, "Success")
+    return True
+
+
+def login(login: int = 0, password: str = "", server: str = "", **kwargs: Any) -> bool:
+    return broker().connected
+
+
+def shutdown() -> None:
+    broker().connected = False
+
+
+def last_error() -> Tuple[int, str]:
+    return broker()._last_error
+
+
+def version() -> Tuple[int, int, str]:
+    return (500, 0, "sim")
+
+
+def symbol_select(symbol: str, enable: bool = True) -> bool:
+    broker().series(symbol)
+    return True
+
+
+def symbol_info(symbol: str) -> Optional[SymbolInfo]:
+    b = broker()
+    with b._lock:
+        bid, ask, _, s = b._quote(symbol)
+        return SymbolInfo(
+            name=symbol,
+            point=s.point,
+            digits=s.digits,
+            trade_contract_size=s.contract_size,
+            volume_min=0.01,
+            volume_max=100.0,
+            volume_step=0.01,
+            filling_mode=b.filling_mode,
+            spread=int(round((ask - bid) / s.point)),
+            bid=bid,
+            ask=ask,
+        )
+
+
+def symbol_info_tick(symbol: str) -> Optional[Tick]:
+    b = broker()
+    with b._lock:
+        bid, ask, tick_time, _ = b._quote(symbol)
+        return Tick(int(tick_time), bid, ask, 0.0, 1, int(tick_time * 1000), 6, 0.0)
+
+
+def _tf_minutes(timeframe: int) -> Optional[int]:
+    minutes = _TF_MINUTES.get(timeframe)
+    if minutes is None:
+        broker()._last_error = (RES_E_FAIL, f"Invalid timeframe {timeframe}")
+    return minutes
+
+
+def copy_rates_from_pos(symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+    minutes = _tf_minutes(timeframe)
+    if minutes is None:
+        return None
+    b = broker()
+    with b._lock:
+        rates = b.rates(symbol, minutes, tail=start_pos + count)
+    end = len(rates) - start_pos
+    return rates[max(0, end - count) : max(0, end)]
+
+
+def copy_rates_from(symbol: str, timeframe: int, date_from: Any, count: int) -> Optional[np.ndarray]:
+    minutes = _tf_minutes(timeframe)
+    if minutes is None:
+        return None
+    b = broker()
+    with b._lock:
+        rates = b.rates(symbol, minutes)
+    end = int(np.searchsorted(rates["time"], _to_epoch(date_from), "right"))
+    return rates[max(0, end - count) : end]
+
+
+def copy_rates_range(symbol: str, timeframe: int, date_from: Any, date_to: Any) -> Optional[np.ndarray]:
+    minutes = _tf_minutes(timeframe)
+    if minutes is None:
+        return None
+    b = broker()
+    with b._lock:
+        rates = b.rates(symbol, minutes)
+    lo = int(np.searchsorted(rates["time"], _to_epoch(date_from), "left"))
+    hi = int(np.searchsorted(rates["time"], _to_epoch(date_to), "right"))
+    return rates[lo:hi]
+
+
+def account_info() -> Optional[AccountInfo]:
+    b = broker()
+    return b.account_info() if b.connected else None
+
+
+def positions_get(symbol: Optional[str] = None, ticket: Optional[int] = None, **kwargs: Any):
+    return broker().positions(symbol, ticket)
+
+
+def positions_total() -> int:
+    return len(broker().positions())
+
+
+def history_deals_get(date_from: Any = 0, date_to: Any = None, position: Optional[int] = None, **kwargs: Any):
+    hi = _to_epoch(date_to) if date_to is not None else math.inf
+    return broker().deals(_to_epoch(date_from), hi, position)
+
+
+def order_send(request: Dict[str, Any]) -> Optional[OrderSendResult]:
+    return broker().order_send(request)
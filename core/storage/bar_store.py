@@ -0,0 +1,171 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from config.settings import settings
+
+
+# kolom fixed-width, satu file per kolom (append-only)
+COLUMNS = {
+    "time": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "tick_volume": np.dtype("<u8"),
+    "spread": np.dtype("<i4"),
+}
+
+TimeLike = Union[int, float, datetime, pd.Timestamp, None]
+
+
+def timeframe_label(minutes: int) -> str:
+    if minutes % 60 == 0:
+        return f"H{minutes // 60}"
+    return f"M{minutes}"
+
+
+def _to_epoch(value: TimeLike) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(timezone.utc)
+    return int(ts.timestamp())
+
+
+class BarStore:
+    """
+    Penyimpanan bar lokal per symbol/timeframe, format kolom (numpy raw) di
+    data/bars/<SYMBOL>/<TF>/<kolom>.bin.
+
+    - Penulis cuma satu (proses yang pegang MT5), append-only, bar closed saja
+    - Kolom `time` ditulis paling akhir -> panjang time.bin = jumlah bar yang sah
+    - Pembaca pakai np.memmap read-only (tanpa copy, bisa dishare banyak proses)
+    """
+
+    def __init__(self, symbol: str, tf_minutes: int, root: Optional[str] = None) -> None:
+        self.symbol = symbol
+        self.tf_minutes = tf_minutes
+        self.path = Path(root or settings.BAR_STORE_DIR) / symbol / timeframe_label(tf_minutes)
+        self._maps: Dict[str, np.memmap] = {}
+        self._mapped_len = 0
+        self._repaired = False
+
+    def _file(self, col: str) -> Path:
+        return self.path / f"{col}.bin"
+
+    def __len__(self) -> int:
+        f = self._file("time")
+        if not f.exists():
+            return 0
+        return f.stat().st_size // COLUMNS["time"].itemsize
+
+    # ------------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------------
+    def _repair(self) -> None:
+        """
+        Kalau proses mati di tengah append, kolom data bisa lebih panjang dari
+        kolom time. Potong balik ke jumlah bar yang sah.
+        """
+        n = len(self)
+        for col, dtype in COLUMNS.items():
+            f = self._file(col)
+            if f.exists() and f.stat().st_size != n * dtype.itemsize:
+                logger.warning("BarStore: repair {} ({} bar)", f, n)
+                with open(f, "r+b") as fh:
+                    fh.truncate(n * dtype.itemsize)
+        self._repaired = True
+
+    def append(self, rates: np.ndarray) -> int:
+        """
+        Tambah bar (structured array dari MT5). Bar yang waktunya <= bar terakhir
+        di store di-skip. Return jumlah bar yang ditulis.
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not self._repaired:
+            self._repair()
+
+        last = self.last_time()
+        if last is not None:
+            rates = rates[rates["time"] > last]
+            if len(rates) == 0:
+                return 0
+
+        # data dulu, time terakhir (commit)
+        for col in list(COLUMNS)[1:] + ["time"]:
+            values = rates[col] if col in rates.dtype.names else np.zeros(len(rates))
+            with open(self._file(col), "ab") as fh:
+                fh.write(np.ascontiguousarray(values, dtype=COLUMNS[col]).tobytes())
+        return len(rates)
+
+    # ------------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------------
+    def _columns(self) -> Dict[str, np.ndarray]:
+        n = len(self)
+        if n != self._mapped_len:
+            self._maps = {}
+            if n:
+                for col, dtype in COLUMNS.items():
+                    self._maps[col] = np.memmap(self._file(col), dtype=dtype, mode="r", shape=(n,))
+            self._mapped_len = n
+        return self._maps
+
+    def last_time(self) -> Optional[int]:
+        cols = self._columns()
+        if not cols:
+            return None
+        return int(cols["time"][-1])
+
+    def read(self, start: TimeLike = None, end: TimeLike = None) -> Dict[str, np.ndarray]:
+        """
+        Range query [start, end] (epoch detik / datetime). Hasil = dict kolom
+        berupa view memmap, bukan copy.
+        """
+        cols = self._columns()
+        if not cols:
+            return {col: np.zeros(0, dtype=dtype) for col, dtype in COLUMNS.items()}
+
+        times = cols["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, _to_epoch(start), side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, _to_epoch(end), side="right"))
+        return {col: arr[lo:hi] for col, arr in cols.items()}
+
+    def tail(self, bars: int) -> Dict[str, np.ndarray]:
+        cols = self._columns()
+        return {col: arr[-bars:] for col, arr in cols.items()} if cols else self.read()
+
+    def to_frame(self, start: TimeLike = None, end: TimeLike = None) -> pd.DataFrame:
+        """
+        DataFrame (copy) buat dashboard / analisa manual, index datetime seperti MT5Feeder.
+        """
+        cols = self.read(start, end)
+        df = pd.DataFrame({col: np.asarray(arr) for col, arr in cols.items()})
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        df.set_index("time", inplace=True)
+        return df
+
+
+def list_stores(root: Optional[str] = None) -> Dict[str, list]:
+    """
+    Daftar symbol -> timeframe yang sudah ada di disk.
+    """
+    base = Path(root or settings.BAR_STORE_DIR)
+    if not base.exists():
+        return {}
+    return {
+        sym.name: sorted(tf.name for tf in sym.iterdir() if tf.is_dir())
+        for sym in sorted(base.iterdir())
+        if sym.is_dir()
+    }
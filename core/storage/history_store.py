@@ -0,0 +1,275 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from config.settings import settings
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    timeframe_minutes INTEGER,
+    action TEXT NOT NULL,
+    lot REAL,
+    reason TEXT,
+    executed INTEGER NOT NULL DEFAULT 0,
+    client_id TEXT
+);
+CREATE INDEX IF NOT EXISTS signals_time ON signals (time);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    lot REAL,
+    price REAL,
+    ok INTEGER NOT NULL,
+    retcode INTEGER,
+    comment TEXT,
+    attempts INTEGER,
+    order_ticket INTEGER,
+    client_id TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+
+CREATE TABLE IF NOT EXISTS deals (
+    ticket INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    symbol TEXT,
+    type INTEGER,
+    entry INTEGER,
+    volume REAL,
+    price REAL,
+    profit REAL NOT NULL DEFAULT 0,
+    magic INTEGER,
+    comment TEXT
+);
+CREATE INDEX IF NOT EXISTS deals_time ON deals (time);
+
+-- ringkasan P/L per hari (UTC), di-update tiap add_deals; weekly diagregasi dari sini
+CREATE TABLE IF NOT EXISTS pnl_daily (
+    date TEXT PRIMARY KEY,
+    pnl REAL NOT NULL,
+    deals INTEGER NOT NULL
+);
+"""
+
+# tabel yang boleh di-query lewat page(); nama tabel nggak pernah langsung dari input user
+_TABLES = {"signals", "trades", "deals"}
+_PERIODS = {"day": "%Y-%m-%d", "week": "%Y-W%W"}
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class HistoryStore:
+    """
+    History signal / trade / deal (P/L) di SQLite, append-only.
+
+    - Tambah satu signal = satu INSERT, bukan tulis ulang seluruh history.json
+    - Query pakai index waktu + keyset pagination (cursor = id terakhir), jadi
+      biaya per request cuma sebesar halaman yang diminta
+    - WAL: bot nulis, dashboard (proses lain) baca bareng tanpa saling kunci
+    - Koneksi per thread (dashboard Flask threaded, callback OrderQueue di thread worker)
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path or settings.HISTORY_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # WRITE (bot)
+    # ------------------------------------------------------------------
+    def add_signal(
+        self,
+        symbol: str,
+        action: str,
+        lot: float = 0.0,
+        reason: str = "",
+        timeframe_minutes: Optional[int] = None,
+        executed: bool = False,
+        client_id: Optional[str] = None,
+        ts: Optional[float] = None,
+    ) -> int:
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO signals (time, symbol, timeframe_minutes, action, lot, reason, executed, client_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts or time.time(), symbol, timeframe_minutes, action, lot, reason, int(executed), client_id),
+            )
+            return int(cur.lastrowid)
+
+    def add_trade(self, request: Any, result: Any, ts: Optional[float] = None) -> None:
+        """
+        Hasil OrderQueue (OrderRequest + OrderResult). client_id unik -> hasil
+        yang sama dicatat sekali walau future-nya di-share (dedup).
+        """
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO trades"
+                " (time, symbol, side, lot, price, ok, retcode, comment, attempts, order_ticket, client_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    ts or time.time(),
+                    request.symbol,
+                    request.side,
+                    request.lot,
+                    result.price,
+                    int(result.ok),
+                    result.retcode,
+                    result.comment,
+                    result.attempts,
+                    result.order,
+                    request.client_id or None,
+                ),
+            )
+
+    def add_deals(self, deals: Iterable[Any]) -> int:
+        """
+        Deal dari mt5.history_deals_get (namedtuple TradeDeal). Ticket = primary key,
+        jadi sync ulang window yang overlap aman.
+        """
+        rows = [
+            (d.ticket, int(d.time), d.symbol, d.type, d.entry, d.volume, d.price, d.profit, d.magic, d.comment)
+            for d in deals
+        ]
+        if not rows:
+            return 0
+        lo = min(r[1] for r in rows) // 86400 * 86400
+        hi = max(r[1] for r in rows) // 86400 * 86400 + 86399
+        with self._conn() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO deals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            added = conn.total_changes - before
+            if added:
+                # hitung ulang cuma hari yang kena deal baru
+                conn.execute(
+                    "INSERT OR REPLACE INTO pnl_daily"
+                    " SELECT date(time, 'unixepoch'), SUM(profit), COUNT(*) FROM deals"
+                    " WHERE time BETWEEN ? AND ? GROUP BY date(time, 'unixepoch')",
+                    (lo, hi),
+                )
+            return added
+
+    def last_deal_time(self) -> Optional[int]:
+        row = self._conn().execute("SELECT MAX(time) FROM deals").fetchone()
+        return row[0]
+
+    def import_json(self, path: Path) -> int:
+        """
+        Migrasi signals[] dari history.json lama (sekali, kalau tabel signals masih kosong).
+        """
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM signals LIMIT 1").fetchone():
+            return 0
+        try:
+            raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        rows = []
+        for sig in raw.get("signals") or []:
+            if not isinstance(sig, dict):
+                continue
+            try:
+                when = datetime.fromisoformat(str(sig.get("time")).replace("Z", "+00:00"))
+                ts = (when if when.tzinfo else when.replace(tzinfo=timezone.utc)).timestamp()
+            except ValueError:
+                ts = 0.0
+            rows.append((ts, sig.get("symbol", "-"), sig.get("action", "-"), sig.get("reason", "")))
+        with conn:
+            conn.executemany("INSERT INTO signals (time, symbol, action, reason) VALUES (?, ?, ?, ?)", rows)
+        logger.info("HistoryStore: {} signal diimport dari {}", len(rows), path)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # READ (dashboard)
+    # ------------------------------------------------------------------
+    def page(
+        self,
+        table: str,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Satu halaman, terbaru dulu. `cursor` = `next_cursor` dari halaman sebelumnya.
+        {"items": [...], "next_cursor": int | None}
+        """
+        if table not in _TABLES:
+            raise ValueError(f"tabel nggak dikenal: {table}")
+        key = "ticket" if table == "deals" else "id"
+        where, args = [], []
+        if cursor is not None:
+            where.append(f"{key} < ?")
+            args.append(cursor)
+        if start is not None:
+            where.append("time >= ?")
+            args.append(start)
+        if end is not None:
+            where.append("time <= ?")
+            args.append(end)
+        if symbol:
+            where.append("symbol = ?")
+            args.append(symbol)
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {key} DESC LIMIT ?"
+        rows = self._conn().execute(sql, (*args, limit + 1)).fetchall()
+
+        items = []
+        for row in rows[:limit]:
+            item = dict(row)
+            item["ts"] = item["time"]
+            item["time"] = _iso(item["time"])
+            items.append(item)
+        next_cursor = items[-1][key] if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def pnl(self, period: str = "day", start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        P/L per hari / minggu (UTC) dari ringkasan pnl_daily:
+        [{"date": "2025-12-04", "pnl": 12.3, "deals": 4}, ...]
+        """
+        fmt = _PERIODS.get(period)
+        if fmt is None:
+            raise ValueError(f"period nggak dikenal: {period}")
+        lo = _iso(start)[:10] if start is not None else ""
+        hi = _iso(end)[:10] if end is not None else "9999"
+        rows = self._conn().execute(
+            "SELECT strftime(?, date) AS period, ROUND(SUM(pnl), 2) AS pnl, SUM(deals) AS deals"
+            " FROM pnl_daily WHERE date >= ? AND date <= ? GROUP BY period ORDER BY period",
+            (fmt, lo, hi),
+        ).fetchall()
+        return [{"date": row["period"], "pnl": row["pnl"], "deals": row["deals"]} for row in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
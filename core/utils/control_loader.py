@@ -1,23 +1,15 @@
-import json
 from pathlib import Path
 
+from core.utils.control_store import ControlStore
+
 CONTROL_FILE = Path("data/control.json")
+# dipakai bot dan dashboard kalau control.json belum ada / rusak: trading OFF
+# sampai user nyalain sendiri, jadi dashboard selalu nampilin state yang sama dengan bot
+CONTROL_DEFAULTS = {"trading_enabled": False, "mode": "SAFE"}
 
-def load_control():
-    if not CONTROL_FILE.exists():
-        return {
-            "trading_enabled": True,
-            "mode": "SAFE"
-        }
+# satu store per proses bot; file cuma di-parse ulang kalau berubah
+control_store = ControlStore(CONTROL_FILE, defaults=CONTROL_DEFAULTS)
 
-    try:
-        data = json.loads(CONTROL_FILE.read_text(encoding="utf-8"))
-        return {
-            "trading_enabled": data.get("trading_enabled", True),
-            "mode": data.get("mode", "SAFE")
-        }
-    except:
-        return {
-            "trading_enabled": True,
-            "mode": "SAFE"
-        }
+
+def load_control():
+    return control_store.get()
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class ControlStore:
+    """
+    Cache control.json (ON/OFF + mode) yang dipakai bareng bot & dashboard.
+    - Parse ulang cuma kalau file berubah (mtime / inode / size beda)
+    - Cek stat paling sering tiap `check_interval` detik
+    - Tulis atomic: file temp di folder yang sama lalu os.replace
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        defaults: Dict[str, Any],
+        check_interval: float = 0.5,
+    ) -> None:
+        self.path = Path(path)
+        self.defaults = dict(defaults)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._data: Dict[str, Any] = dict(defaults)
+        self._checked_at = 0.0
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def _normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "trading_enabled": bool(raw.get("trading_enabled", self.defaults["trading_enabled"])),
+            "mode": str(raw.get("mode", self.defaults["mode"])).upper(),
+        }
+
+    def _reload(self, signature: Optional[Tuple[int, int, int]]) -> None:
+        if signature is None:
+            self._data = dict(self.defaults)
+        else:
+            try:
+                self._data = self._normalize(json.loads(self.path.read_text(encoding="utf-8")))
+            except Exception as e:
+                # file rusak / lagi ditulis editor lain -> pakai default (sama seperti loader lama)
+                logger.warning("ControlStore: gagal baca {}: {}", self.path, e)
+                self._data = dict(self.defaults)
+        self._signature = signature
+
+    def get(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Snapshot control (copy). Baca disk cuma kalau file-nya berubah.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if force or now - self._checked_at >= self.check_interval or self._checked_at == 0.0:
+                self._checked_at = now
+                signature = self._stat()
+                if signature != self._signature or signature is None:
+                    self._reload(signature)
+            return dict(self._data)
+
+    def update(self, **changes: Any) -> Dict[str, Any]:
+        """
+        Ubah field (yang None di-skip) lalu tulis atomic.
+        """
+        with self._lock:
+            signature = self._stat()
+            if signature != self._signature:
+                self._reload(signature)
+
+            data = dict(self._data)
+            for key, value in changes.items():
+                if value is not None:
+                    data[key] = value
+            data = self._normalize(data)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(data, fh, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.path)
+            except Exception:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+
+            self._data = data
+            self._signature = self._stat()
+            self._checked_at = time.monotonic()
+            return dict(data)
@@ -0,0 +1,137 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator
+
+# kuantil yang dilaporkan (JSON & Prometheus)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Latency satu stage: window sampel terakhir (buat kuantil) + total kumulatif.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+        }
+        for q in QUANTILES:
+            key = f"p{int(q * 100)}"
+            if samples:
+                # nearest-rank
+                out[key] = round(samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)], 6)
+            else:
+                out[key] = None
+        return out
+
+
+class MetricsRegistry:
+    """
+    Timer per stage (feed, technical, condition, news, llm, risk, order_send, ...).
+    Overhead per observasi: perf_counter + append deque di bawah lock.
+    Kuantil baru dihitung waktu `snapshot()`.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        self.window = window
+        self._stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        # info non-latency (mis. state circuit breaker LLM), dipanggil waktu snapshot
+        self._info: Dict[str, Callable[[], Any]] = {}
+
+    def add_info(self, name: str, fn: Callable[[], Any]) -> None:
+        self._info[name] = fn
+
+    def observe(self, stage: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = Histogram(self.window)
+            hist.observe(seconds, error)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        with metrics.timer("risk"): ...  (exception dihitung sebagai error, tetap di-raise)
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(stage, time.perf_counter() - t0, error=True)
+            raise
+        self.observe(stage, time.perf_counter() - t0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: hist.snapshot() for name, hist in sorted(self._stages.items())}
+        snap = {"updated_at": time.time(), "started_at": self.started_at, "stages": stages}
+        if self._info:
+            snap["info"] = {name: fn() for name, fn in self._info.items()}
+        return snap
+
+    def dump(self, path: Path) -> None:
+        """
+        Tulis snapshot ke JSON (atomic) buat dibaca dashboard (proses lain).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def to_prometheus(snapshot: Dict[str, Any], prefix: str = "tradingbot") -> str:
+    """
+    Format text exposition Prometheus (summary per stage + counter error).
+    """
+    name = f"{prefix}_stage_seconds"
+    lines = [
+        f"# HELP {name} Latency per stage bot (window sampel terakhir).",
+        f"# TYPE {name} summary",
+    ]
+    stages = snapshot.get("stages", {})
+    for stage, s in stages.items():
+        for q in QUANTILES:
+            value = s.get(f"p{int(q * 100)}")
+            if value is not None:
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {s.get("sum", 0)}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {s.get("count", 0)}')
+
+    err = f"{prefix}_stage_errors_total"
+    lines += [f"# HELP {err} Jumlah error per stage.", f"# TYPE {err} counter"]
+    for stage, s in stages.items():
+        lines.append(f'{err}{{stage="{stage}"}} {s.get("errors", 0)}')
+    return "\n".join(lines) + "\n"
+
+
+# registry default satu per proses
+metrics = MetricsRegistry()
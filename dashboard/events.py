@@ -0,0 +1,136 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from config.settings import settings
+from .status_loader import STATUS_FILE, _read_json, load_control
+
+# client SSE kirim ping tiap N detik supaya proxy / browser nggak nutup koneksi
+HEARTBEAT_SECONDS = 15.0
+
+
+def _sse(event: str, data: Any, seq: Optional[int] = None) -> str:
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class EventHub:
+    """
+    Pub/sub in-memory buat dashboard (Server-Sent Events).
+    - Bot publish event (status delta / decision / metrics / control) sekali,
+      di-serialize sekali, lalu di-fan-out ke semua browser yang subscribe
+    - State terakhir disimpan, subscriber baru langsung dapat "snapshot"
+    - Subscriber lambat (queue penuh) di-reset: queue dibuang, dapat snapshot baru
+    """
+
+    def __init__(self, max_queue: int = 256, max_decisions: int = 50) -> None:
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: List["queue.Queue[str]"] = []
+        self._seq = 0
+        self._seeded = False
+        self._decisions: Deque[Dict[str, Any]] = deque(maxlen=max_decisions)
+        self.state: Dict[str, Any] = {"status": {}, "control": {}, "metrics": {}}
+
+    def _seed(self) -> None:
+        # belum ada event (dashboard baru start) -> ambil status.json / control.json sekali
+        if not self._seeded:
+            self._seeded = True
+            if not self.state["status"]:
+                self.state["status"] = _read_json(STATUS_FILE) or {}
+            if not self.state["control"]:
+                self.state["control"] = load_control()
+
+    def _snapshot_locked(self) -> str:
+        self._seed()
+        return _sse("snapshot", {**self.state, "decisions": list(self._decisions)}, self._seq)
+
+    def publish(self, event: str, data: Any) -> int:
+        with self._lock:
+            if event == "status":
+                # data = delta (key top-level yang berubah)
+                self.state["status"].update(data or {})
+            elif event in ("control", "metrics"):
+                self.state[event] = data or {}
+            elif event == "decision":
+                self._decisions.append(data)
+
+            self._seq += 1
+            message = _sse(event, data, self._seq)
+            for q in self._subscribers:
+                try:
+                    q.put_nowait(message)
+                except queue.Full:
+                    self._resync(q)
+            return self._seq
+
+    def _resync(self, q: "queue.Queue[str]") -> None:
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                break
+        q.put_nowait(self._snapshot_locked())
+
+    def subscribe(self) -> Iterator[str]:
+        q: "queue.Queue[str]" = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            q.put_nowait(self._snapshot_locked())
+            self._subscribers.append(q)
+        try:
+            while True:
+                try:
+                    yield q.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": ping\n\n"
+        finally:
+            with self._lock:
+                self._subscribers.remove(q)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"subscribers": len(self._subscribers), "seq": self._seq}
+
+
+hub = EventHub()
+
+events_bp = Blueprint("events", __name__)
+
+
+@events_bp.route("/api/events")
+def api_events():
+    response = Response(stream_with_context(hub.subscribe()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@events_bp.route("/api/events/publish", methods=["POST"])
+def api_events_publish():
+    """
+    Dipanggil bot (core/pipeline/event_publisher.py):
+    {"events": [{"event": "status" | "decision" | "metrics" | "control", "data": {...}}, ...]}
+    Cuma dari localhost, plus token kalau DASHBOARD_EVENTS_TOKEN di-set.
+    """
+    if request.remote_addr not in ("127.0.0.1", "::1"):
+        return jsonify({"error": "forbidden"}), 403
+    token = settings.DASHBOARD_EVENTS_TOKEN
+    if token and request.headers.get("X-Events-Token") != token:
+        return jsonify({"error": "bad_token"}), 403
+
+    payload = request.get_json(force=True, silent=True) or {}
+    seq = None
+    for item in payload.get("events", []):
+        if isinstance(item, dict) and item.get("event"):
+            seq = hub.publish(str(item["event"]), item.get("data"))
+    return jsonify({"ok": True, "seq": seq, "at": time.time()})
+
+
+@events_bp.route("/api/events/stats")
+def api_events_stats():
+    return jsonify(hub.stats())
@@ -1,5 +1,16 @@
-from flask import Blueprint, render_template, jsonify, request
-from .status_loader import load_status, load_control, save_control, load_history
+from flask import Blueprint, Response, render_template, jsonify, request
+
+from core.utils.metrics import to_prometheus
+from .events import events_bp, hub
+from .status_loader import (
+    history_store,
+    load_bars,
+    load_control,
+    load_history,
+    load_metrics,
+    load_status,
+    save_control,
+)
 from .bot_control import set_trading_enabled, set_mode
 
 dash_bp = Blueprint(
@@ -9,6 +20,8 @@ dash_bp = Blueprint(
     static_folder="static",
     static_url_path="/static",
 )
+# /api/events (SSE) + /api/events/publish
+dash_bp.register_blueprint(events_bp)
 
 
 @dash_bp.route("/")
@@ -47,9 +60,70 @@ def api_control():
     enabled = payload.get("trading_enabled")
     mode = payload.get("mode")
     updated = save_control(trading_enabled=enabled, mode=mode)
+    hub.publish("control", updated)
     return jsonify(updated)
 
 
+def _page_args() -> dict:
+    """
+    Query pagination history: ?limit=&cursor=&start=&end=&symbol= (start/end epoch detik).
+    """
+    return {
+        "limit": max(1, min(request.args.get("limit", default=100, type=int), 1000)),
+        "cursor": request.args.get("cursor", type=int),
+        "start": request.args.get("start", type=float),
+        "end": request.args.get("end", type=float),
+        "symbol": request.args.get("symbol") or None,
+    }
+
+
 @dash_bp.route("/api/history")
 def api_history():
-    return jsonify(load_history())
+    return jsonify(load_history(**_page_args()))
+
+
+@dash_bp.route("/api/signals")
+def api_signals():
+    return jsonify(history_store().page("signals", **_page_args()))
+
+
+@dash_bp.route("/api/trades")
+def api_trades():
+    """
+    ?kind=orders (default, hasil kirim order) | deals (deal broker + profit)
+    """
+    table = "deals" if request.args.get("kind") == "deals" else "trades"
+    return jsonify(history_store().page(table, **_page_args()))
+
+
+@dash_bp.route("/api/bars")
+def api_bars():
+    status = load_status() or {}
+    symbol = request.args.get("symbol") or status.get("symbol") or "XAUUSD"
+    tf = request.args.get("tf", type=int) or status.get("timeframe_minutes") or 15
+    limit = min(request.args.get("limit", default=500, type=int), 5000)
+    return jsonify(
+        load_bars(
+            symbol,
+            tf,
+            start=request.args.get("start", type=int),
+            end=request.args.get("end", type=int),
+            limit=limit,
+        )
+    )
+
+
+@dash_bp.route("/api/metrics")
+def api_metrics():
+    """
+    Latency per stage bot. ?format=prometheus -> text exposition Prometheus.
+    """
+    data = load_metrics()
+    if request.args.get("format") == "prometheus":
+        return Response(to_prometheus(data), mimetype="text/plain; version=0.0.4")
+    return jsonify(data)
+
+
+@dash_bp.route("/metrics")
+def prometheus_metrics():
+    return Response(to_prometheus(load_metrics()), mimetype="text/plain; version=0.0.4")
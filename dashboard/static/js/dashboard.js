@@ -175,58 +175,149 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     // ================== SIGNALS (opsional; kalau lo nanti bikin tabel) ==================
-    async function fetchSignals() {
+    const SIGNALS_LIMIT = 100;
+    let signals = [];
+    // signal yang sudah tampil per (symbol, tf, bar); bot cuma nyatet sekali per bar
+    const signaledBars = new Set();
+
+    function renderSignals() {
         const tableBody = document.getElementById("signals-table-body");
         const snap = document.getElementById("signals-snapshot");
 
-        if (!tableBody && !snap) return;
+        if (tableBody) {
+            tableBody.innerHTML = "";
+            signals.forEach(sig => {
+                const tr = document.createElement("tr");
+                tr.innerHTML = `
+                    <td>${sig.time || "-"}</td>
+                    <td>${sig.symbol || "-"}</td>
+                    <td>${sig.action || "-"}</td>
+                    <td>${sig.reason || "-"}</td>
+                `;
+                tableBody.appendChild(tr);
+            });
+        }
 
-        try {
-            const res = await fetch("/api/signals");
-            if (!res.ok) return;
-            const signals = await res.json();
-
-            if (tableBody) {
-                tableBody.innerHTML = "";
-                signals.slice().reverse().forEach(sig => {
-                    const tr = document.createElement("tr");
-                    tr.innerHTML = `
-                        <td>${sig.time || "-"}</td>
-                        <td>${sig.symbol || "-"}</td>
-                        <td>${sig.action || "-"}</td>
-                        <td>${sig.reason || "-"}</td>
-                    `;
-                    tableBody.appendChild(tr);
-                });
-            }
+        if (snap) {
+            snap.innerHTML = "";
+            signals.slice(0, 5).forEach(sig => {
+                const div = document.createElement("div");
+                div.className = "headline-item";
+                div.textContent = `${sig.time || ""} • ${sig.action || ""} • ${sig.reason || ""}`;
+                snap.appendChild(div);
+            });
+        }
+    }
 
-            if (snap) {
-                snap.innerHTML = "";
-                signals.slice(-5).reverse().forEach(sig => {
-                    const div = document.createElement("div");
-                    div.className = "headline-item";
-                    div.textContent = `${sig.time || ""} • ${sig.action || ""} • ${sig.reason || ""}`;
-                    snap.appendChild(div);
-                });
-            }
+    async function fetchSignals() {
+        if (!document.getElementById("signals-table-body") && !document.getElementById("signals-snapshot")) return;
 
+        try {
+            // satu halaman, terbaru dulu ({items, next_cursor})
+            const res = await fetch(`/api/signals?limit=${SIGNALS_LIMIT}`);
+            if (!res.ok) return;
+            const page = await res.json();
+            signals = page.items || [];
+            renderSignals();
         } catch (err) {
             console.error("fetchSignals error:", err);
         }
     }
 
+    // decision dari SSE langsung jadi baris baru (tanpa query ulang ke server)
+    function addSignal(decision) {
+        if (!decision || (decision.action !== "BUY" && decision.action !== "SELL")) return;
+        const bar = `${decision.symbol}:${decision.timeframe_minutes}:${decision.bar_time}`;
+        if (decision.bar_time !== undefined) {
+            if (signaledBars.has(bar)) return;
+            if (signaledBars.size > 1000) signaledBars.clear();
+            signaledBars.add(bar);
+        }
+        signals.unshift({
+            time: decision.timestamp,
+            symbol: decision.symbol,
+            timeframe_minutes: decision.timeframe_minutes,
+            action: decision.action,
+            lot: decision.lot,
+            reason: decision.reason,
+        });
+        signals.length = Math.min(signals.length, SIGNALS_LIMIT);
+        renderSignals();
+    }
+
     // ================== PNL (opsional; kalau nanti lo pakai chart.js / dll) ==================
     async function fetchPnl() {
         // placeholder kalau lo mau pakai canvas #daily-pnl-chart
         // sementara nggak di-implement biar nggak nambah lib
     }
 
-    // ================== LOOPING ==================
-    fetchStatus();
-    fetchSignals();
+    // ================== LIVE UPDATE (SSE) ==================
+    // bot push status delta / decision / metrics / control lewat /api/events;
+    // polling 60 detik cuma jalan kalau SSE nggak tersedia / lagi putus
+    let status = {};
+    let pollTimer = null;
 
-    setInterval(() => {
+    function startPolling() {
+        if (pollTimer) return;
         fetchStatus();
         fetchSignals();
-    }, 60000); // 60 detik
+        pollTimer = setInterval(() => {
+            fetchStatus();
+            fetchSignals();
+        }, 60000); // 60 detik
+    }
+
+    function stopPolling() {
+        if (!pollTimer) return;
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+
+    function applyControl(control) {
+        if (control && typeof control.trading_enabled === "boolean") {
+            status.trading_enabled = control.trading_enabled;
+        }
+    }
+
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    fetchSignals();
+    const source = new EventSource("/api/events");
+    const parse = ev => {
+        try {
+            return JSON.parse(ev.data);
+        } catch {
+            return null;
+        }
+    };
+
+    source.addEventListener("open", stopPolling);
+    source.addEventListener("error", startPolling); // browser reconnect sendiri
+
+    source.addEventListener("snapshot", ev => {
+        const data = parse(ev);
+        if (!data) return;
+        status = { ...(data.status || {}) };
+        applyControl(data.control);
+        updateUIFromStatus(status);
+    });
+
+    source.addEventListener("status", ev => {
+        const delta = parse(ev);
+        if (!delta) return;
+        status = { ...status, ...delta };
+        updateUIFromStatus(status);
+    });
+
+    source.addEventListener("control", ev => {
+        applyControl(parse(ev));
+        updateUIFromStatus(status);
+    });
+
+    source.addEventListener("decision", ev => {
+        addSignal(parse(ev));
+    });
 });
@@ -1,10 +1,18 @@
 from pathlib import Path
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from core.storage.bar_store import BarStore
+from core.storage.history_store import HistoryStore
+from core.utils.control_loader import CONTROL_DEFAULTS, CONTROL_FILE
+from core.utils.control_store import ControlStore
 
 STATUS_FILE = Path("data/status.json")
-CONTROL_FILE = Path("data/control.json")
 HISTORY_FILE = Path("data/history.json")
+METRICS_FILE = Path("data/metrics.json")
+
+_control_store = ControlStore(CONTROL_FILE, defaults=CONTROL_DEFAULTS)
+_history: Optional[HistoryStore] = None
 
 
 def _read_json(path: Path) -> Dict[str, Any] | None:
@@ -83,49 +91,95 @@ def load_control() -> Dict[str, Any]:
       "trading_enabled": bool,
       "mode": "SAFE" | "BALANCED" | "AGGRESSIVE" | "SCALPING_M5"
     }
+    Read-only: file cuma di-parse ulang kalau berubah, nggak ditulis balik.
     """
-    existing = _read_json(CONTROL_FILE) or {}
-    trading_enabled = bool(existing.get("trading_enabled", False))
-    mode = str(existing.get("mode", "SAFE")).upper()
-
-    data = {
-        "trading_enabled": trading_enabled,
-        "mode": mode,
-    }
-    _write_json(CONTROL_FILE, data)
-    return data
+    return _control_store.get()
 
 
 def save_control(trading_enabled: bool | None = None, mode: str | None = None) -> Dict[str, Any]:
-    current = load_control()
-    if trading_enabled is not None:
-        current["trading_enabled"] = bool(trading_enabled)
-    if mode is not None:
-        current["mode"] = mode.upper()
-    _write_json(CONTROL_FILE, current)
-    return current
+    # tulis atomic (temp + rename), bot nggak pernah baca file setengah jadi
+    return _control_store.update(trading_enabled=trading_enabled, mode=mode)
 
 
-def load_history() -> Dict[str, Any]:
+def history_store() -> HistoryStore:
+    """
+    HistoryStore (SQLite) dibuka sekali per proses. history.json lama
+    (kalau ada) diimport waktu pertama dibuka.
     """
-    history.json rencana isi:
+    global _history
+    if _history is None:
+        _history = HistoryStore()
+        if HISTORY_FILE.exists():
+            _history.import_json(HISTORY_FILE)
+    return _history
+
+
+def load_history(
+    limit: int = 50,
+    cursor: Optional[int] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    symbol: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Satu halaman history:
     {
-      "daily_pnl": [{"date": "2025-12-04", "pnl": 12.3}, ...],
-      "weekly_pnl": [...],
-      "signals": [
-        {"time": "...", "symbol": "XAUUSD", "action": "BUY", "reason": "..."},
-        ...
-      ]
+      "daily_pnl": [{"date": "2025-12-04", "pnl": 12.3, "deals": 4}, ...],
+      "weekly_pnl": [{"date": "2025-W48", "pnl": 40.1, "deals": 15}, ...],
+      "signals": [{"time": "...", "symbol": "XAUUSD", "action": "BUY", "reason": "..."}, ...],
+      "next_cursor": int | None
     }
-    Kalau belum ada, balikin struktur kosong tapi aman buat UI.
+    Signals terbaru dulu, `limit` baris mulai dari `cursor`; PnL ikut range start/end (epoch detik).
     """
-    raw = _read_json(HISTORY_FILE) or {}
-    daily = raw.get("daily_pnl") or []
-    weekly = raw.get("weekly_pnl") or []
-    signals = raw.get("signals") or []
+    store = history_store()
+    signals = store.page("signals", limit=limit, cursor=cursor, start=start, end=end, symbol=symbol)
+    return {
+        "daily_pnl": store.pnl("day", start, end),
+        "weekly_pnl": store.pnl("week", start, end),
+        "signals": signals["items"],
+        "next_cursor": signals["next_cursor"],
+    }
+
 
+def load_bars(
+    symbol: str,
+    tf_minutes: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    """
+    Candle dari BarStore (data/bars) buat chart dashboard.
+    Baca lewat memmap, yang di-serialize cuma `limit` bar terakhir dari range.
+    """
+    cols = BarStore(symbol, tf_minutes).read(start, end)
+    n = len(cols["time"])
+    sl = slice(max(0, n - limit), n)
+    return {
+        "symbol": symbol,
+        "timeframe_minutes": tf_minutes,
+        "bars": [
+            {"time": int(t), "open": float(o), "high": float(h), "low": float(lo), "close": float(c)}
+            for t, o, h, lo, c in zip(
+                cols["time"][sl], cols["open"][sl], cols["high"][sl], cols["low"][sl], cols["close"][sl]
+            )
+        ],
+    }
+
+
+def load_metrics() -> Dict[str, Any]:
+    """
+    metrics.json dari bot: latency per stage (p50/p95/p99, count, error) + info lain
+    (state circuit breaker LLM).
+    Kalau bot belum jalan -> stages kosong.
+    """
+    raw = _read_json(METRICS_FILE) or {}
+    stages = raw.get("stages")
+    info = raw.get("info")
     return {
-        "daily_pnl": daily if isinstance(daily, list) else [],
-        "weekly_pnl": weekly if isinstance(weekly, list) else [],
-        "signals": signals if isinstance(signals, list) else [],
+        "updated_at": raw.get("updated_at"),
+        "started_at": raw.get("started_at"),
+        "stages": stages if isinstance(stages, dict) else {},
+        # mis. {"llm": {"gemini": {"breaker": "open", ...}}}
+        "info": info if isinstance(info, dict) else {},
     }
@@ -1,13 +1,21 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from pathlib import Path
 import json
 import time
 
+from core.utils.control_loader import CONTROL_DEFAULTS, CONTROL_FILE
+from core.utils.control_store import ControlStore
+from core.utils.metrics import to_prometheus
+from dashboard.events import events_bp, hub
+from dashboard.status_loader import history_store, load_bars, load_history, load_metrics
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
+# push realtime ke browser: /api/events (SSE), bot kirim ke /api/events/publish
+app.register_blueprint(events_bp)
 
 STATUS_FILE = Path("data/status.json")
-CONTROL_FILE = Path("data/control.json")
-HISTORY_FILE = Path("data/history.json")
+
+control_store = ControlStore(CONTROL_FILE, defaults=CONTROL_DEFAULTS)
 
 
 # ==========================================================
@@ -26,13 +34,26 @@ def save_json(path, data):
     Path(path).write_text(json.dumps(data, indent=4), encoding="utf-8")
 
 
+def page_args():
+    """
+    Query pagination history: ?limit=&cursor=&start=&end=&symbol= (start/end epoch detik).
+    """
+    return {
+        "limit": max(1, min(request.args.get("limit", default=100, type=int), 1000)),
+        "cursor": request.args.get("cursor", type=int),
+        "start": request.args.get("start", type=float),
+        "end": request.args.get("end", type=float),
+        "symbol": request.args.get("symbol") or None,
+    }
+
+
 # ==========================================================
 # DASHBOARD PAGE
 # ==========================================================
 @app.route("/")
 def dashboard():
     status = load_json(STATUS_FILE)
-    control = load_json(CONTROL_FILE)
+    control = control_store.get()
     return render_template("dashboard.html", status=status, control=control)
 
 
@@ -49,11 +70,9 @@ def api_status():
 # ==========================================================
 @app.route("/api/toggle", methods=["POST"])
 def api_toggle():
-    ctl = load_json(CONTROL_FILE)
     body = request.json
-
-    ctl["trading_enabled"] = body.get("trading_enabled", False)
-    save_json(CONTROL_FILE, ctl)
+    ctl = control_store.update(trading_enabled=body.get("trading_enabled", False))
+    hub.publish("control", ctl)
 
     return jsonify({"success": True, "control": ctl})
 
@@ -63,41 +82,99 @@ def api_toggle():
 # ==========================================================
 @app.route("/api/set_mode", methods=["POST"])
 def api_set_mode():
-    ctl = load_json(CONTROL_FILE)
     body = request.json
 
     mode = body.get("mode", "SAFE").upper()
-    ctl["mode"] = mode
-
-    save_json(CONTROL_FILE, ctl)
+    ctl = control_store.update(mode=mode)
+    hub.publish("control", ctl)
 
     return jsonify({"success": True, "control": ctl})
 
 
 # ==========================================================
-# API: signals history (from history.json)
+# API: history (PnL harian/mingguan + satu halaman signal)
+# ==========================================================
+@app.route("/api/history")
+def api_history():
+    return jsonify(load_history(**page_args()))
+
+
+# ==========================================================
+# API: signals history (SQLite, per halaman)
+# ?limit=&cursor=&start=&end=&symbol= -> {"items": [...], "next_cursor": ...}
 # ==========================================================
 @app.route("/api/signals")
 def api_signals():
-    data = load_json(HISTORY_FILE)
-    return jsonify(data.get("signals", []))
+    return jsonify(history_store().page("signals", **page_args()))
 
 
 # ==========================================================
-# API: PnL chart data
+# API: trades per halaman
+# ?kind=orders (default, hasil kirim order) | deals (deal broker + profit)
+# ==========================================================
+@app.route("/api/trades")
+def api_trades():
+    table = "deals" if request.args.get("kind") == "deals" else "trades"
+    return jsonify(history_store().page(table, **page_args()))
+
+
+# ==========================================================
+# API: PnL chart data (?start=&end= epoch detik)
 # ==========================================================
 @app.route("/api/pnl")
 def api_pnl():
-    data = load_json(HISTORY_FILE)
+    store = history_store()
+    start = request.args.get("start", type=float)
+    end = request.args.get("end", type=float)
     return jsonify({
-        "daily": data.get("daily_pnl", []),
-        "weekly": data.get("weekly_pnl", [])
+        "daily": store.pnl("day", start, end),
+        "weekly": store.pnl("week", start, end)
     })
 
 
+# ==========================================================
+# API: candle chart dari BarStore
+# ?symbol=&tf=&start=&end=&limit= (default symbol/tf dari status bot)
+# ==========================================================
+@app.route("/api/bars")
+def api_bars():
+    status = load_json(STATUS_FILE)
+    symbol = request.args.get("symbol") or status.get("symbol") or "XAUUSD"
+    tf = request.args.get("tf", type=int) or status.get("timeframe_minutes") or 15
+    limit = min(request.args.get("limit", default=500, type=int), 5000)
+    return jsonify(
+        load_bars(
+            symbol,
+            tf,
+            start=request.args.get("start", type=int),
+            end=request.args.get("end", type=int),
+            limit=limit,
+        )
+    )
+
+
+# ==========================================================
+# API: latency per stage bot (metrics.json)
+# ?format=prometheus -> text exposition Prometheus
+# ==========================================================
+@app.route("/api/metrics")
+def api_metrics():
+    data = load_metrics()
+    if request.args.get("format") == "prometheus":
+        return Response(to_prometheus(data), mimetype="text/plain; version=0.0.4")
+    return jsonify(data)
+
+
+# endpoint scrape Prometheus
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(to_prometheus(load_metrics()), mimetype="text/plain; version=0.0.4")
+
+
 # ==========================================================
 # START SERVER
 # ==========================================================
 if __name__ == "__main__":
     print("Dashboard running: http://127.0.0.1:5000")
-    app.run(host="127.0.0.1", port=5000, debug=True)
+    # threaded: tiap browser pegang satu koneksi SSE
+    app.run(host="127.0.0.1", port=5000, debug=True, threaded=True)
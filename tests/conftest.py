@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# test nggak boleh pakai isi .env lokal: tanpa API key asli (LLM cuma ke stub server),
+# dan MT5_LOGIN kosong di .env bikin core.config gagal parse int
+for key in ("GEMINI_API_KEY", "OPENAI_API_KEY"):
+    os.environ[key] = ""
+os.environ["MT5_LOGIN"] = "1"
+# paket MetaTrader5 cuma ada di Windows; test pakai simulator in-process
+os.environ["MT5_BACKEND"] = "sim"
@@ -0,0 +1,50 @@
+from multiprocessing import shared_memory
+
+from benchmarks.data import ohlc_rates
+from core.orchestrator import analysis_pool
+from core.orchestrator.analysis_pool import AnalysisPool
+
+
+def test_shards_round_robin_in_symbol_order():
+    keys = [("XAUUSD", 15), ("EURUSD", 15), ("GBPUSD", 15), ("USDJPY", 15), ("XAGUSD", 15)]
+    pool = AnalysisPool(2, keys)
+    try:
+        assert [pool._shard_index(k) for k in keys] == [0, 1, 0, 1, 0]
+        # key baru dapat giliran berikutnya
+        assert pool._shard_index(("BTCUSD", 15)) == 1
+    finally:
+        pool.close()
+
+
+def test_attach_evicts_reallocated_block():
+    old = shared_memory.SharedMemory(create=True, size=64)
+    new = shared_memory.SharedMemory(create=True, size=128)
+    slot = ("TEST", 1)
+    try:
+        first = analysis_pool._attach(slot, old.name)
+        assert analysis_pool._attach(slot, old.name) is first
+        second = analysis_pool._attach(slot, new.name)
+        assert second.name == new.name and second.size >= 128
+        assert analysis_pool._ATTACHED[slot] is second
+        assert first.buf is None  # handle lama sudah di-close
+    finally:
+        analysis_pool._ATTACHED.pop(slot).close()
+        for shm in (old, new):
+            shm.close()
+            shm.unlink()
+
+
+def test_pool_matches_in_process_after_block_growth():
+    rates = ohlc_rates(800)
+    key = ("XAUUSD", 15)
+    pool, local = AnalysisPool(1, [key]), AnalysisPool(0)
+    try:
+        # 300 bar lalu 700 bar -> blok shared memory dialokasi ulang
+        for n in (300, 301, 700):
+            got = pool.analyze({key: rates[:n]})[key]
+            ref = local.analyze({key: rates[:n]})[key]
+            assert got["technical"] == ref["technical"]
+            assert got["condition"] == ref["condition"]
+    finally:
+        pool.close()
+        local.close()
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.data import ohlc_frame, ohlc_rates
+from core.brains.technical_brain import TechnicalBrain
+from core.feeder.bar_buffer import ohlc_arrays, to_frame
+
+UNITS = ("ns", "us", "s")
+
+
+def _frame(n: int, unit: str) -> pd.DataFrame:
+    df = ohlc_frame(n)
+    df.index = df.index.as_unit(unit)
+    return df
+
+
+@pytest.mark.parametrize("unit", UNITS)
+def test_ohlc_arrays_time_per_index_unit(unit):
+    rates = ohlc_rates(50)
+    df = _frame(50, unit)
+    np.testing.assert_array_equal(ohlc_arrays(df)["time"], rates["time"])
+    # index tz-aware -> tetap epoch UTC
+    aware = df.tz_localize("UTC").tz_convert("Asia/Jakarta")
+    np.testing.assert_array_equal(ohlc_arrays(aware)["time"], rates["time"])
+
+
+def test_ohlc_arrays_frame_matches_rates():
+    rates = ohlc_rates(50)
+    for df in (to_frame(rates), _frame(50, "ns").reset_index()):
+        cols = ohlc_arrays(df, tail=20)
+        ref = ohlc_arrays(rates, tail=20)
+        for key in ("time", "high", "low", "close"):
+            np.testing.assert_array_equal(cols[key], ref[key])
+
+
+@pytest.mark.parametrize("unit", UNITS)
+def test_analyze_frame_matches_rates(unit):
+    # frame geser (kayak tiap cycle live): jalur DataFrame harus sama persis dengan structured array
+    n, window = 600, 200
+    rates = ohlc_rates(n)
+    df = _frame(n, unit)
+    from_rates, from_frame = TechnicalBrain(), TechnicalBrain()
+    for end in range(window, n + 1):
+        assert from_frame.analyze(df.iloc[end - window:end]) == from_rates.analyze(rates[end - window:end])
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from core.utils.control_loader import CONTROL_DEFAULTS
+from core.utils.control_store import ControlStore
+
+
+@pytest.mark.parametrize("content", [None, "{rusak", json.dumps({"mode": "aggressive"})])
+def test_bot_and_dashboard_agree_without_valid_control(tmp_path, content):
+    path = tmp_path / "control.json"
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    bot = ControlStore(path, defaults=CONTROL_DEFAULTS)
+    dashboard = ControlStore(path, defaults=CONTROL_DEFAULTS)
+    assert bot.get() == dashboard.get()
+    assert bot.get()["trading_enabled"] is False
+
+
+def test_dashboard_modules_share_bot_defaults():
+    pytest.importorskip("flask")
+    import dashboard_web
+    from dashboard import status_loader
+
+    assert dashboard_web.control_store.defaults == CONTROL_DEFAULTS
+    assert status_loader._control_store.defaults == CONTROL_DEFAULTS
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+import dashboard_web
+from benchmarks.data import deals, ohlc_rates
+from config.settings import settings
+from core.storage.bar_store import BarStore
+from core.storage.history_store import HistoryStore
+from dashboard import status_loader
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BAR_STORE_DIR", str(tmp_path / "bars"))
+    monkeypatch.setattr(dashboard_web, "STATUS_FILE", tmp_path / "status.json")
+    monkeypatch.setattr(status_loader, "METRICS_FILE", tmp_path / "metrics.json")
+    store = HistoryStore(str(tmp_path / "history.db"))
+    monkeypatch.setattr(status_loader, "_history", store)
+    dashboard_web.app.config["TESTING"] = True
+    yield dashboard_web.app.test_client()
+    store.close()
+
+
+def test_api_bars_served_by_dashboard_app(client, tmp_path):
+    rates = ohlc_rates(50)
+    BarStore("EURUSD", 15).append(rates)
+    (tmp_path / "status.json").write_text(
+        json.dumps({"symbol": "EURUSD", "timeframe_minutes": 15}), encoding="utf-8"
+    )
+
+    resp = client.get("/api/bars?limit=10")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["symbol"] == "EURUSD"
+    assert data["timeframe_minutes"] == 15
+    assert [b["time"] for b in data["bars"]] == rates["time"][-10:].tolist()
+
+
+def test_api_bars_empty_store(client):
+    resp = client.get("/api/bars?symbol=GBPUSD&tf=5")
+    assert resp.status_code == 200
+    assert resp.get_json()["bars"] == []
+
+
+def test_metrics_routes_served_by_dashboard_app(client, tmp_path):
+    (tmp_path / "metrics.json").write_text(
+        json.dumps({"stages": {"analysis": {"p50": 0.01, "p95": 0.02, "count": 3, "sum": 0.04, "errors": 1}}}),
+        encoding="utf-8",
+    )
+
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.get_json()["stages"]["analysis"]["count"] == 3
+
+    for url in ("/metrics", "/api/metrics?format=prometheus"):
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/plain"
+        text = resp.get_data(as_text=True)
+        assert 'tradingbot_stage_seconds_count{stage="analysis"} 3' in text
+        assert 'tradingbot_stage_errors_total{stage="analysis"} 1' in text
+
+
+def test_metrics_before_bot_starts(client):
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.get_json()["stages"] == {}
+
+
+def test_history_and_trades_served_by_dashboard_app(client):
+    store = status_loader.history_store()
+    for i in range(5):
+        store.add_signal("XAUUSD", "BUY", reason=f"sig {i}", ts=1_700_000_000 + i)
+    store.add_deals(deals(8))
+
+    resp = client.get("/api/history?limit=3")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert [s["reason"] for s in data["signals"]] == ["sig 4", "sig 3", "sig 2"]
+    assert data["next_cursor"] is not None
+    assert data["daily_pnl"][0]["deals"] == 8
+
+    resp = client.get("/api/trades?kind=deals&limit=5")
+    assert resp.status_code == 200
+    assert [d["ticket"] for d in resp.get_json()["items"]] == [8, 7, 6, 5, 4]
+
+    resp = client.get("/api/trades")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"items": [], "next_cursor": None}
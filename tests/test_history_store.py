@@ -0,0 +1,144 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.data import Deal, deals
+from core.storage.history_store import HistoryStore
+
+DAY = 86400
+T0 = 1_700_006_400  # 2023-11-15 00:00 UTC
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoryStore(str(tmp_path / "history.db"))
+    yield s
+    s.close()
+
+
+def _deal(ticket, ts, profit):
+    return Deal(ticket, ts, "XAUUSD", 0, 1, 0.01, 2000.0, profit, 123456, "")
+
+
+def test_keyset_pagination_walks_every_row_once(store):
+    for i in range(10):
+        store.add_signal("XAUUSD" if i % 2 else "EURUSD", "BUY", reason=str(i), ts=T0 + i)
+
+    seen, cursor = [], None
+    while True:
+        page = store.page("signals", limit=3, cursor=cursor)
+        seen += [int(item["reason"]) for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(range(9, -1, -1))
+
+
+def test_next_cursor_boundary(store):
+    for i in range(6):
+        store.add_signal("XAUUSD", "SELL", ts=T0 + i)
+
+    # pas habis di batas halaman -> nggak ada halaman kosong berikutnya
+    first = store.page("signals", limit=3)
+    second = store.page("signals", limit=3, cursor=first["next_cursor"])
+    assert first["next_cursor"] == first["items"][-1]["id"]
+    assert len(second["items"]) == 3 and second["next_cursor"] is None
+
+    assert store.page("signals", limit=6)["next_cursor"] is None
+    assert store.page("signals", limit=5)["next_cursor"] is not None
+
+
+def test_page_filters_and_time_format(store):
+    store.add_signal("XAUUSD", "BUY", ts=T0)
+    store.add_signal("EURUSD", "BUY", ts=T0 + 10)
+    store.add_signal("XAUUSD", "SELL", ts=T0 + 20)
+
+    page = store.page("signals", symbol="XAUUSD", start=T0 + 5)
+    assert [i["action"] for i in page["items"]] == ["SELL"]
+    assert page["items"][0]["time"] == "2023-11-15T00:00:20Z"
+    assert page["items"][0]["ts"] == T0 + 20
+
+    with pytest.raises(ValueError):
+        store.page("signals; DROP TABLE signals")
+
+
+def test_trade_dedup_on_client_id(store):
+    request = SimpleNamespace(symbol="XAUUSD", side="BUY", lot=0.1, client_id="abc")
+    result = SimpleNamespace(price=2000.0, ok=True, retcode=10009, comment="done", attempts=1, order=42)
+    store.add_trade(request, result, ts=T0)
+    store.add_trade(request, result, ts=T0 + 1)
+    # tanpa client_id nggak di-dedup (NULL boleh dobel)
+    anon = SimpleNamespace(symbol="XAUUSD", side="SELL", lot=0.1, client_id="")
+    store.add_trade(anon, result, ts=T0 + 2)
+    store.add_trade(anon, result, ts=T0 + 3)
+
+    items = store.page("trades")["items"]
+    assert len(items) == 3
+    assert [i["client_id"] for i in items].count("abc") == 1
+
+
+def test_deal_dedup_on_ticket(store):
+    batch = deals(20)
+    assert store.add_deals(batch) == 20
+    assert store.add_deals(batch) == 0
+    assert store.add_deals(batch[10:] + [_deal(999, batch[-1].time + 60, 1.0)]) == 1
+    assert store.add_deals([]) == 0
+    assert len(store.page("deals", limit=1000)["items"]) == 21
+    assert store.last_deal_time() == batch[-1].time + 60
+
+
+def test_pnl_daily_recomputed_for_overlapping_syncs(store):
+    store.add_deals([_deal(1, T0 + 100, 10.0), _deal(2, T0 + DAY + 100, 5.0)])
+    # sync kedua overlap: deal lama ikut lagi + deal baru di dua hari yang sama
+    store.add_deals([
+        _deal(2, T0 + DAY + 100, 5.0),
+        _deal(3, T0 + 200, -4.0),
+        _deal(4, T0 + DAY + 200, 2.5),
+    ])
+
+    daily = store.pnl("day")
+    assert daily == [
+        {"date": "2023-11-15", "pnl": 6.0, "deals": 2},
+        {"date": "2023-11-16", "pnl": 7.5, "deals": 2},
+    ]
+    # sync ulang tanpa deal baru nggak ubah ringkasan
+    store.add_deals([_deal(1, T0 + 100, 10.0)])
+    assert store.pnl("day") == daily
+
+    assert store.pnl("day", start=T0 + DAY) == daily[1:]
+    weekly = store.pnl("week")
+    assert len(weekly) == 1 and weekly[0]["pnl"] == 13.5 and weekly[0]["deals"] == 4
+    with pytest.raises(ValueError):
+        store.pnl("month")
+
+
+def test_import_json_once(store, tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text(
+        json.dumps({
+            "signals": [
+                {"time": "2023-11-15T00:00:10Z", "symbol": "XAUUSD", "action": "BUY", "reason": "a"},
+                {"time": "2023-11-15T00:00:20", "symbol": "EURUSD", "action": "SELL", "reason": "b"},
+                {"time": "rusak", "action": "HOLD"},
+                "bukan dict",
+            ]
+        }),
+        encoding="utf-8",
+    )
+
+    assert store.import_json(path) == 3
+    items = store.page("signals")["items"]
+    assert [i["reason"] for i in items] == ["", "b", "a"]
+    assert items[1]["ts"] == T0 + 20
+    assert items[0]["symbol"] == "-" and items[0]["ts"] == 0.0
+    # tabel sudah terisi -> nggak diimport dua kali
+    assert store.import_json(path) == 0
+    assert len(store.page("signals")["items"]) == 3
+
+
+def test_import_json_missing_or_broken(store, tmp_path):
+    assert store.import_json(tmp_path / "nggak-ada.json") == 0
+    broken = tmp_path / "broken.json"
+    broken.write_text("{rusak", encoding="utf-8")
+    assert store.import_json(broken) == 0
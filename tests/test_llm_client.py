@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_api.llm_client import build_transport
+from core.config import settings
+
+
+class _Stub(BaseHTTPRequestHandler):
+    """
+    Gemini (generateContent) + OpenAI (chat/completions) palsu.
+    `status` / `delay` per provider diatur dari test.
+    """
+
+    protocol_version = "HTTP/1.1"
+    status = {"gemini": 200, "openai": 200}
+    delay = {"gemini": 0.0, "openai": 0.0}
+    hits = {"gemini": 0, "openai": 0}
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        name = "gemini" if ":generateContent" in self.path else "openai"
+        self.hits[name] += 1
+        time.sleep(self.delay[name])
+        text = f"{name}-answer"
+        if self.status[name] != 200:
+            body = {"error": "boom"}
+        elif name == "gemini":
+            body = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        else:
+            body = {"choices": [{"message": {"content": text}}]}
+        data = json.dumps(body).encode()
+        try:
+            self.send_response(self.status[name])
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass  # client sudah nyerah (timeout / hedge menang)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    _Stub.status = {"gemini": 200, "openai": 200}
+    _Stub.delay = {"gemini": 0.0, "openai": 0.0}
+    _Stub.hits = {"gemini": 0, "openai": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    for key, value in {
+        "GEMINI_BASE_URL": url,
+        "OPENAI_BASE_URL": f"{url}/v1",
+        "GEMINI_API_KEY": "test-gemini",
+        "OPENAI_API_KEY": "test-openai",
+        "LLM_TIMEOUT_SECONDS": 2.0,
+        "LLM_BREAKER_FAILURES": 3,
+        "LLM_BREAKER_RESET_SECONDS": 0.3,
+        "LLM_HEDGE_AFTER_MS": 0,
+    }.items():
+        monkeypatch.setattr(settings, key, value)
+    yield _Stub
+    server.shutdown()
+    server.server_close()
+
+
+def test_fallback_when_primary_returns_5xx(stub):
+    transport = build_transport()
+    assert transport.complete("hi").provider == "gemini"
+    stub.status["gemini"] = 503
+    result = transport.complete("hi")
+    assert (result.provider, result.text) == ("openai", "openai-answer")
+    assert transport.stats()["gemini"]["errors"] == 1
+
+
+def test_breaker_open_half_open_closed(stub):
+    transport = build_transport()
+    gemini = transport.providers["gemini"]
+    stub.status["gemini"] = 500
+    for _ in range(3):
+        assert transport.complete("hi").provider == "openai"
+    assert gemini.breaker.state == "open"
+
+    # open -> gemini dilewati tanpa request
+    hits = stub.hits["gemini"]
+    assert transport.complete("hi").provider == "openai"
+    assert stub.hits["gemini"] == hits
+    assert transport.stats()["gemini"]["skipped"] == 1
+
+    time.sleep(0.35)
+    assert gemini.breaker.state == "half_open"
+    # cuma satu request percobaan yang boleh lewat
+    assert gemini.breaker.allow() is True
+    assert gemini.breaker.allow() is False
+    gemini.breaker._probing = False
+
+    stub.status["gemini"] = 200
+    assert transport.complete("hi").provider == "gemini"
+    assert stub.hits["gemini"] == hits + 1
+    assert gemini.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_breaker(stub):
+    transport = build_transport()
+    gemini = transport.providers["gemini"]
+    stub.status["gemini"] = 500
+    for _ in range(3):
+        transport.complete("hi")
+    time.sleep(0.35)
+    assert transport.complete("hi").provider == "openai"
+    assert gemini.breaker.state == "open"
+
+
+def test_hedge_fires_after_delay(stub, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_AFTER_MS", 100)
+    transport = build_transport()
+    assert transport.hedge_after == pytest.approx(0.1)
+
+    # primary cepat -> nggak ada hedge
+    assert transport.complete("hi").provider == "gemini"
+    assert stub.hits["openai"] == 0
+
+    stub.delay["gemini"] = 1.0
+    t0 = time.perf_counter()
+    result = transport.complete("hi")
+    elapsed = time.perf_counter() - t0
+    assert (result.provider, result.hedged) == ("openai", True)
+    assert 0.1 <= elapsed < 0.6
+    stats = transport.stats()["openai"]
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
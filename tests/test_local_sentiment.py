@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from core.brains.local_sentiment import HashedLinearModel, LexiconScorer, LocalSentimentScorer, _clauses
+
+
+@pytest.fixture(scope="module")
+def lexicon():
+    return LexiconScorer()
+
+
+@pytest.mark.parametrize(
+    "headline, symbol, sign",
+    [
+        ("Gold slips as dollar firms", "XAUUSD", -1),
+        ("Gold falls on strong dollar", "XAUUSD", -1),
+        ("Dollar weakens after soft CPI; gold climbs", "XAUUSD", 1),
+        ("Euro rises against the dollar", "EURUSD", 1),
+        # kata arah cuma ke aset terdekat di klausa yang sama
+        ("Fed signals rate cut, gold rallies", "XAUUSD", 1),
+        ("Fed signals rate cut, gold rallies", "EURUSD", 1),
+        ("Rate cut bets rise - Reuters", "XAUUSD", 1),
+        ("Yen jumps as BoJ turns hawkish", "USDJPY", -1),
+        ("Silver hits record high", "XAGUSD", 1),
+        # negasi berlaku sampai 3 kata sesudahnya
+        ("Gold not expected to rise", "XAUUSD", -1),
+        ("Gold rises despite strong dollar", "XAUUSD", 1),
+    ],
+)
+def test_lexicon_direction(lexicon, headline, symbol, sign):
+    raw, oriented = lexicon.score(headline, symbol)
+    assert oriented
+    assert np.sign(raw) == sign
+
+
+@pytest.mark.parametrize(
+    "headline, symbol",
+    [
+        # aset terdekat bukan bagian symbol -> nggak diarahkan
+        ("Euro rises against the dollar", "XAUUSD"),
+        ("Oil rises on supply worries", "XAUUSD"),
+        ("Silver hits record high", "EURGBP"),
+        ("Gold steady ahead of data", "XAUUSD"),
+        ("Dow futures slip", "US30"),
+    ],
+)
+def test_lexicon_unknown_subject_not_oriented(lexicon, headline, symbol):
+    assert lexicon.score(headline, symbol) == (0.0, False)
+
+
+def test_negation_window_is_three_words(lexicon):
+    assert lexicon.score("Gold not seen likely to rise", "XAUUSD")[0] > 0
+    assert lexicon.score("Gold not seen to rise", "XAUUSD")[0] < 0
+
+
+def test_clauses_split_on_punctuation_and_conjunctions():
+    assert _clauses("Gold slips as dollar firms - Reuters") == [["gold", "slips"], ["dollar", "firms"], ["reuters"]]
+    assert _clauses("Fed signals rate cut, gold rallies") == [["fed", "signals", "rate", "cut"], ["gold", "rallies"]]
+    assert _clauses("Safe-haven gold gains") == [["safe", "haven", "gold", "gains"]]
+
+
+def test_scorer_unoriented_is_neutral(tmp_path):
+    scorer = LocalSentimentScorer(str(tmp_path / "model.npz"))
+    out = scorer.score("Euro rises against the dollar", "XAUUSD")
+    assert out == {"label": "neutral", "score": 0.0, "confidence": 0.0, "source": "local"}
+    out = scorer.score("Gold slips as dollar firms", "XAUUSD")
+    assert out["label"] == "bearish" and out["confidence"] == 1.0
+
+
+SAMPLES = [
+    ("Gold surges to fresh high", "XAUUSD", 1.0),
+    ("Gold sinks as traders cash in", "XAUUSD", -1.0),
+    ("Miners upbeat on bullion outlook", "XAUUSD", 0.8),
+    ("Bullion outlook gloomy for miners", "XAUUSD", -0.8),
+]
+
+
+def test_hashed_model_learns_targets():
+    model = HashedLinearModel(dim=1 << 12, lr=0.2)
+    for _ in range(200):
+        for headline, symbol, target in SAMPLES:
+            model.learn(headline, symbol, target)
+    assert model.updates == 800
+    for headline, symbol, target in SAMPLES:
+        assert np.sign(model.predict(headline, symbol)) == np.sign(target)
+        assert model.predict(headline, symbol) == pytest.approx(target, abs=0.15)
+
+
+def test_hashed_model_features_include_symbol():
+    model = HashedLinearModel(dim=1 << 12)
+    a = model.features("Gold rises", "XAUUSD")
+    b = model.features("Gold rises", "XAGUSD")
+    assert len(np.intersect1d(a, b)) < len(a)
+    assert np.all(np.diff(a) > 0)
+
+
+def test_hashed_model_save_load_roundtrip(tmp_path):
+    model = HashedLinearModel(dim=1 << 10)
+    model.learn("Gold surges", "XAUUSD", 1.0)
+    path = tmp_path / "sub" / "model.npz"
+    model.save(path)
+    assert not list(path.parent.glob("*.tmp*"))
+
+    loaded = HashedLinearModel.load(path)
+    assert loaded.dim == model.dim and loaded.updates == 1
+    assert loaded.b == pytest.approx(model.b)
+    np.testing.assert_array_equal(loaded.w, model.w)
+    assert loaded.predict("Gold surges", "XAUUSD") == pytest.approx(model.predict("Gold surges", "XAUUSD"))
+
+
+def test_hashed_model_load_missing_or_broken(tmp_path):
+    assert HashedLinearModel.load(tmp_path / "none.npz") is None
+    broken = tmp_path / "broken.npz"
+    broken.write_bytes(b"bukan npz")
+    assert HashedLinearModel.load(broken) is None
+
+
+def test_scorer_blends_model_after_min_updates(tmp_path):
+    path = tmp_path / "model.npz"
+    scorer = LocalSentimentScorer(str(path), min_updates=4)
+    assert not scorer.trained
+    scorer.fit(SAMPLES, epochs=1)
+    assert scorer.trained
+    scorer.save()
+    assert path.exists()
+    assert LocalSentimentScorer(str(path), min_updates=4).model.updates == 4
@@ -0,0 +1,51 @@
+import pytest
+from loguru import logger
+
+from config.settings import settings
+from core.feeder.mt5_feeder import MT5Feeder
+from core.sim import mt5_sim
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    monkeypatch.setattr(settings, "BAR_STORE_ENABLED", False)
+    broker = mt5_sim.configure(speed=0, history_bars=20_000, future_bars=100)
+    requested = []
+    copy = mt5_sim.copy_rates_from_pos
+
+    def spy(symbol, timeframe, start_pos, count):
+        requested.append(count)
+        return copy(symbol, timeframe, start_pos, count)
+
+    monkeypatch.setattr(mt5_sim, "copy_rates_from_pos", spy)
+    yield broker, requested
+    mt5_sim.configure()
+
+
+def test_multi_timeframe_m1_request_is_capped(sim, monkeypatch):
+    _, requested = sim
+    monkeypatch.setattr(settings, "MIN_BARS_REQUIRED", 200)
+    warnings = []
+    sink = logger.add(warnings.append, level="WARNING", format="{message}")
+    try:
+        feeder = MT5Feeder("XAUUSD", 15)
+        frames = feeder.get_rates_multi([15, 60, 240], bars=500)
+        feeder.get_rates_multi([15, 60, 240], bars=500)
+    finally:
+        logger.remove(sink)
+
+    # bukan 500 x 240 = 120000: TF tertinggi cukup MIN_BARS_REQUIRED bar
+    assert requested[0] == 200 * 240
+    assert len(frames[15]) == 500
+    assert 0 < len(frames[240]) < 200
+    # history terminal cuma 20000 bar M1 -> di-log sekali
+    short = [w for w in warnings if "bar M1" in w]
+    assert len(short) == 1 and "butuh 48000" in short[0]
+
+
+def test_primary_timeframe_keeps_requested_bars(sim):
+    _, requested = sim
+    feeder = MT5Feeder("XAUUSD", 60)
+    frames = feeder.get_rates_multi([60], bars=300)
+    assert requested[0] == 300 * 60
+    assert len(frames[60]) == 300
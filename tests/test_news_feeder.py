@@ -0,0 +1,115 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.data import rss_document
+from core.feeder.news_feeder import NewsFeeder
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class _Feeds(BaseHTTPRequestHandler):
+    """
+    /ok   -> 200 + ETag/Last-Modified, lalu 304 kalau validator dikirim balik
+    /slow -> request pertama normal, berikutnya lewat deadline
+    /err  -> request pertama normal, berikutnya 500
+    """
+
+    protocol_version = "HTTP/1.1"
+    hits: dict = {}
+    conditional: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path
+        n = self.hits[path] = self.hits.get(path, 0) + 1
+        if path == "/ok" and self.headers.get("If-None-Match") == ETAG:
+            self.conditional.append(self.headers.get("If-Modified-Since"))
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if path == "/slow" and n > 1:
+            time.sleep(1.5)
+        if path == "/err" and n > 1:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = rss_document(5, seed=len(path)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        if path == "/ok":
+            self.send_header("ETag", ETAG)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def feed_server():
+    _Feeds.hits, _Feeds.conditional = {}, []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Feeds)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_get_deadline_and_errors(feed_server):
+    urls = [f"{feed_server}/{name}" for name in ("ok", "slow", "err")]
+    feeder = NewsFeeder(feeds=urls, deadline=0.5)
+
+    first = feeder._fetch_all()
+    assert len(first) == 15
+    assert all(feeder._cache[url] for url in urls)
+
+    # /ok 304 (cache), /slow lewat deadline (cache), /err 500 (cache)
+    t0 = time.perf_counter()
+    second = feeder._fetch_all()
+    assert time.perf_counter() - t0 < 1.0
+    assert [it["title"] for it in second] == [it["title"] for it in first]
+    assert _Feeds.conditional == [LAST_MODIFIED]
+    assert _Feeds.hits == {"/ok": 2, "/slow": 2, "/err": 2}
+
+
+def test_failed_feed_without_cache_is_empty():
+    # port 9 (discard) -> connection refused
+    feeder = NewsFeeder(feeds=["http://127.0.0.1:9/rss"], deadline=0.5)
+    assert feeder._fetch_all() == []
+
+
+def test_select_is_per_symbol_without_fetch():
+    now = time.gmtime()
+    items = [
+        {"title": "Gold climbs as dollar slips", "published_parsed": now},
+        {"title": "Gold climbs as the dollar slips!", "published_parsed": now},
+        {"title": "Euro gains after ECB holds rates", "published_parsed": now},
+        {"title": "Tech stocks rally on earnings", "published_parsed": now},
+    ]
+    feeder = NewsFeeder(feeds=["http://127.0.0.1:9/rss"], deadline=0.5)
+    feeder._fetch_all = lambda: pytest.fail("select nggak boleh fetch")
+    assert feeder.select(items, "XAUUSD") == ["Gold climbs as dollar slips"]
+    assert feeder.select(items, "EURUSD") == ["Gold climbs as dollar slips", "Euro gains after ECB holds rates"]
+    assert feeder.select([], "XAUUSD") == []
+
+
+def test_select_filters_relevance_before_dedup():
+    now = time.gmtime()
+    items = [
+        {"title": "Gold hits record high as Fed cut bets grow", "published_parsed": now},
+        {"title": "Silver hits record high as Fed cut bets grow", "published_parsed": now},
+        {"title": "Gold price rises on safe-haven demand", "published_parsed": now},
+        {"title": "Gold price falls on safe-haven demand", "published_parsed": now},
+    ]
+    feeder = NewsFeeder(feeds=["http://127.0.0.1:9/rss"], deadline=0.5)
+    assert "Silver hits record high as Fed cut bets grow" in feeder.select(items, "XAGUSD")
+    # headline silver tetap relevan buat XAUUSD lewat Fed (USD), tapi bukan duplikat headline gold
+    assert feeder.select(items, "XAUUSD") == [it["title"] for it in items]
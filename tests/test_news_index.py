@@ -0,0 +1,86 @@
+import pytest
+
+from core.feeder.news_index import MinHashDeduper, RelevanceIndex, story_key, symbol_keywords
+
+
+@pytest.fixture
+def deduper():
+    return MinHashDeduper()
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Gold climbs as dollar slips", "Gold climbs as the dollar slips!"),
+        ("Gold rises on safe-haven demand - Reuters", "Gold rises on safe-haven demand"),
+        ("Fed holds rates steady, signals two cuts this year", "FED HOLDS RATES STEADY, SIGNALS TWO CUTS THIS YEAR | CNBC"),
+        ("Oil prices rise as OPEC+ extends output cuts", "Oil prices rise after OPEC+ extends output cuts"),
+    ],
+)
+def test_syndicated_copies_collapse(deduper, a, b):
+    assert deduper.collapse([a, b]) == ([0], {1: 0})
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        # arah beda
+        ("Gold price rises on safe-haven demand", "Gold price falls on safe-haven demand"),
+        # aset / bank sentral beda
+        ("EUR/USD rises after ECB decision", "GBP/USD rises after BoE decision"),
+        ("Silver hits record high as Fed cut bets grow", "Gold hits record high as Fed cut bets grow"),
+        # cuma mirip sebagian
+        ("Tech stocks rally on earnings", "Bank stocks rally on earnings"),
+    ],
+)
+def test_different_stories_kept(deduper, a, b):
+    assert deduper.collapse([a, b]) == ([0, 1], {})
+
+
+def test_collapse_keeps_first_of_each_story(deduper):
+    headlines = [
+        "Gold climbs as dollar slips",
+        "Euro gains after ECB holds rates",
+        "Gold climbs as the dollar slips",
+        "Gold falls as dollar firms",
+        "Euro gains after ECB holds rates - Reuters",
+    ]
+    assert deduper.collapse(headlines) == ([0, 1, 3], {2: 0, 4: 1})
+    assert deduper.collapse([]) == ([], {})
+
+
+def test_signature_is_cached_and_normalized(deduper):
+    a = deduper.signature("Gold climbs, dollar slips")
+    assert deduper.signature("gold climbs dollar slips") is a
+    assert len(a) == deduper.num_perm
+    with pytest.raises(ValueError):
+        MinHashDeduper(num_perm=64, bands=10)
+
+
+def test_story_key_assets_and_direction():
+    assert story_key("Gold price rises on safe-haven demand") == (frozenset({"XAU"}), frozenset({1.0}))
+    assert story_key("Gold slips as dollar firms") == (frozenset({"XAU", "USD"}), frozenset({1.0, -1.0}))
+    # bigram alias + lexicon ("rate cut" -> USD, "record high" -> naik)
+    assert story_key("Silver at record high on rate cut bets") == (frozenset({"XAG", "USD"}), frozenset({1.0}))
+    assert story_key("Tech earnings in focus") == (frozenset(), frozenset())
+
+
+def test_symbol_keywords_weights():
+    kw = symbol_keywords("XAUUSD")
+    assert kw["gold"] == 2.0 and kw["dollar"] == 2.0
+    assert kw["fed"] == 1.0 and kw["safe haven"] == 1.0
+    assert symbol_keywords("US30") == {}
+    assert symbol_keywords("US30", ["Wall Street"]) == {"wall street": 2.0}
+
+
+def test_relevance_index_scores_all_symbols():
+    index = RelevanceIndex(extra={"us30": ["dow"]})
+    assert all(index.add_symbol(s) for s in ("XAUUSD", "XAGUSD", "EURUSD", "US30"))
+    assert not index.add_symbol("FOO")
+
+    scores = index.scores("Gold rallies as Fed cut bets grow")
+    assert scores["XAUUSD"] == 3.0
+    assert scores["EURUSD"] == 1.0
+    assert "XAGUSD" in scores and scores["XAGUSD"] == 1.0
+    assert index.score("Dow futures slip", "US30") == 2.0
+    assert index.score("Silver hits record high", "XAUUSD") == 0.0
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from benchmarks.data import ohlc_frame
+from core.backtest.optimizer import (
+    evaluate,
+    grid,
+    mode_candidates,
+    optimize,
+    prepare_inputs,
+    set_state,
+)
+from core.backtest.vector_backtest import VectorBacktester, load_bars, mode_signals
+
+SPACE = {
+    "ema_fast": [10, 20],
+    "ema_slow": [50],
+    "rsi_buy": [30, 40],
+    "rsi_sell": [60],
+    "stoch_buy": [20],
+    "stoch_sell": [80],
+    "atr_factor": [0.7],
+}
+# offset rapat supaya beberapa kandidat jatuh di level confidence yang sama (cache)
+OFFSETS = (-0.2, -0.1, -0.05, -0.01, 0.0, 0.01, 0.05, 0.1, 0.2)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return ohlc_frame(1500)
+
+
+@pytest.mark.parametrize("require_tradable", [False, True])
+def test_evaluate_matches_direct_simulation(data, require_tradable):
+    tester_kwargs = {"slippage_points": 3.0, "require_tradable": require_tradable}
+    tester = VectorBacktester(**tester_kwargs)
+    param_sets = grid(SPACE)
+    candidates = mode_candidates(tester.mode_params, tester.mode_params.keys(), OFFSETS)
+    bars = load_bars(data)
+    arrays, _ = prepare_inputs(bars, param_sets, tester)
+    set_state(arrays, tester_kwargs)
+
+    for params in param_sets:
+        rows = evaluate(params, candidates)
+        assert len(rows) == len(candidates)
+
+        direct = VectorBacktester(technical_params=params, **tester_kwargs)
+        prepared = direct.prepare(data)
+        tradable = prepared["condition"]["tradable"] if require_tradable else None
+        for row, (mode, conf, lot) in zip(rows, candidates):
+            signals = mode_signals(prepared["scores"], conf, tradable)
+            stats = direct.simulate(prepared, signals, lot, mode).stats
+            assert (row["mode"], row["conf_threshold"], row["lot"]) == (mode, conf, lot)
+            assert row["ema_fast"] == params.ema_fast and row["rsi_buy"] == params.rsi_buy
+            for key, value in stats.items():
+                assert row[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (mode, conf, key)
+
+
+def test_evaluate_slice_matches_direct_simulation(data):
+    tester = VectorBacktester()
+    params = grid(SPACE)[0]
+    candidates = mode_candidates(tester.mode_params, ["BALANCED"])
+    bars = load_bars(data)
+    arrays, _ = prepare_inputs(bars, [params], tester)
+    set_state(arrays, {})
+
+    rows = evaluate(params, candidates, start=500, end=1200)
+    direct = VectorBacktester(technical_params=params)
+    full = direct.prepare(data)
+    # indikator dihitung di seluruh history, baru di-slice
+    prepared = {"bars": {k: v[500:1200] for k, v in full["bars"].items()}}
+    scores = {k: v[500:1200] for k, v in full["scores"].items()}
+    for row, (mode, conf, lot) in zip(rows, candidates):
+        stats = direct.simulate(prepared, mode_signals(scores, conf), lot, mode).stats
+        assert row["bars"] == 700
+        assert row["net_pnl"] == pytest.approx(stats["net_pnl"])
+        assert row["trades"] == stats["trades"]
+
+
+def test_pool_ranking_matches_in_process(data):
+    param_sets = grid(SPACE)
+    kwargs = {"offsets": OFFSETS, "metric": "sharpe", "tester_kwargs": {"require_tradable": True}}
+    serial = optimize(data, param_sets, workers=0, **kwargs)
+    pooled = optimize(data, param_sets, workers=2, **kwargs)
+
+    assert serial.keys() == pooled.keys()
+    for mode in serial:
+        assert len(serial[mode]) == len(param_sets) * len(mode_candidates(VectorBacktester().mode_params, [mode], OFFSETS))
+        a = [(r["ema_fast"], r["rsi_buy"], r["conf_threshold"]) for r in serial[mode]]
+        b = [(r["ema_fast"], r["rsi_buy"], r["conf_threshold"]) for r in pooled[mode]]
+        assert a == b
+        np.testing.assert_allclose([r["sharpe"] for r in serial[mode]], [r["sharpe"] for r in pooled[mode]])
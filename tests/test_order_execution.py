@@ -0,0 +1,204 @@
+import pytest
+
+from core.execution.mt5_executor import MT5Executor
+from core.execution.order_queue import OrderQueue, OrderRequest, OrderResult
+from core.feeder.broker_state import BrokerState
+from core.sim import mt5_sim
+
+
+@pytest.fixture
+def sim():
+    def make(**kwargs):
+        broker = mt5_sim.configure(speed=0, history_bars=500, future_bars=500, **kwargs)
+        mt5_sim.initialize()
+        return broker
+
+    yield make
+    mt5_sim.configure()
+
+
+def _executor(symbol="EURUSD", max_retries=3):
+    ex = MT5Executor(symbol, broker=BrokerState())
+    ex.dry_run = False
+    ex.max_retries = max_retries
+    return ex
+
+
+def _request(client_id="abc123", side="BUY"):
+    return OrderRequest("EURUSD", side, 0.1, reason="test", client_id=client_id)
+
+
+@pytest.mark.parametrize(
+    "filling, expected_mode",
+    [
+        (mt5_sim.SYMBOL_FILLING_FOK | mt5_sim.SYMBOL_FILLING_IOC, mt5_sim.ORDER_FILLING_FOK),
+        (mt5_sim.SYMBOL_FILLING_IOC, mt5_sim.ORDER_FILLING_IOC),
+        (0, mt5_sim.ORDER_FILLING_RETURN),
+    ],
+)
+def test_filling_mode_follows_symbol_spec(sim, filling, expected_mode):
+    sim(filling_mode=filling)
+    result = _executor().execute(_request())
+    assert result.ok and result.retcode == mt5_sim.TRADE_RETCODE_DONE
+    assert result.fill_mode == expected_mode
+    assert result.attempts == 1
+
+
+def test_invalid_fill_falls_back_fok_ioc_return(sim, monkeypatch):
+    broker = sim()
+    # spec bilang FOK+IOC boleh, tapi broker nolak dua-duanya -> harus turun ke RETURN
+    broker.filling_mode = mt5_sim.SYMBOL_FILLING_FOK | mt5_sim.SYMBOL_FILLING_IOC
+    ex = _executor()
+    ex.broker.spec("EURUSD")
+    broker.filling_mode = 0
+    tried = []
+    send = mt5_sim.order_send
+
+    def spy(order):
+        tried.append(order["type_filling"])
+        return send(order)
+
+    monkeypatch.setattr(mt5_sim, "order_send", spy)
+    result = ex.execute(_request())
+    assert tried == [mt5_sim.ORDER_FILLING_FOK, mt5_sim.ORDER_FILLING_IOC, mt5_sim.ORDER_FILLING_RETURN]
+    assert result.ok and result.attempts == 3
+    assert result.fill_mode == mt5_sim.ORDER_FILLING_RETURN
+    assert len(result.latencies) == 3
+
+
+@pytest.mark.parametrize(
+    "retcode",
+    [mt5_sim.TRADE_RETCODE_REQUOTE, mt5_sim.TRADE_RETCODE_PRICE_CHANGED, mt5_sim.TRADE_RETCODE_PRICE_OFF],
+)
+def test_requote_retries_with_fresh_tick(sim, monkeypatch, retcode):
+    broker = sim()
+    ticks = []
+    tick = mt5_sim.symbol_info_tick
+    send = mt5_sim.order_send
+    sent = []
+
+    def tick_spy(symbol):
+        ticks.append(symbol)
+        return tick(symbol)
+
+    def send_spy(order):
+        sent.append(order)
+        if len(sent) == 1:
+            # harga geser sesudah requote
+            mt5_sim.advance(30)
+            return broker._fail(retcode, "Requote", order)
+        return send(order)
+
+    monkeypatch.setattr(mt5_sim, "symbol_info_tick", tick_spy)
+    monkeypatch.setattr(mt5_sim, "order_send", send_spy)
+    ex = _executor()
+    result = ex.execute(_request())
+
+    assert result.ok and result.attempts == 2
+    # attempt kedua ambil tick baru, bukan snapshot cycle
+    assert len(ticks) == 2
+    assert sent[1]["price"] == tick("EURUSD").ask
+    assert sent[0]["price"] != sent[1]["price"]
+
+
+def test_requote_gives_up_after_max_retries(sim):
+    sim(requote_prob=1.0)
+    result = _executor(max_retries=2).execute(_request())
+    assert not result.ok
+    assert result.retcode == mt5_sim.TRADE_RETCODE_REQUOTE
+    assert result.attempts == 3
+    assert mt5_sim.positions_total() == 0
+
+
+def test_non_retryable_error_stops(sim):
+    sim()
+    request = _request()
+    request.lot = 0.005
+    result = _executor().execute(request)
+    assert not result.ok
+    assert result.retcode == mt5_sim.TRADE_RETCODE_INVALID_VOLUME
+    assert result.attempts == 1
+
+
+def test_already_filled_guard_skips_resend(sim):
+    sim()
+    assert _executor().execute(_request()).ok
+    # executor baru (mis. bot restart), client_id sama -> nggak kirim lagi
+    result = _executor().execute(_request())
+    assert result.ok and result.comment == "already_filled"
+    assert result.attempts == 0
+    assert mt5_sim.positions_total() == 1
+
+    assert _executor().execute(_request(client_id="other")).ok
+    assert mt5_sim.positions_total() == 2
+
+
+def test_lost_ack_checks_positions_before_resend(sim, monkeypatch):
+    sim()
+    send = mt5_sim.order_send
+
+    def lost_ack(order):
+        send(order)
+        return None
+
+    monkeypatch.setattr(mt5_sim, "order_send", lost_ack)
+    result = _executor().execute(_request())
+    assert result.ok and result.comment == "filled_unacked"
+    assert result.attempts == 1
+    assert mt5_sim.positions_total() == 1
+
+
+class CountingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, request):
+        self.calls.append(request.client_id)
+        return OrderResult(request.client_id, True, attempts=1, latencies=[0.001])
+
+
+def test_queue_dedups_client_id():
+    q = OrderQueue()
+    ex = CountingExecutor()
+    try:
+        first = q.submit(ex, _request("dup"))
+        second = q.submit(ex, _request("dup"))
+        assert second is first
+        assert first.result(timeout=5).ok
+        assert ex.calls == ["dup"]
+        stats = q.stats()
+        assert stats["sent"] == 1 and stats["latency"]["count"] == 1
+    finally:
+        q.stop()
+
+
+def test_queue_dedup_memory_is_capped():
+    q = OrderQueue()
+    ex = CountingExecutor()
+    try:
+        futures = [q.submit(ex, _request(f"id{i}")) for i in range(5001)]
+        futures[-1].result(timeout=10)
+        assert len(q._futures) == 5000
+        assert "id0" not in q._futures and "id1" in q._futures
+        # id paling lama sudah dibuang dari dedup -> dikirim ulang
+        again = q.submit(ex, _request("id0"))
+        assert again is not futures[0]
+        again.result(timeout=5)
+        assert ex.calls.count("id0") == 2
+        assert q.submit(ex, _request("id5000")) is futures[-1]
+    finally:
+        q.stop()
+
+
+def test_queue_records_executor_exception():
+    class Broken:
+        def execute(self, request):
+            raise RuntimeError("boom")
+
+    q = OrderQueue()
+    try:
+        result = q.submit(Broken(), _request("err")).result(timeout=5)
+        assert not result.ok and result.comment == "boom"
+        assert q.stats()["failed"] == 1
+    finally:
+        q.stop()
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from core.brains.sentiment_brain import SentimentBrain
+from core.config import settings
+
+
+@pytest.fixture
+def brain(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_CACHE_FILE", str(tmp_path / "cache.json"))
+    monkeypatch.setattr(settings, "SENTIMENT_LOCAL_MODEL_FILE", str(tmp_path / "model.npz"))
+    return SentimentBrain()
+
+
+def test_analyze_many_fetches_news_once(brain):
+    now = time.gmtime()
+    items = [
+        {"title": "Gold climbs as dollar slips", "published_parsed": now},
+        {"title": "Euro gains after ECB holds rates", "published_parsed": now},
+        {"title": "Yen firms as BOJ turns hawkish", "published_parsed": now},
+    ]
+    fetches = []
+    brain.news._fetch_all = lambda deadline=None: fetches.append(deadline) or items
+    brain.gemini.analyze_batch = lambda batch, budget=None: {
+        it["id"]: {"label": "bullish", "score": 0.5} for it in batch
+    }
+
+    out = brain.analyze_many(["XAUUSD", "EURUSD", "USDJPY"])
+    assert len(fetches) == 1
+    assert out["XAUUSD"]["headlines"] == 1
+    assert out["EURUSD"]["headlines"] == 2
+    assert out["USDJPY"]["headlines"] == 2
+    assert {r["reason"] for r in out.values()} == {"ai_bullish"}
+
+
+def test_deadline_bounds_news_fetch_and_llm_budget(brain):
+    calls = {}
+
+    def slow_fetch(deadline=None):
+        calls["fetch"] = deadline
+        time.sleep(0.3)
+        return [{"title": "Gold climbs as dollar slips", "published_parsed": time.gmtime()}]
+
+    def batch(items, budget=None):
+        calls["budget"] = budget
+        return {}
+
+    brain.news._fetch_all = slow_fetch
+    brain.gemini.analyze_batch = batch
+    out = brain.analyze_many(["XAUUSD"], deadline=1.0)
+    assert calls["fetch"] == 1.0
+    assert calls["budget"] <= 0.75
+    # LLM nggak jawab -> scorer lokal
+    assert out["XAUUSD"]["local"] == 1
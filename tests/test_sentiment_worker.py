@@ -0,0 +1,21 @@
+from core.pipeline.sentiment_worker import SentimentWorker
+
+
+def test_refresh_passes_deadline_to_analyze():
+    seen = []
+
+    def analyze(symbols, deadline):
+        seen.append((list(symbols), deadline))
+        return {s: {"sentiment": "bullish", "confidence": 0.8} for s in symbols}
+
+    worker = SentimentWorker(analyze, ["XAUUSD", "EURUSD"], interval=60, deadline=12.5)
+    snapshot = worker.refresh()
+    assert seen == [(["XAUUSD", "EURUSD"], 12.5)]
+    assert snapshot.for_symbol("EURUSD", max_age=60)["sentiment"] == "bullish"
+
+
+def test_failed_refresh_keeps_previous_snapshot():
+    worker = SentimentWorker(lambda symbols, deadline: 1 / 0, ["XAUUSD"], interval=60, deadline=5)
+    snapshot = worker.refresh()
+    assert snapshot.error
+    assert snapshot.for_symbol("XAUUSD", max_age=60)["stale"]
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.data import ohlc_frame
+from core.brains.technical_brain import TechnicalBrain
+
+
+@pytest.mark.parametrize("unit", ("ns", "us", "s"))
+def test_streaming_matches_pandas_path(unit):
+    # frame geser 1 bar per cycle, kayak MT5Feeder.get_history di loop live
+    n, window = 1200, 300
+    df = ohlc_frame(n)
+    df.index = df.index.as_unit(unit)
+    brain = TechnicalBrain()
+    for end in range(window, n + 1):
+        frame = df.iloc[end - window:end]
+        got = brain.analyze(frame)
+        ref = brain.analyze_full(frame)
+        assert got["direction"] == ref["direction"], f"bar {end}"
+        assert got["confidence"] == pytest.approx(ref["confidence"], abs=1e-9), f"bar {end}"
+
+
+def test_streaming_rewarms_after_gap():
+    df = ohlc_frame(800)
+    brain = TechnicalBrain()
+    brain.analyze(df.iloc[:300])
+    # lompat (bar yang ditunggu engine sudah nggak ada di frame) -> warm-up ulang
+    frame = df.iloc[400:700]
+    got, ref = brain.analyze(frame), brain.analyze_full(frame)
+    assert (got["direction"], got["confidence"]) == (ref["direction"], pytest.approx(ref["confidence"]))
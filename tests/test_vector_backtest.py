@@ -0,0 +1,33 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.data import ohlc_frame, ohlc_rates
+from core.backtest.vector_backtest import VectorBacktester, load_bars
+
+
+@pytest.mark.parametrize("unit", ("ns", "us", "s"))
+def test_load_bars_datetime_index(unit):
+    df = ohlc_frame(100)
+    df.index = df.index.as_unit(unit)
+    np.testing.assert_array_equal(load_bars(df)["time"], ohlc_rates(100)["time"])
+
+
+def test_load_bars_csv_time_strings():
+    # CLI: pd.read_csv -> kolom time masih string
+    buf = io.StringIO()
+    ohlc_frame(100).to_csv(buf)
+    buf.seek(0)
+    data = pd.read_csv(buf)
+    bars = load_bars(data)
+    np.testing.assert_array_equal(bars["time"], ohlc_rates(100)["time"])
+    assert VectorBacktester().run(data)
+
+
+def test_load_bars_rates_and_epoch_column():
+    rates = ohlc_rates(100)
+    np.testing.assert_array_equal(load_bars(rates)["time"], rates["time"])
+    frame = pd.DataFrame(rates)
+    np.testing.assert_array_equal(load_bars(frame)["time"], rates["time"])
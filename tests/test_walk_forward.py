@@ -0,0 +1,95 @@
+import pytest
+
+from benchmarks.data import ohlc_frame
+from core.backtest.walk_forward import Fold, aggregate, make_folds, walk_forward
+
+
+def test_rolling_folds_after_warmup():
+    folds = make_folds(1000, 4, train_mult=3.0, warmup=300)
+    # 700 bar usable / (4 + 3) -> test 100, train 300
+    assert folds == [
+        Fold(0, 300, 600, 700),
+        Fold(1, 400, 700, 800),
+        Fold(2, 500, 800, 900),
+        Fold(3, 600, 900, 1000),
+    ]
+    for f in folds:
+        assert f.train_start >= 300
+        assert f.train_end - f.train_start == 300
+
+
+def test_anchored_folds_start_at_warmup():
+    folds = make_folds(1000, 4, train_mult=3.0, warmup=300, anchored=True)
+    assert [f.train_start for f in folds] == [300] * 4
+    assert [(f.train_end, f.test_end) for f in folds] == [(600, 700), (700, 800), (800, 900), (900, 1000)]
+
+
+def test_folds_tile_test_windows_without_gap():
+    folds = make_folds(1003, 3, train_mult=2.5, warmup=10)
+    for prev, nxt in zip(folds, folds[1:]):
+        assert prev.test_end == nxt.train_end
+    # sisa pembagian masuk ke train pertama, test terakhir pas di ujung data
+    assert folds[-1].test_end == 1003
+    assert folds[0].train_start == 10
+
+
+@pytest.mark.parametrize("n, folds, warmup", [(10, 4, 0), (100, 3, 95), (1000, 0, 0)])
+def test_too_short_raises(n, folds, warmup):
+    with pytest.raises(ValueError):
+        make_folds(n, folds, warmup=warmup)
+
+
+def test_minimum_test_length_accepted():
+    # usable 8, folds 1 + train_mult 3 -> test_len 2 (batas bawah)
+    folds = make_folds(8, 1, train_mult=3.0)
+    assert folds == [Fold(0, 0, 6, 8)]
+
+
+def _row(mode, fold, train_sharpe, test_sharpe, net_pnl, trades=4.0, win_rate=0.5, dd=2.0):
+    stats = {"net_pnl": net_pnl, "return_pct": 0.0, "trades": trades, "win_rate": win_rate,
+             "max_drawdown_pct": dd, "sharpe": test_sharpe, "exposure": 0.5}
+    return {
+        "fold": fold,
+        "mode": mode,
+        "params": {},
+        "train": {**stats, "sharpe": train_sharpe},
+        "test": stats,
+    }
+
+
+def test_aggregate_per_mode():
+    rows = [
+        _row("SAFE", 0, 2.0, 1.0, 10.0, dd=3.0),
+        _row("BALANCED", 0, 1.0, -1.0, -5.0, trades=2.0),
+        _row("SAFE", 1, 1.5, 0.5, -4.0, win_rate=0.25, dd=6.0),
+        _row("SAFE", 2, 1.0, 1.5, 6.0),
+    ]
+    summary = aggregate(rows, "sharpe")
+    assert list(summary) == ["SAFE", "BALANCED"]
+
+    safe = summary["SAFE"]
+    assert safe["folds"] == 3
+    assert safe["test_net_pnl_total"] == pytest.approx(12.0)
+    assert safe["test_profitable_folds"] == pytest.approx(2 / 3)
+    assert safe["test_sharpe_mean"] == pytest.approx(1.0)
+    assert safe["test_sharpe_median"] == pytest.approx(1.0)
+    assert safe["train_sharpe_mean"] == pytest.approx(1.5)
+    assert safe["sharpe_degradation"] == pytest.approx(0.5)
+    assert safe["test_win_rate_mean"] == pytest.approx((0.5 + 0.25 + 0.5) / 3)
+    assert safe["test_trades_total"] == 12.0
+    assert safe["test_max_drawdown_pct"] == 6.0
+
+    balanced = summary["BALANCED"]
+    assert balanced["folds"] == 1 and balanced["test_profitable_folds"] == 0
+    assert balanced["sharpe_degradation"] == pytest.approx(2.0)
+
+    assert aggregate(rows, "net_pnl")["SAFE"]["test_net_pnl_mean"] == pytest.approx(4.0)
+    assert aggregate([], "sharpe") == {}
+
+
+def test_walk_forward_report_consistent():
+    report = walk_forward(ohlc_frame(2000), folds=3, modes=["SAFE", "BALANCED"])
+    assert len(report["folds"]) == 3
+    assert len(report["results"]) == 6
+    assert report["summary"]["SAFE"]["folds"] == 3
+    assert report["summary"] == aggregate(report["results"], "sharpe")